@@ -0,0 +1,153 @@
+"""
+Adaptive Skill Testing for the Smart Job Portal
+Computerized adaptive testing under a two-parameter logistic (2PL) IRT model. The ability
+estimate is the posterior mean (EAP) on a fixed grid with a standard normal prior; each
+next stage is the few unused items with the most Fisher information at that estimate, and
+the test stops once the posterior standard error is small enough. Each stage is answered
+as one submission within a time limit enforced here rather than in the browser. This
+module has no Streamlit dependency.
+"""
+
+import hashlib
+import math
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Item difficulty (b) assumed for each bank level until the item is calibrated
+DIFFICULTY_B = {'easy': -1.0, 'medium': 0.0, 'hard': 1.0}
+DEFAULT_DISCRIMINATION = 1.7  # Logistic equivalent of a unit normal-ogive slope
+THETA_GRID = np.linspace(-4.0, 4.0, 161)
+PRIOR = np.exp(-0.5 * THETA_GRID ** 2)
+MIN_ITEMS = 3
+MAX_ITEMS = 10
+SE_TARGET = 0.55  # Stop once the ability estimate is this precise
+STAGE_SIZE = 4  # Questions submitted together
+SECONDS_PER_ITEM = 60
+GRACE_SECONDS = 5  # Allowance for the submit round trip
+UNANSWERED = -1
+
+
+def item_id(skill: str, question: Mapping) -> str:
+    """Stable identifier of a question within a skill"""
+    text = f"{skill.strip().lower()}|{question['question']}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def build_item_pool(skill: str, questions_by_difficulty: Mapping[str, Iterable[Mapping]],
+                    item_params: Optional[Mapping[str, Tuple[float, float]]] = None) -> List[Dict]:
+    """Questions of every difficulty tagged with id and IRT parameters (a, b), deduplicated by id"""
+    item_params = item_params or {}
+    pool, seen = [], set()
+    for difficulty, questions in questions_by_difficulty.items():
+        for question in questions or ():
+            qid = item_id(skill, question)
+            if qid in seen:
+                continue
+            seen.add(qid)
+            a, b = item_params.get(qid, (DEFAULT_DISCRIMINATION, DIFFICULTY_B.get(difficulty, 0.0)))
+            item = dict(question)
+            item['options'] = list(question['options'])
+            item.update({'id': qid, 'level': difficulty, 'a': float(a), 'b': float(b)})
+            pool.append(item)
+    return pool
+
+
+def _probability(theta, a: float, b: float):
+    return 1.0 / (1.0 + np.exp(-a * (theta - b)))
+
+
+def estimate_ability(items: List[Dict], responses: List[bool]) -> Tuple[float, float]:
+    """EAP ability estimate and posterior standard error after the given responses"""
+    log_posterior = np.log(PRIOR)
+    for item, correct in zip(items, responses):
+        p = np.clip(_probability(THETA_GRID, item['a'], item['b']), 1e-9, 1 - 1e-9)
+        log_posterior += np.log(p) if correct else np.log1p(-p)
+    posterior = np.exp(log_posterior - log_posterior.max())
+    posterior /= posterior.sum()
+    theta = float(np.dot(THETA_GRID, posterior))
+    se = float(math.sqrt(np.dot((THETA_GRID - theta) ** 2, posterior)))
+    return theta, se
+
+
+def next_items(pool: List[Dict], used_ids: Iterable[str], theta: float, count: int) -> List[Dict]:
+    """Up to count unused items with the most Fisher information at theta, most informative first"""
+    used = set(used_ids)
+    candidates = [item for item in pool if item['id'] not in used]
+    if not candidates or count <= 0:
+        return []
+    a = np.array([item['a'] for item in candidates])
+    p = _probability(theta, a, np.array([item['b'] for item in candidates]))
+    order = np.argsort(-(a ** 2 * p * (1 - p)), kind='stable')
+    return [candidates[i] for i in order[:count]]
+
+
+def should_stop(answered: int, se: float, remaining: int) -> bool:
+    """Stop when the estimate is precise enough, the length cap is hit, or the pool is exhausted"""
+    if remaining == 0 or answered >= MAX_ITEMS:
+        return True
+    return answered >= MIN_ITEMS and se <= SE_TARGET
+
+
+def calibrated_score(theta: float) -> float:
+    """0-100 score: the percentile of the ability estimate under the N(0, 1) prior"""
+    return round(50.0 * (1.0 + math.erf(theta / math.sqrt(2.0))), 1)
+
+
+class AdaptiveTest:
+    """State of one adaptive test; plain lists so it can live in session state"""
+
+    def __init__(self, skill: str, pool: List[Dict]):
+        self.skill = skill
+        self.pool = pool
+        self.administered: List[Dict] = []
+        self.responses: List[int] = []  # Selected option index per administered item
+        self.theta, self.se = estimate_ability([], [])
+        self.timed_out = False
+        self.stage: List[Dict] = []
+        self.stage_deadline = 0.0
+        self.finished = not pool
+        if not self.finished:
+            self._start_stage()
+
+    def _start_stage(self, now: Optional[float] = None):
+        count = min(STAGE_SIZE, MAX_ITEMS - len(self.administered))
+        self.stage = next_items(self.pool, (item['id'] for item in self.administered), self.theta, count)
+        self.stage_deadline = (time.time() if now is None else now) + SECONDS_PER_ITEM * len(self.stage)
+
+    def seconds_left(self, now: Optional[float] = None) -> float:
+        return max(0.0, self.stage_deadline - (time.time() if now is None else now))
+
+    def answer_stage(self, responses: List[Optional[int]], now: Optional[float] = None) -> bool:
+        """Score the submitted stage, re-estimate ability and start the next stage or finish.
+
+        A submission after the deadline counts every question of the stage as unanswered and
+        ends the test. Returns whether the submission was on time.
+        """
+        if self.finished:
+            return False
+        now = time.time() if now is None else now
+        on_time = now <= self.stage_deadline + GRACE_SECONDS
+        for item, response in zip(self.stage, responses):
+            self.administered.append(item)
+            self.responses.append(response if on_time and response is not None else UNANSWERED)
+        self.theta, self.se = estimate_ability(self.administered, self.correctness())
+        remaining = len(self.pool) - len(self.administered)
+        if not on_time or should_stop(len(self.administered), self.se, remaining):
+            self.stage, self.finished, self.timed_out = [], True, not on_time
+        else:
+            self._start_stage(now)
+        return on_time
+
+    def correctness(self) -> List[bool]:
+        return [item['answer'] == response for item, response in zip(self.administered, self.responses)]
+
+    @property
+    def score(self) -> float:
+        return calibrated_score(self.theta)
+
+    @property
+    def measured(self) -> bool:
+        """Whether enough questions were administered for the score to be stored"""
+        return len(self.administered) >= MIN_ITEMS
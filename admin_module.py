@@ -4,7 +4,33 @@ import numpy as np
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
-from collections import Counter
+import skill_index as sidx
+from matching import unique_skills
+import match_table  # noqa: F401  registers the match refresh tasks submitted here
+import item_calibration  # noqa: F401  registers the calibration task submitted here
+import storage
+import data_layer
+import analytics
+import skill_table
+import partitioned_store
+import data_grid
+import data_export
+import student_module  # noqa: F401  registers the re-classification task submitted here
+import resume_ingest
+import task_queue as tq
+import task_status as ts
+
+def _download_export(label: str, path, fmt: str, file_name: str, key: str) -> bool:
+    """Download button serving an export file written by data_export; False, with a notice, if
+    the file has already been removed as an old export (download_button reads it into memory)"""
+    suffix, mime = data_export.FORMATS[fmt]
+    try:
+        with open(path, 'rb') as handle:
+            st.download_button(label, handle, f"{file_name}{suffix}", mime, key=key)
+    except FileNotFoundError:
+        st.info("ℹ️ This export has expired. Please generate it again.")
+        return False
+    return True
 
 def display_admin_dashboard():
     """Main admin dashboard function"""
@@ -52,131 +78,13 @@ def display_admin_dashboard():
     )
     st.header("👤 Admin Panel")
     
-    # Initialize shared session state with empty DataFrames (no dummy data)
-    if 'students' not in st.session_state:
-        st.session_state.students = pd.DataFrame(columns=[
-            'StudentID', 'Name', 'Email', 'College', 'Degree', 'Year', 'CGPA', 
-            'Resume Score', 'Test Score', 'Skills', 'Skills_Count', 
-            'Test_Completed', 'Resume_Uploaded', 'Status', 'Registration_Date', 
-            'Applications_Count'
-        ])
-    if 'companies' not in st.session_state:
-        st.session_state.companies = pd.DataFrame(columns=[
-            'CompanyID', 'Name', 'Industry', 'Company_Size', 'Jobs_Posted', 
-            'Total_Applications', 'Approval_Status', 'Registration_Date'
-        ])
-    if 'jobs' not in st.session_state:
-        st.session_state.jobs = pd.DataFrame(columns=[
-            'JobID', 'Company', 'Role', 'Location', 'Salary', 'Experience', 
-            'Description', 'Openings', 'Status', 'Posted_Date', 'Applications', 
-            'Min Resume Score', 'Min Test Score', 'Required Skills'
-        ])
-    if 'applications' not in st.session_state:
-        st.session_state.applications = pd.DataFrame(columns=['JobID', 'StudentID', 'ApplicationDate', 'Status'])
-    if 'shortlists' not in st.session_state:
-        st.session_state.shortlists = pd.DataFrame(columns=['JobID', 'StudentID', 'ShortlistDate', 'Status'])
-    if 'admin_credentials' not in st.session_state:
-        st.session_state.admin_credentials = {'ADMIN001': 'admin@123'}
-
-    # Ensure correct data types for jobs DataFrame
-    jobs_df = st.session_state.jobs.copy()
-    students_df = st.session_state.students.copy()
-    companies_df = st.session_state.companies
-    applications_df = st.session_state.applications
-    shortlists_df = st.session_state.shortlists
-
-    # Convert numeric columns in jobs_df
-    numeric_columns_jobs = ['Openings', 'Applications', 'Min Resume Score', 'Min Test Score']
-    for col in numeric_columns_jobs:
-        if col in jobs_df.columns:
-            jobs_df[col] = pd.to_numeric(jobs_df[col], errors='coerce').fillna(0).astype(int)
-
-    # Convert string columns in jobs_df
-    string_columns_jobs = ['JobID', 'Company', 'Role', 'Location', 'Salary', 'Experience', 'Description', 'Status']
-    for col in string_columns_jobs:
-        if col in jobs_df.columns:
-            jobs_df[col] = jobs_df[col].astype(str)
-
-    # Ensure list and datetime columns in jobs_df
-    if 'Required Skills' in jobs_df.columns:
-        jobs_df['Required Skills'] = jobs_df['Required Skills'].apply(lambda x: x if isinstance(x, list) else [])
-    if 'Posted_Date' in jobs_df.columns:
-        jobs_df['Posted_Date'] = pd.to_datetime(jobs_df['Posted_Date'], errors='coerce').fillna(pd.to_datetime(datetime.now()))
-
-    # Convert numeric columns in students_df
-    numeric_columns_students = ['CGPA', 'Resume Score', 'Test Score', 'Skills_Count', 'Applications_Count']
-    for col in numeric_columns_students:
-        if col in students_df.columns:
-            if col == 'CGPA':
-                students_df[col] = pd.to_numeric(students_df[col], errors='coerce').fillna(0.0).astype(float)
-            else:
-                students_df[col] = pd.to_numeric(students_df[col], errors='coerce').fillna(0).astype(int)
-
-    # Convert string columns in students_df
-    string_columns_students = ['StudentID', 'Name', 'Email', 'College', 'Degree', 'Year', 'Status']
-    for col in string_columns_students:
-        if col in students_df.columns:
-            students_df[col] = students_df[col].astype(str)
-
-    # Ensure list and boolean columns in students_df
-    if 'Skills' in students_df.columns:
-        students_df['Skills'] = students_df['Skills'].apply(lambda x: x if isinstance(x, list) else [])
-    if 'Test_Completed' in students_df.columns:
-        students_df['Test_Completed'] = students_df['Test_Completed'].astype(bool)
-    if 'Resume_Uploaded' in students_df.columns:
-        students_df['Resume_Uploaded'] = students_df['Resume_Uploaded'].astype(bool)
-    if 'Registration_Date' in students_df.columns:
-        students_df['Registration_Date'] = pd.to_datetime(students_df['Registration_Date'], errors='coerce').fillna(pd.to_datetime(datetime.now()))
-
-    # Update session state
-    st.session_state.jobs = jobs_df
-    st.session_state.students = students_df
-
-    # Ensure all required columns exist
-    required_student_cols = [
-        'StudentID', 'Name', 'Email', 'College', 'Degree', 'Year', 'CGPA', 
-        'Resume Score', 'Test Score', 'Skills', 'Skills_Count', 
-        'Test_Completed', 'Resume_Uploaded', 'Status', 'Registration_Date', 
-        'Applications_Count'
-    ]
-    for col in required_student_cols:
-        if col not in students_df.columns:
-            if col == 'Skills':
-                students_df[col] = [[] for _ in range(len(students_df))]
-            elif col == 'Email':
-                students_df[col] = ''
-            elif '_Count' in col or 'Score' in col:
-                students_df[col] = 0 if col != 'CGPA' else 0.0
-            elif 'Completed' in col or 'Uploaded' in col:
-                students_df[col] = False
-            elif col == 'Status':
-                students_df[col] = 'Active'
-            elif col == 'Registration_Date':
-                students_df[col] = pd.to_datetime(datetime.now())
-            else:
-                students_df[col] = ''
-
-    required_job_cols = [
-        'JobID', 'Company', 'Role', 'Location', 'Salary', 'Experience', 
-        'Description', 'Openings', 'Status', 'Posted_Date', 'Applications', 
-        'Min Resume Score', 'Min Test Score', 'Required Skills'
-    ]
-    for col in required_job_cols:
-        if col not in jobs_df.columns:
-            jobs_df[col] = 0 if col in ['Applications', 'Openings', 'Min Resume Score', 'Min Test Score'] else 'Open' if col == 'Status' else pd.to_datetime(datetime.now()) if col == 'Posted_Date' else [] if col == 'Required Skills' else ''
-
-    # Update derived metrics
-    if not applications_df.empty:
-        app_counts_jobs = applications_df.groupby('JobID').size()
-        jobs_df['Applications'] = jobs_df['JobID'].map(app_counts_jobs).fillna(0).astype(int)
-        app_counts_students = applications_df.groupby('StudentID').size()
-        students_df['Applications_Count'] = students_df['StudentID'].map(app_counts_students).fillna(0).astype(int)
-        company_apps = applications_df.merge(jobs_df[['JobID', 'Company']], on='JobID').groupby('Company').size()
-        companies_df['Total_Applications'] = companies_df['Name'].map(company_apps).fillna(0).astype(int)
-
-    st.session_state.jobs = jobs_df
-    st.session_state.students = students_df
-    st.session_state.companies = companies_df
+    # One normalized copy of each table is shared by all sessions and refreshed after writes;
+    # sections read only the tables they show, when they are opened
+    repo = storage.get_repository()
+    shared = data_layer.get_shared_data()
+    rollups = analytics.get_rollups()
+    skills = skill_table.get_skill_table()
+    archive = partitioned_store.get_archive()
 
     if not st.session_state.logged_in:
         col1, col2 = st.columns(2)
@@ -186,7 +94,7 @@ def display_admin_dashboard():
                 admin_id = st.text_input("Admin ID (e.g., ADMIN001)")
                 admin_password = st.text_input("Password", type="password")
                 if st.form_submit_button("Login"):
-                    if admin_id in st.session_state.admin_credentials and admin_password == st.session_state.admin_credentials[admin_id]:
+                    if repo.verify_credential('admin', admin_id, admin_password):
                         st.session_state.logged_in = True
                         st.session_state.user_id = admin_id
                         st.rerun()
@@ -200,8 +108,8 @@ def display_admin_dashboard():
                 new_admin_password = st.text_input("Password", type="password")
                 if st.form_submit_button("Signup"):
                     if new_admin_name and new_admin_email and new_admin_password:
-                        new_id = f"ADMIN{len(st.session_state.admin_credentials) + 1:03d}"
-                        st.session_state.admin_credentials[new_id] = new_admin_password
+                        new_id = f"ADMIN{repo.count_credentials('admin') + 1:03d}"
+                        repo.set_credential('admin', new_id, new_admin_password)
                         st.success(f"✅ Signup successful! Your Admin ID is {new_id}. Please login.")
                     else:
                         st.error("⚠️ Please complete all fields.")
@@ -211,45 +119,39 @@ def display_admin_dashboard():
         st.sidebar.title(f"Admin Menu")
         admin_option = st.sidebar.radio(
             "Select Section",
-            ["📊 Dashboard Overview", "🎓 Manage Students", "🏢 Manage Companies", "📝 Manage Jobs", "⚙️ Portal Settings", "📈 Analytics"]
+            ["📊 Dashboard Overview", "🎓 Manage Students", "🏢 Manage Companies", "📝 Manage Jobs", "📥 Bulk Resume Upload", "⚙️ Portal Settings", "📈 Analytics"]
         )
         
         if admin_option == "📊 Dashboard Overview":
             st.subheader("📊 Dashboard Overview")
+            totals = rollups.overview()
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                total_students = len(students_df)
-                active_students = len(students_df[students_df['Status'] == 'Active'])
-                st.metric("Total Students", total_students, f"+{active_students} Active")
+                st.metric("Total Students", totals['students'], f"+{totals['active_students']} Active")
             with col2:
-                total_companies = len(companies_df)
-                verified_companies = len(companies_df[companies_df['Approval_Status'] == 'Verified'])
-                st.metric("Total Companies", total_companies, f"{verified_companies} Verified")
+                st.metric("Total Companies", totals['companies'], f"{totals['verified_companies']} Verified")
             with col3:
-                total_jobs = len(jobs_df)
-                open_jobs = len(jobs_df[jobs_df['Status'] == 'Open'])
-                st.metric("Total Jobs", total_jobs, f"{open_jobs} Open")
+                st.metric("Total Jobs", totals['jobs'], f"{totals['open_jobs']} Open")
             with col4:
-                total_applications = len(applications_df)
-                avg_applications = round(total_applications / total_jobs if total_jobs > 0 else 0, 1)
+                total_applications = totals['applications']
+                avg_applications = round(total_applications / totals['jobs'] if totals['jobs'] > 0 else 0, 1)
                 st.metric("Total Applications", total_applications, f"Avg: {avg_applications}")
 
             st.markdown("---")
             col_chart1, col_chart2 = st.columns(2)
             with col_chart1:
                 st.subheader("Student Registration Trends")
-                if not students_df.empty:
-                    reg_trend = students_df.groupby(students_df['Registration_Date'].dt.date).size().reset_index()
-                    reg_trend.columns = ['Date', 'Registrations']
+                reg_trend = rollups.registrations_by_day()
+                if not reg_trend.empty:
+                    reg_trend = reg_trend.rename_axis('Date').reset_index(name='Registrations')
                     fig = px.line(reg_trend, x='Date', y='Registrations', title="Daily Student Registrations")
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No student registrations yet.")
             with col_chart2:
                 st.subheader("Jobs by Industry")
-                if not jobs_df.empty and not companies_df.empty:
-                    jobs_industry = jobs_df.merge(companies_df[['Name', 'Industry']], left_on='Company', right_on='Name', how='left')
-                    industry_counts = jobs_industry['Industry'].value_counts()
+                industry_counts = rollups.jobs_by_industry()
+                if not industry_counts.empty:
                     fig = px.pie(values=industry_counts.values, names=industry_counts.index, title="Job Distribution by Industry")
                     st.plotly_chart(fig, use_container_width=True)
                 else:
@@ -259,15 +161,15 @@ def display_admin_dashboard():
             col_act1, col_act2 = st.columns(2)
             with col_act1:
                 st.write("**Recent Student Registrations**")
-                if not students_df.empty:
-                    recent_students = students_df.sort_values('Registration_Date', ascending=False).head(5)[['Name', 'College', 'Registration_Date']]
+                recent_students = rollups.recent('students')
+                if not recent_students.empty:
                     st.dataframe(recent_students, use_container_width=True)
                 else:
                     st.info("No students registered.")
             with col_act2:
                 st.write("**Recent Job Postings**")
-                if not jobs_df.empty:
-                    recent_jobs = jobs_df.sort_values('Posted_Date', ascending=False).head(5)[['Role', 'Company', 'Posted_Date']]
+                recent_jobs = rollups.recent('jobs')
+                if not recent_jobs.empty:
                     st.dataframe(recent_jobs, use_container_width=True)
                 else:
                     st.info("No jobs posted.")
@@ -275,40 +177,31 @@ def display_admin_dashboard():
         elif admin_option == "🎓 Manage Students":
             st.subheader("🎓 Student Management")
             
-            # Debug: Display students DataFrame and data types
-            with st.expander("Debug: Students DataFrame"):
-                st.write("Students DataFrame:")
-                st.write(students_df)
-                st.write("Data Types:")
-                st.write(students_df.dtypes)
-            
             col_filter1, col_filter2, col_filter3 = st.columns(3)
             with col_filter1:
-                colleges = [str(x) for x in students_df['College'].unique() if pd.notna(x)]
-                college_filter = st.selectbox("Filter by College", ["All"] + sorted(colleges))
+                college_filter = data_grid.filter_select('students', 'College', "Filter by College")
             with col_filter2:
-                degrees = [str(x) for x in students_df['Degree'].unique() if pd.notna(x)]
-                degree_filter = st.selectbox("Filter by Degree", ["All"] + sorted(degrees))
+                degree_filter = data_grid.filter_select('students', 'Degree', "Filter by Degree")
             with col_filter3:
-                statuses = [str(x) for x in students_df['Status'].unique() if pd.notna(x)]
-                status_filter = st.selectbox("Filter by Status", ["All"] + sorted(statuses))
+                status_filter = data_grid.filter_select('students', 'Status', "Filter by Status")
+            student_filters = {'College': college_filter, 'Degree': degree_filter, 'Status': status_filter}
+            sort_column, sort_descending = data_grid.sort_select('students', key="students_sort")
             
-            filtered_students = students_df.copy()
-            try:
-                if college_filter != "All":
-                    filtered_students = filtered_students[filtered_students['College'] == college_filter]
-                if degree_filter != "All":
-                    filtered_students = filtered_students[filtered_students['Degree'] == degree_filter]
-                if status_filter != "All":
-                    filtered_students = filtered_students[filtered_students['Status'] == status_filter]
-            except Exception as e:
-                st.error(f"Error applying filters: {e}. Please check data types.")
-                filtered_students = students_df.copy()
+            page_students, total_students, students_page = data_grid.load_page(
+                'students', 'students', student_filters, sort_column, sort_descending
+            )
             
-            st.write(f"Showing {len(filtered_students)} students")
+            # Debug: Display the current page and its data types
+            with st.expander("Debug: Students DataFrame"):
+                st.write("Students DataFrame (current page):")
+                st.write(page_students)
+                st.write("Data Types:")
+                st.write(page_students.dtypes)
+            
+            st.write(f"Showing {len(page_students)} of {total_students} students")
             
             edited_students = st.data_editor(
-                filtered_students,
+                page_students,
                 column_config={
                     "Status": st.column_config.SelectboxColumn(
                         "Status",
@@ -324,23 +217,42 @@ def display_admin_dashboard():
                     "Applications_Count": st.column_config.NumberColumn("Applications Count", min_value=0)
                 },
                 num_rows="dynamic",
-                use_container_width=True
+                use_container_width=True,
+                key=data_grid.editor_key('students', student_filters, students_page, sort_column, sort_descending)
             )
+            data_grid.page_controls('students', total_students, students_page)
             
             if st.button("Save Changes"):
-                for col in ['Resume Score', 'Test Score', 'Skills_Count', 'Applications_Count']:
-                    edited_students[col] = pd.to_numeric(edited_students[col], errors='coerce').fillna(0).astype(int)
-                edited_students['CGPA'] = pd.to_numeric(edited_students['CGPA'], errors='coerce').fillna(0.0).astype(float)
-                st.session_state.students.update(edited_students)
-                st.session_state.students['Skills_Count'] = st.session_state.students['Skills'].apply(len)
-                st.success("Changes saved!")
+                changed_students = pd.DataFrame(data_grid.changed_rows('students', page_students, edited_students))
+                if not changed_students.empty:
+                    for col in ['Resume Score', 'Test Score', 'Skills_Count', 'Applications_Count']:
+                        changed_students[col] = pd.to_numeric(changed_students[col], errors='coerce').fillna(0).astype(int)
+                    changed_students['CGPA'] = pd.to_numeric(changed_students['CGPA'], errors='coerce').fillna(0.0).astype(float)
+                    changed_students['Skills'] = changed_students['Skills'].apply(lambda x: unique_skills(x) if isinstance(x, list) else [])
+                    changed_students['Skills_Count'] = changed_students['Skills'].apply(len)
+                    repo.upsert('students', changed_students.to_dict('records'))
+                    index, queue = sidx.get_skill_index(), tq.get_task_queue()
+                    for student in changed_students.to_dict('records'):
+                        index.add_student(student['StudentID'], student['Skills'], student['Resume Score'], student['Test Score'])
+                        queue.submit('refresh_student_matches', {'student_id': student['StudentID']})
+                removed_students = data_grid.deleted_keys('students', page_students, edited_students)
+                index, queue = sidx.get_skill_index(), tq.get_task_queue()
+                for student_id in removed_students:
+                    repo.delete('students', student_id)
+                    index.remove_student(student_id)
+                    queue.submit('refresh_student_matches', {'student_id': student_id})  # Drops their matches
+                st.success(f"Changes saved! ({len(changed_students)} students updated, {len(removed_students)} deleted)")
 
             st.subheader("Bulk Actions")
             col_bulk1, col_bulk2, col_bulk3 = st.columns(3)
             with col_bulk1:
+                export_format = st.selectbox("Export Format", list(data_export.FORMATS), key="students_export_format")
                 if st.button("Export Student Data"):
-                    csv = filtered_students.to_csv(index=False)
-                    st.download_button("Download CSV", csv, "students.csv", "text/csv")
+                    export_path = data_export.export_batches(
+                        data_export.table_batches('students', {c: v for c, v in student_filters.items() if v is not None}),
+                        export_format, name='students'
+                    )
+                    _download_export("Download File", export_path, export_format, "students", key="download_students")
             with col_bulk2:
                 if st.button("Send Notification"):
                     st.info("Notification feature would send messages to selected students")
@@ -350,6 +262,7 @@ def display_admin_dashboard():
 
         elif admin_option == "🏢 Manage Companies":
             st.subheader("🏢 Company Management")
+            companies_df = shared.frame('companies')
             pending_companies = companies_df[companies_df['Approval_Status'] == 'Pending']
             if not pending_companies.empty:
                 st.warning(f"⚠️ {len(pending_companies)} companies pending approval")
@@ -365,14 +278,12 @@ def display_admin_dashboard():
                             col_approve, col_reject = st.columns(2)
                             with col_approve:
                                 if st.button("Approve", key=f"approve_{company['CompanyID']}"):
-                                    index = companies_df[companies_df['CompanyID'] == company['CompanyID']].index[0]
-                                    st.session_state.companies.loc[index, 'Approval_Status'] = 'Verified'
+                                    repo.update('companies', company['CompanyID'], {'Approval_Status': 'Verified'})
                                     st.success(f"✅ {company['Name']} approved!")
                                     st.rerun()
                             with col_reject:
                                 if st.button("Reject", key=f"reject_{company['CompanyID']}"):
-                                    index = companies_df[companies_df['CompanyID'] == company['CompanyID']].index[0]
-                                    st.session_state.companies.loc[index, 'Approval_Status'] = 'Rejected'
+                                    repo.update('companies', company['CompanyID'], {'Approval_Status': 'Rejected'})
                                     st.error(f"❌ {company['Name']} rejected!")
                                     st.rerun()
             
@@ -380,20 +291,18 @@ def display_admin_dashboard():
             st.subheader("All Companies")
             col_comp_filter1, col_comp_filter2 = st.columns(2)
             with col_comp_filter1:
-                industries = [str(x) for x in companies_df['Industry'].unique() if pd.notna(x)]
-                industry_filter = st.selectbox("Filter by Industry", ["All"] + sorted(industries))
+                industry_filter = data_grid.filter_select('companies', 'Industry', "Filter by Industry")
             with col_comp_filter2:
-                statuses = [str(x) for x in companies_df['Approval_Status'].unique() if pd.notna(x)]
-                approval_filter = st.selectbox("Filter by Status", ["All"] + sorted(statuses))
+                approval_filter = data_grid.filter_select('companies', 'Approval_Status', "Filter by Status")
+            company_filters = {'Industry': industry_filter, 'Approval_Status': approval_filter}
+            sort_column, sort_descending = data_grid.sort_select('companies', key="companies_sort")
             
-            filtered_companies = companies_df.copy()
-            if industry_filter != "All":
-                filtered_companies = filtered_companies[filtered_companies['Industry'] == industry_filter]
-            if approval_filter != "All":
-                filtered_companies = filtered_companies[filtered_companies['Approval_Status'] == approval_filter]
+            page_companies, total_companies, companies_page = data_grid.load_page(
+                'companies', 'companies', company_filters, sort_column, sort_descending
+            )
             
             edited_companies = st.data_editor(
-                filtered_companies,
+                page_companies,
                 column_config={
                     "Approval_Status": st.column_config.SelectboxColumn(
                         "Status",
@@ -403,60 +312,54 @@ def display_admin_dashboard():
                     "Total_Applications": st.column_config.NumberColumn("Total Applications", min_value=0),
                     "Registration_Date": st.column_config.DateColumn("Registration Date")
                 },
-                use_container_width=True
+                use_container_width=True,
+                key=data_grid.editor_key('companies', company_filters, companies_page, sort_column, sort_descending)
             )
+            data_grid.page_controls('companies', total_companies, companies_page)
             
             if st.button("Save Company Changes"):
-                for col in ['Jobs_Posted', 'Total_Applications']:
-                    edited_companies[col] = pd.to_numeric(edited_companies[col], errors='coerce').fillna(0).astype(int)
-                st.session_state.companies.update(edited_companies)
-                st.success("Changes saved!")
+                changed_companies = pd.DataFrame(data_grid.changed_rows('companies', page_companies, edited_companies))
+                if not changed_companies.empty:
+                    for col in ['Jobs_Posted', 'Total_Applications']:
+                        changed_companies[col] = pd.to_numeric(changed_companies[col], errors='coerce').fillna(0).astype(int)
+                    repo.upsert('companies', changed_companies.to_dict('records'))
+                st.success(f"Changes saved! ({len(changed_companies)} companies updated)")
 
         elif admin_option == "📝 Manage Jobs":
             st.subheader("📝 Job Management")
             
-            # Debug: Display jobs DataFrame and data types
-            with st.expander("Debug: Jobs DataFrame"):
-                st.write("Jobs DataFrame:")
-                st.write(jobs_df)
-                st.write("Data Types:")
-                st.write(jobs_df.dtypes)
-            
+            totals = rollups.overview()
             col_stat1, col_stat2, col_stat3 = st.columns(3)
             with col_stat1:
-                st.metric("Total Jobs", len(jobs_df))
+                st.metric("Total Jobs", totals['jobs'])
             with col_stat2:
-                st.metric("Open Positions", len(jobs_df[jobs_df['Status'] == 'Open']))
+                st.metric("Open Positions", totals['open_jobs'])
             with col_stat3:
-                st.metric("Total Openings", int(jobs_df['Openings'].sum()))
+                st.metric("Total Openings", totals['openings'])
             
             col_job_filter1, col_job_filter2, col_job_filter3 = st.columns(3)
             with col_job_filter1:
-                roles = [str(x) for x in jobs_df['Role'].unique() if pd.notna(x)]
-                role_filter = st.selectbox("Filter by Role", ["All"] + sorted(roles))
+                role_filter = data_grid.filter_select('jobs', 'Role', "Filter by Role")
             with col_job_filter2:
-                locations = [str(x) for x in jobs_df['Location'].unique() if pd.notna(x)]
-                location_filter = st.selectbox("Filter by Location", ["All"] + sorted(locations))
+                location_filter = data_grid.filter_select('jobs', 'Location', "Filter by Location")
             with col_job_filter3:
-                statuses = [str(x) for x in jobs_df['Status'].unique() if pd.notna(x)]
-                status_job_filter = st.selectbox("Filter by Job Status", ["All"] + sorted(statuses))
+                status_job_filter = data_grid.filter_select('jobs', 'Status', "Filter by Job Status")
+            job_filters = {'Role': role_filter, 'Location': location_filter, 'Status': status_job_filter}
+            sort_column, sort_descending = data_grid.sort_select('jobs', key="jobs_sort")
             
-            filtered_jobs = jobs_df.copy()
-            try:
-                if role_filter != "All":
-                    filtered_jobs = filtered_jobs[filtered_jobs['Role'] == role_filter]
-                if location_filter != "All":
-                    filtered_jobs = filtered_jobs[filtered_jobs['Location'] == location_filter]
-                if status_job_filter != "All":
-                    filtered_jobs = filtered_jobs[filtered_jobs['Status'] == status_job_filter]
-            except Exception as e:
-                st.error(f"Error applying filters: {e}. Please ensure all job data is correctly formatted.")
-                filtered_jobs = jobs_df.copy()
+            page_jobs, total_jobs, jobs_page = data_grid.load_page('jobs', 'jobs', job_filters, sort_column, sort_descending)
             
-            st.write(f"Showing {len(filtered_jobs)} jobs")
+            # Debug: Display the current page and its data types
+            with st.expander("Debug: Jobs DataFrame"):
+                st.write("Jobs DataFrame (current page):")
+                st.write(page_jobs)
+                st.write("Data Types:")
+                st.write(page_jobs.dtypes)
+            
+            st.write(f"Showing {len(page_jobs)} of {total_jobs} jobs")
             
             edited_jobs = st.data_editor(
-                filtered_jobs,
+                page_jobs,
                 column_config={
                     "Status": st.column_config.SelectboxColumn(
                         "Status",
@@ -467,20 +370,32 @@ def display_admin_dashboard():
                     "Min Resume Score": st.column_config.NumberColumn("Min Resume Score", min_value=0, max_value=100, format="%d"),
                     "Min Test Score": st.column_config.NumberColumn("Min Test Score", min_value=0, max_value=100, format="%d")
                 },
-                use_container_width=True
+                use_container_width=True,
+                key=data_grid.editor_key('jobs', job_filters, jobs_page, sort_column, sort_descending)
             )
+            data_grid.page_controls('jobs', total_jobs, jobs_page)
             
             if st.button("Save Job Changes"):
-                for col in numeric_columns_jobs:
-                    edited_jobs[col] = pd.to_numeric(edited_jobs[col], errors='coerce').fillna(0).astype(int)
-                st.session_state.jobs.update(edited_jobs)
-                st.success("Changes saved!")
+                changed_jobs = pd.DataFrame(data_grid.changed_rows('jobs', page_jobs, edited_jobs))
+                if not changed_jobs.empty:
+                    for col in data_layer.INT_COLUMNS['jobs']:
+                        changed_jobs[col] = pd.to_numeric(changed_jobs[col], errors='coerce').fillna(0).astype(int)
+                    changed_jobs['Required Skills'] = changed_jobs['Required Skills'].apply(
+                        lambda x: unique_skills(x) if isinstance(x, list) else [])
+                    repo.upsert('jobs', changed_jobs.to_dict('records'))
+                    index, queue = sidx.get_skill_index(), tq.get_task_queue()
+                    for job in changed_jobs.to_dict('records'):
+                        index.add_job(job['JobID'], job['Required Skills'])
+                        queue.submit('refresh_job_matches', {'job_id': job['JobID']})
+                st.success(f"Changes saved! ({len(changed_jobs)} jobs updated)")
             
             # Shortlist Management
             st.markdown("---")
             st.subheader("Shortlist Management")
-            if not filtered_jobs.empty and not applications_df.empty:
-                for _, job in filtered_jobs.iterrows():
+            applications_df = shared.frame('applications') if not page_jobs.empty else pd.DataFrame()
+            if not page_jobs.empty and not applications_df.empty:
+                students_df = shared.frame('students')
+                for _, job in page_jobs.iterrows():
                     with st.expander(f"Shortlist Candidates for {job['Role']} at {job['Company']} (JobID: {job['JobID']})"):
                         job_applications = applications_df[applications_df['JobID'] == job['JobID']]
                         if not job_applications.empty:
@@ -492,36 +407,24 @@ def display_admin_dashboard():
                                 key=f"shortlist_{job['JobID']}"
                             )
                             if st.button("Shortlist Selected", key=f"shortlist_btn_{job['JobID']}"):
-                                for student_id in selected_applicants:
-                                    new_shortlist = {
-                                        'JobID': job['JobID'],
-                                        'StudentID': student_id,
-                                        'ShortlistDate': pd.to_datetime(datetime.now()),
-                                        'Status': 'Shortlisted'
-                                    }
-                                    if not ((st.session_state.shortlists['JobID'] == job['JobID']) & 
-                                            (st.session_state.shortlists['StudentID'] == student_id)).any():
-                                        st.session_state.shortlists = pd.concat([st.session_state.shortlists, pd.DataFrame([new_shortlist])], ignore_index=True)
+                                new_shortlists = [{
+                                    'JobID': job['JobID'],
+                                    'StudentID': student_id,
+                                    'ShortlistDate': pd.to_datetime(datetime.now()),
+                                    'Status': 'Shortlisted'
+                                } for student_id in selected_applicants]
+                                # Already shortlisted students are skipped by the (JobID, StudentID) key
+                                repo.insert('shortlists', new_shortlists, ignore_existing=True)
                                 st.success(f"✅ {len(selected_applicants)} students shortlisted for {job['Role']}!")
                             
                             if st.button("Share Shortlisted Details", key=f"share_{job['JobID']}"):
-                                shortlisted = st.session_state.shortlists[
-                                    (st.session_state.shortlists['JobID'] == job['JobID']) & 
-                                    (st.session_state.shortlists['Status'] == 'Shortlisted')
-                                ]
-                                if not shortlisted.empty:
-                                    shortlisted_details = shortlisted.merge(
-                                        students_df[['StudentID', 'Name', 'Email', 'Skills', 'Resume Score', 'Test Score']],
-                                        on='StudentID'
-                                    )
-                                    csv = shortlisted_details[['Name', 'Email', 'Skills', 'Resume Score', 'Test Score']].to_csv(index=False)
-                                    st.download_button(
-                                        label="Download Shortlisted Candidates",
-                                        data=csv,
-                                        file_name=f"shortlisted_{job['JobID']}.csv",
-                                        mime="text/csv",
-                                        key=f"download_{job['JobID']}"
+                                if repo.count('shortlists', {'JobID': job['JobID'], 'Status': 'Shortlisted'}):
+                                    export_path = data_export.export_batches(
+                                        data_export.shortlisted_batches(job['JobID']), 'csv',
+                                        name=f"shortlisted_{job['JobID']}", columns=data_export.SHORTLIST_COLUMNS
                                     )
+                                    _download_export("Download Shortlisted Candidates", export_path, 'csv',
+                                                     f"shortlisted_{job['JobID']}", key=f"download_{job['JobID']}")
                                     st.info("Mock: Details sent to company via email.")
                                 else:
                                     st.warning("No students shortlisted for this job.")
@@ -533,22 +436,53 @@ def display_admin_dashboard():
             st.subheader("Job Insights")
             col_insight1, col_insight2 = st.columns(2)
             with col_insight1:
-                if not jobs_df.empty:
-                    role_counts = jobs_df['Role'].value_counts().head(10)
+                role_counts = rollups.role_counts().head(10)
+                if not role_counts.empty:
                     fig = px.bar(x=role_counts.values, y=role_counts.index, orientation='h', 
                                title="Most Posted Job Roles", labels={'x': 'Number of Jobs', 'y': 'Role'})
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No jobs available.")
             with col_insight2:
-                if not jobs_df.empty:
-                    location_apps = jobs_df.groupby('Location')['Applications'].sum().sort_values(ascending=False)
+                location_apps = rollups.applications_by('Location')
+                if not location_apps.empty:
                     fig = px.bar(x=location_apps.index, y=location_apps.values,
                                title="Applications by Location", labels={'x': 'Location', 'y': 'Applications'})
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No applications available.")
 
+        elif admin_option == "📥 Bulk Resume Upload":
+            st.subheader("📥 Bulk Resume Upload")
+            st.write("Upload a ZIP of resumes (PDF, DOCX or TXT) named with student IDs, e.g. `STU1001_resume.pdf`.")
+            resume_archive = st.file_uploader("Resume Archive", type=["zip"])
+            workers = st.slider("Parallel Workers", min_value=1, max_value=8, value=resume_ingest.MAX_WORKERS)
+            if resume_archive is not None and st.button("Ingest Resumes"):
+                ts.track_task('ingest_resumes', tq.get_task_queue().submit('ingest_resumes', {
+                    'path': resume_ingest.save_upload(resume_archive.getvalue()), 'workers': workers
+                }))
+            ingest_task = ts.tracked_task('ingest_resumes')
+            finished = ts.finished_task(ingest_task, "Ingesting resumes") if ingest_task else None
+            if finished:
+                report = finished['Result']
+                results = pd.DataFrame(report['results'], columns=['File', 'StudentID', 'Skills_Count', 'Predicted Role'])
+                failures = pd.DataFrame(report['failures'], columns=['File', 'StudentID', 'Error'])
+                col_ing1, col_ing2, col_ing3, col_ing4 = st.columns(4)
+                with col_ing1:
+                    st.metric("Files Processed", report['files'])
+                with col_ing2:
+                    st.metric("Students Updated", results['StudentID'].nunique())
+                with col_ing3:
+                    st.metric("Failed Files", len(failures))
+                with col_ing4:
+                    st.metric("Throughput", f"{report['files_per_second']:.1f} files/s")
+                st.caption(f"{report['bytes'] / (1024 * 1024):.1f} MB in {report['seconds']:.1f} seconds")
+                if not results.empty:
+                    st.dataframe(results, use_container_width=True)
+                if not failures.empty:
+                    st.warning(f"⚠️ {len(failures)} files could not be used")
+                    st.dataframe(failures, use_container_width=True)
+
         elif admin_option == "⚙️ Portal Settings":
             st.subheader("⚙️ Portal Settings")
             st.subheader("System Announcements")
@@ -567,14 +501,20 @@ def display_admin_dashboard():
                 st.checkbox("Allow Resume Upload", value=True)
                 st.checkbox("Enable Skill Testing", value=True)
             with col_config2:
-                st.number_input("Max Resume Size (MB)", min_value=1, max_value=10, value=5)
+                max_resume_size_mb = storage.get_setting('max_resume_size_mb', repo)
+                new_max_resume_size_mb = st.number_input(
+                    "Max Resume Size (MB)", min_value=1, max_value=10, value=max_resume_size_mb
+                )
+                if new_max_resume_size_mb != max_resume_size_mb:
+                    # Shared with every session, the API and bulk imports
+                    storage.set_setting('max_resume_size_mb', new_max_resume_size_mb, repo)
                 st.number_input("Max Applications per Student", min_value=1, max_value=50, value=20)
                 st.selectbox("Default Theme", ["Light", "Dark", "Auto"])
                 st.selectbox("Email Notifications", ["Enabled", "Disabled", "Weekly Summary"])
             
             st.markdown("---")
             st.subheader("Database Maintenance")
-            col_maint1, col_maint2, col_maint3 = st.columns(3)
+            col_maint1, col_maint2, col_maint3, col_maint4, col_maint5 = st.columns(5)
             with col_maint1:
                 if st.button("Backup Database"):
                     st.info("Database backup initiated...")
@@ -584,6 +524,30 @@ def display_admin_dashboard():
             with col_maint3:
                 if st.button("System Health Check"):
                     st.success("System is running normally ✅")
+            with col_maint4:
+                if st.button("Rebuild Match Table"):
+                    ts.track_task('rebuild_matches', tq.get_task_queue().submit('rebuild_matches'))
+                rebuild_task = ts.tracked_task('rebuild_matches')
+                finished = ts.finished_task(rebuild_task, "Rebuilding matches") if rebuild_task else None
+                if finished:
+                    st.success(f"Match table rebuilt: {finished['Result']['matches']} matches ✅")
+            with col_maint5:
+                if st.button("Calibrate Questions"):
+                    ts.track_task('calibrate_questions', tq.get_task_queue().submit('calibrate_questions'))
+                calibration_task = ts.tracked_task('calibrate_questions')
+                finished = ts.finished_task(calibration_task, "Calibrating") if calibration_task else None
+                if finished:
+                    st.success(f"Question statistics updated from {finished['Result']['processed']} new answers ✅")
+            
+            st.markdown("---")
+            st.subheader("Role Re-classification")
+            if st.button("Re-classify Students"):
+                ts.track_task('reclassify_students', tq.get_task_queue().submit('reclassify_students'))
+            reclassify_task = ts.tracked_task('reclassify_students')
+            finished = ts.finished_task(reclassify_task, "Re-classifying students") if reclassify_task else None
+            if finished:
+                st.write(f"Classified {finished['Result']['students']} students")
+                st.bar_chart(pd.Series(finished['Result']['roles'], name='Students', dtype=float))
 
         elif admin_option == "📈 Analytics":
             st.subheader("📈 Advanced Analytics")
@@ -598,20 +562,23 @@ def display_admin_dashboard():
             elif time_period == "Last Year":
                 start_date = today - timedelta(days=365)
             
-            filtered_students = students_df[students_df['Registration_Date'] >= start_date]
-            filtered_jobs = jobs_df[jobs_df['Posted_Date'] >= start_date]
-            filtered_applications = applications_df[applications_df['ApplicationDate'] >= start_date]
+            # Windowed counts read only the archive partitions the period overlaps
+            start_day = start_date.date()
+            student_activity = archive.daily_counts('students', start_day)
+            company_activity = archive.daily_counts('jobs', start_day)
+            new_students = int(student_activity.sum())
+            window_applications = int(archive.daily_counts('applications', start_day).sum())
             
             st.subheader("Key Performance Indicators")
             col_kpi1, col_kpi2, col_kpi3, col_kpi4 = st.columns(4)
             with col_kpi1:
-                conversion_rate = round(len(filtered_applications) / len(filtered_students) * 100 if len(filtered_students) > 0 else 0, 1)
+                conversion_rate = round(window_applications / new_students * 100 if new_students > 0 else 0, 1)
                 st.metric("Application Conversion Rate", f"{conversion_rate}%")
             with col_kpi2:
                 avg_time_to_hire = np.random.randint(10, 15)  # Mock
                 st.metric("Avg. Time to Hire (days)", avg_time_to_hire)
             with col_kpi3:
-                student_engagement = round(len(filtered_students[filtered_students['Applications_Count'] > 0]) / len(filtered_students) * 100 if len(filtered_students) > 0 else 0, 1)
+                student_engagement = round(rollups.engaged_students(start_day) / new_students * 100 if new_students > 0 else 0, 1)
                 st.metric("Student Engagement Rate", f"{student_engagement}%")
             with col_kpi4:
                 company_satisfaction = round(np.random.uniform(4.0, 4.5), 1)  # Mock
@@ -619,14 +586,12 @@ def display_admin_dashboard():
             
             st.markdown("---")
             st.subheader("User Activity Trends")
-            if not filtered_students.empty or not filtered_jobs.empty:
-                dates = pd.date_range(start=start_date.date(), end=today.date())
-                student_activity = filtered_students.groupby(filtered_students['Registration_Date'].dt.date).size().reindex(dates, fill_value=0)
-                company_activity = filtered_jobs.groupby(filtered_jobs['Posted_Date'].dt.date).size().reindex(dates, fill_value=0)
+            if not student_activity.empty or not company_activity.empty:
+                dates = pd.date_range(start=start_day, end=today.date()).date
                 activity_df = pd.DataFrame({
                     'Date': dates,
-                    'Student Activity': student_activity,
-                    'Company Activity': company_activity
+                    'Student Activity': student_activity.reindex(dates, fill_value=0).values,
+                    'Company Activity': company_activity.reindex(dates, fill_value=0).values
                 })
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(x=activity_df['Date'], y=activity_df['Student Activity'], name='Students', line=dict(color='blue')))
@@ -639,13 +604,9 @@ def display_admin_dashboard():
             col_skill1, col_skill2 = st.columns(2)
             with col_skill1:
                 st.subheader("Most In-Demand Skills")
-                all_required_skills = []
-                for _, job in filtered_jobs.iterrows():
-                    if isinstance(job['Required Skills'], list):
-                        all_required_skills.extend(job['Required Skills'])
-                if all_required_skills:
-                    skill_counts = Counter(all_required_skills)
-                    skills_df = pd.DataFrame(list(skill_counts.items()), columns=['Skill', 'Demand']).sort_values('Demand', ascending=False).head(10)
+                skill_counts = skills.demand(start_day)
+                if not skill_counts.empty:
+                    skills_df = skill_counts.head(10).rename_axis('Skill').reset_index()
                     fig = px.bar(skills_df, x='Skill', y='Demand', title='Skills Demand Analysis')
                     st.plotly_chart(fig, use_container_width=True)
                 else:
@@ -653,21 +614,8 @@ def display_admin_dashboard():
             
             with col_skill2:
                 st.subheader("Skill Gap Analysis")
-                if all_required_skills:
-                    unique_skills = list(set(all_required_skills))
-                    demand = [skill_counts.get(s, 0) for s in unique_skills]
-                    student_skills = []
-                    for skills in students_df['Skills']:
-                        if isinstance(skills, list):
-                            student_skills.extend(skills)
-                    supply_counts = Counter(student_skills)
-                    supply = [supply_counts.get(s, 0) for s in unique_skills]
-                    gap_df = pd.DataFrame({
-                        'Skill': unique_skills,
-                        'Demand': demand,
-                        'Supply': supply,
-                        'Gap': [d - s for d, s in zip(demand, supply)]
-                    })
+                if not skill_counts.empty:
+                    gap_df = skills.gap(start_day)
                     gap_df['Abs Gap'] = gap_df['Gap'].abs()
                     # Debug: Display gap_df
                     with st.expander("Debug: Skill Gap Data"):
@@ -679,9 +627,25 @@ def display_admin_dashboard():
                 else:
                     st.info("No skills data available.")
             
+            st.subheader("Top Skill Demand Over Time")
+            weekly_demand = skills.demand_by_period(start_day, freq='W')
+            if not weekly_demand.empty:
+                st.line_chart(weekly_demand)
+            else:
+                st.info("No skills data available.")
+            
             st.markdown("---")
+            report_format = st.selectbox("Report Format", list(data_export.FORMATS), key="report_format")
             if st.button("Generate Analytics Report"):
-                st.info("📊 Comprehensive analytics report would be generated and downloaded here")
+                ts.track_task('analytics_report', tq.get_task_queue().submit(
+                    'analytics_report', {'start': start_day.isoformat(), 'fmt': report_format}
+                ))
+            report_task = ts.tracked_task('analytics_report')
+            finished = ts.finished_task(report_task, "Generating the report") if report_task else None
+            if finished and not _download_export(
+                    "Download Analytics Report", finished['Result']['path'], finished['Result']['format'],
+                    f"analytics_report_{time_period.lower().replace(' ', '_')}", key="download_report"):
+                ts.forget_task('analytics_report')  # The next Generate click runs the report again
 
 if __name__ == "__main__":
     if 'logged_in' not in st.session_state:
@@ -0,0 +1,224 @@
+"""
+Admin Analytics Rollups for the Smart Job Portal
+Daily pre-aggregates of registrations, job postings and applications, kept per process and updated from repository write notifications: inserted rows
+are folded into the counters directly, while updates and deletes mark only the affected
+table's rollups stale so they are re-aggregated on the next read. Dashboard queries read
+these counters, so their cost follows the number of days, jobs and skills rather than
+the number of applications. Skill demand and supply come from skill_table.
+"""
+
+import threading
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import storage
+
+ROLLUP_TABLES = ('students', 'companies', 'jobs', 'applications')
+RECENT_ROWS = 5
+
+
+def _day(value) -> date:
+    """Calendar day of a stored timestamp; missing dates count as today, as on the dashboards"""
+    if value is None or value is pd.NaT or (isinstance(value, float) and pd.isna(value)):
+        return datetime.now().date()
+    return pd.Timestamp(value).date()
+
+
+def _since(counter: Counter, start: Optional[date]) -> Counter:
+    return counter if start is None else Counter({d: n for d, n in counter.items() if d >= start})
+
+
+def _series(counter, name: str) -> pd.Series:
+    return pd.Series(dict(counter), name=name, dtype='int64').sort_values(ascending=False)
+
+
+class AnalyticsRollups:
+    """Per-day counters behind the admin Overview, Job Insights and Analytics pages"""
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self._lock = threading.RLock()
+        self._stale = set(ROLLUP_TABLES)
+        # students
+        self.registrations: Counter = Counter()  # day -> students
+        self.student_status: Counter = Counter()
+        self.student_day: Dict[str, date] = {}
+        self.recent_students: List[Dict] = []
+        # companies
+        self.company_status: Counter = Counter()
+        self.company_industry: Dict[str, str] = {}
+        # jobs
+        self.postings: Counter = Counter()  # day -> jobs
+        self.job_status: Counter = Counter()
+        self.job_info: Dict[str, tuple] = {}  # JobID -> (Company, Location, Role)
+        self.openings = 0
+        self.recent_jobs: List[Dict] = []
+        # applications
+        self.applications: Counter = Counter()  # (day, JobID) -> applications
+        self.job_applications: Counter = Counter()  # JobID -> applications
+        self.applicant_counts: Counter = Counter()  # StudentID -> applications
+        repo.add_listener(self._on_write)
+
+    def _on_write(self, table: str, rows: Optional[List[Dict]], change: Optional[Dict] = None):
+        if table not in ROLLUP_TABLES:
+            return
+        with self._lock:
+            if table in self._stale:
+                return
+            if rows is None:
+                self._stale.add(table)
+            else:
+                getattr(self, f"_add_{table}")(rows)
+
+    def _fresh(self):
+        """Re-aggregate the tables whose rollups were invalidated by a non-insert write"""
+        with self._lock:
+            for table in [t for t in ROLLUP_TABLES if t in self._stale]:
+                self._stale.discard(table)  # Before reading, so writes during the read re-mark it
+                getattr(self, f"_rebuild_{table}")(self.repo.frame(table))
+
+    def _rebuild_students(self, df: pd.DataFrame):
+        self.registrations, self.student_status, self.student_day = Counter(), Counter(), {}
+        self.recent_students = []
+        self._add_students(df.to_dict('records'))
+
+    def _add_students(self, rows: List[Dict]):
+        for row in rows:
+            day = _day(row.get('Registration_Date'))
+            self.registrations[day] += 1
+            self.student_status[row.get('Status')] += 1
+            self.student_day[row.get('StudentID')] = day
+        self.recent_students = self._recent(self.recent_students, rows, ['Name', 'College', 'Registration_Date'])
+
+    def _rebuild_companies(self, df: pd.DataFrame):
+        self.company_status, self.company_industry = Counter(), {}
+        self._add_companies(df.to_dict('records'))
+
+    def _add_companies(self, rows: List[Dict]):
+        for row in rows:
+            self.company_status[row.get('Approval_Status')] += 1
+            self.company_industry[row.get('Name')] = row.get('Industry')
+
+    def _rebuild_jobs(self, df: pd.DataFrame):
+        self.postings, self.job_status, self.job_info = Counter(), Counter(), {}
+        self.openings, self.recent_jobs = 0, []
+        self._add_jobs(df.to_dict('records'))
+
+    def _add_jobs(self, rows: List[Dict]):
+        for row in rows:
+            day = _day(row.get('Posted_Date'))
+            self.postings[day] += 1
+            self.job_status[row.get('Status')] += 1
+            self.job_info[row.get('JobID')] = (row.get('Company'), row.get('Location'), row.get('Role'))
+            openings = pd.to_numeric(row.get('Openings'), errors='coerce')
+            self.openings += 0 if pd.isna(openings) else int(openings)
+        self.recent_jobs = self._recent(self.recent_jobs, rows, ['Role', 'Company', 'Posted_Date'])
+
+    def _rebuild_applications(self, df: pd.DataFrame):
+        # The largest table, so it is aggregated with groupby rather than row by row
+        days = df['ApplicationDate'].dt.date.where(df['ApplicationDate'].notna(), datetime.now().date())
+        self.applications = Counter(df.groupby([days, df['JobID']]).size().to_dict())
+        self.job_applications = Counter(df['JobID'].value_counts().to_dict())
+        self.applicant_counts = Counter(df['StudentID'].value_counts().to_dict())
+
+    def _add_applications(self, rows: List[Dict]):
+        for row in rows:
+            self.applications[(_day(row.get('ApplicationDate')), row.get('JobID'))] += 1
+            self.job_applications[row.get('JobID')] += 1
+            self.applicant_counts[row.get('StudentID')] += 1
+
+    @staticmethod
+    def _recent(current: List[Dict], rows: List[Dict], columns: List[str]) -> List[Dict]:
+        """Newest RECENT_ROWS rows by their date column (the last of columns)"""
+        date_column = columns[-1]
+        merged = current + [{c: row.get(c) for c in columns} for row in rows]
+        merged.sort(key=lambda r: pd.Timestamp(r[date_column]) if pd.notna(r[date_column]) else pd.Timestamp.min,
+                    reverse=True)
+        return merged[:RECENT_ROWS]
+
+    def overview(self) -> Dict[str, int]:
+        """Headline counts for the Dashboard Overview"""
+        with self._lock:
+            self._fresh()
+            return {
+                'students': sum(self.student_status.values()),
+                'active_students': self.student_status.get('Active', 0),
+                'companies': sum(self.company_status.values()),
+                'verified_companies': self.company_status.get('Verified', 0),
+                'jobs': sum(self.job_status.values()),
+                'open_jobs': self.job_status.get('Open', 0),
+                'openings': self.openings,
+                'applications': sum(self.applications.values()),
+            }
+
+    def registrations_by_day(self, start: Optional[date] = None) -> pd.Series:
+        with self._lock:
+            self._fresh()
+            return pd.Series(dict(_since(self.registrations, start)), dtype='int64').sort_index()
+
+    def postings_by_day(self, start: Optional[date] = None) -> pd.Series:
+        with self._lock:
+            self._fresh()
+            return pd.Series(dict(_since(self.postings, start)), dtype='int64').sort_index()
+
+    def jobs_by_industry(self) -> pd.Series:
+        with self._lock:
+            self._fresh()
+            industries = Counter(self.company_industry.get(company) for company, _, _ in self.job_info.values())
+            return _series({k: v for k, v in industries.items() if k is not None}, 'Jobs')
+
+    def applications_by(self, dimension: str, start: Optional[date] = None) -> pd.Series:
+        """Applications per Company, Location or Role, optionally since a day"""
+        position = ('Company', 'Location', 'Role').index(dimension)
+        with self._lock:
+            self._fresh()
+            totals = Counter()
+            for (day, job_id), count in self.applications.items():
+                if (start is None or day >= start) and job_id in self.job_info:
+                    totals[self.job_info[job_id][position]] += count
+            return _series(totals, 'Applications')
+
+    def application_counts(self, table: str, ids: Iterable[str]) -> List[int]:
+        """Applications of each StudentID, JobID or company Name in ids, for the students, jobs or companies table"""
+        with self._lock:
+            self._fresh()
+            if table == 'students':
+                counts = self.applicant_counts
+            elif table == 'jobs':
+                counts = self.job_applications
+            else:
+                counts = Counter(self.applications_by('Company').to_dict())
+            return [counts.get(i, 0) for i in ids]
+
+    def engaged_students(self, start: Optional[date] = None) -> int:
+        """Students registered since start with at least one application"""
+        with self._lock:
+            self._fresh()
+            return sum(1 for student_id in self.applicant_counts
+                       if student_id in self.student_day and (start is None or self.student_day[student_id] >= start))
+
+    def role_counts(self) -> pd.Series:
+        with self._lock:
+            self._fresh()
+            return _series(Counter(role for _, _, role in self.job_info.values()), 'Jobs')
+
+    def recent(self, table: str) -> pd.DataFrame:
+        """Latest student registrations or job postings"""
+        with self._lock:
+            self._fresh()
+            return pd.DataFrame(self.recent_students if table == 'students' else self.recent_jobs)
+
+
+_rollups: Optional[AnalyticsRollups] = None
+_rollups_lock = threading.Lock()
+
+
+def get_rollups() -> AnalyticsRollups:
+    """Process-wide rollups over the process-wide repository"""
+    global _rollups
+    with _rollups_lock:
+        if _rollups is None:
+            _rollups = AnalyticsRollups(storage.get_repository())
+        return _rollups
@@ -0,0 +1,392 @@
+"""
+Matching API for the Smart Job Portal
+Headless HTTP/JSON API (ASGI) over the same matching code as the dashboards, for ATS
+integrations and mobile clients:
+
+    GET  /match/student/{id}   best jobs for a student (?k=, ?min_score=, ?after_score=&after_id=)
+    GET  /match/job/{id}       best students for a job, same parameters
+    POST /resume/analyze       skills and job predictions for a resume sent as the raw body
+    POST /predict              job predictions for {"skills": [...]} or {"batch": [[...], ...]}
+
+The match table, shared data frames, job predictor and resume cache are loaded once and
+shared by every request. Responses are cached until the tables they were read from
+change, identical requests in flight share one computation, and writes made by the
+Streamlit process are picked up by polling the database. Run `python api.py --port 8000`
+(needs uvicorn) or serve `api:app` with any ASGI server, as a single worker process.
+Set PORTAL_API_TOKEN to require `Authorization: Bearer <token>` on every request.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import numpy as np
+
+import data_layer
+import match_ranking as mr
+import match_table as mt
+import resume_parser as rp
+import skill_extraction as sx
+import storage
+
+try:
+    import uvicorn
+except ImportError:  # uvicorn is optional, any ASGI server can serve `api:app`
+    uvicorn = None
+
+logger = logging.getLogger(__name__)
+
+API_TOKEN = os.environ.get('PORTAL_API_TOKEN')
+SYNC_SECONDS = 1.0  # How often writes by other processes are checked for
+RESPONSE_CACHE_ITEMS = 4096
+MAX_PAGE_SIZE = 100
+MAX_BATCH = 1000  # Skill lists per /predict batch
+MAX_JSON_BYTES = 1 * rp.MB
+RESUME_PREDICTIONS = 5  # Best job titles returned for an analyzed resume
+RESUME_TYPES = {
+    'application/pdf': "application/pdf",
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    'text/plain': "text/plain",
+    'pdf': "application/pdf",
+    'docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    'txt': "text/plain",
+}
+JOB_FIELDS = ['JobID', 'Company', 'Role', 'Location', 'Salary', 'Experience', 'Openings', 'Required Skills',
+              'Min Resume Score', 'Min Test Score', 'Match Score']
+STUDENT_FIELDS = ['StudentID', 'Name', 'College', 'Degree', 'Year', 'Skills', 'Resume Score', 'Test Score',
+                  'Match Score']
+MATCH_TABLES = ('students', 'jobs', 'matches')
+
+
+class ApiError(Exception):
+    """Error answered with its HTTP status and {"error": message}"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """LRU cache of encoded responses, each valid until a table it was read from is written"""
+
+    def __init__(self, repo: storage.Repository, max_items: int = RESPONSE_CACHE_ITEMS):
+        self.repo = repo
+        self.max_items = max_items
+        self._entries: "OrderedDict[str, Tuple[tuple, bytes]]" = OrderedDict()
+
+    def versions(self, tables: Tuple[str, ...]) -> tuple:
+        return tuple(self.repo.version(table) for table in tables)
+
+    def get(self, key: str, tables: Tuple[str, ...]) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self.versions(tables):
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, tables: Tuple[str, ...], versions: tuple, body: bytes):
+        """Store a body built from the given table versions (read before building it)"""
+        if versions != self.versions(tables):
+            return  # Written while building; the next request rebuilds it
+        self._entries[key] = (versions, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode(payload) -> bytes:
+    return json.dumps(payload, default=_json_default).encode('utf-8')
+
+
+# Shared by every request; only touched from the event loop thread
+_responses: Optional[ResponseCache] = None
+_inflight: Dict[str, asyncio.Future] = {}
+_sync_task: Optional[asyncio.Task] = None
+
+
+def _response_cache() -> ResponseCache:
+    global _responses
+    if _responses is None:
+        _responses = ResponseCache(storage.get_repository())
+    return _responses
+
+
+async def _shared_run(key: str, function: Callable, *args):
+    """Run function in the thread pool, sharing one run between identical requests in flight"""
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.get_running_loop().run_in_executor(None, function, *args)
+        _inflight[key] = future
+        future.add_done_callback(lambda done: _inflight.pop(key, None) if _inflight.get(key) is done else None)
+    return await asyncio.shield(future)
+
+
+async def _cached(key: str, tables: Tuple[str, ...], build: Callable, *args) -> bytes:
+    """Encoded result of build(*args), served from the response cache while tables are unchanged"""
+    cache = _response_cache()
+    body = cache.get(key, tables)
+    if body is None:
+        versions = cache.versions(tables)
+        body = await _shared_run(key, lambda: encode(build(*args)))
+        cache.put(key, tables, versions, body)
+    return body
+
+
+def _sync():
+    """Pick up writes by other processes: only the tables they changed get new versions, so cached
+    responses read from the other tables stay valid, and the match table re-reads just the
+    jobs and students that were rescored"""
+    mt.get_match_table()  # Listening for rescores before the first sync
+    storage.get_repository().sync()
+
+
+async def _sync_loop():
+    while True:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _sync)
+        except Exception:  # A failed check is retried on the next tick rather than stopping syncing
+            logger.exception("API sync failed")
+        await asyncio.sleep(SYNC_SECONDS)
+
+
+def _start_sync():
+    global _sync_task
+    if _sync_task is None or _sync_task.done():
+        _sync_task = asyncio.get_running_loop().create_task(_sync_loop())
+
+
+def _int_param(params: Dict[str, str], name: str, default: int, low: int, high: int) -> int:
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    return min(max(value, low), high)
+
+
+def _float_param(params: Dict[str, str], name: str, default: Optional[float]) -> Optional[float]:
+    if name not in params:
+        return default
+    try:
+        return float(params[name])
+    except ValueError:
+        raise ApiError(400, f"{name} must be a number")
+
+
+def _page_args(params: Dict[str, str]) -> Tuple[int, float, Optional[Tuple[float, str]]]:
+    """(k, min_score, cursor) from query parameters"""
+    k = _int_param(params, 'k', mr.PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    min_score = _float_param(params, 'min_score', 0.0)
+    after_score = _float_param(params, 'after_score', None)
+    cursor = None
+    if after_score is not None or 'after_id' in params:
+        if after_score is None or 'after_id' not in params:
+            raise ApiError(400, "after_score and after_id must be given together")
+        cursor = (after_score, params['after_id'])
+    return k, min_score, cursor
+
+
+def _page_payload(page: Dict, fields: List[str]) -> Dict:
+    cursor = page['next_cursor']
+    return {
+        'matches': [{field: match.get(field) for field in fields} for match in page['matches']],
+        'total': page['total'],
+        'next_cursor': {'after_score': cursor[0], 'after_id': cursor[1]} if cursor else None,
+    }
+
+
+def student_matches(student_id: str, k: int, min_score: float, cursor: Optional[Tuple[float, str]]) -> Dict:
+    if storage.get_repository().get('students', student_id) is None:
+        raise ApiError(404, f"Unknown student {student_id}")
+    jobs_df = data_layer.get_shared_data().frame('jobs')
+    page = mr.top_k_jobs(student_id, k, min_score, cursor, jobs_df=jobs_df)
+    return {'student_id': student_id, **_page_payload(page, JOB_FIELDS)}
+
+
+def job_matches(job_id: str, k: int, min_score: float, cursor: Optional[Tuple[float, str]]) -> Dict:
+    if storage.get_repository().get('jobs', job_id) is None:
+        raise ApiError(404, f"Unknown job {job_id}")
+    students_df = data_layer.get_shared_data().frame('students')
+    page = mr.top_k_matches(job_id, k, min_score, cursor, students_df=students_df)
+    return {'job_id': job_id, **_page_payload(page, STUDENT_FIELDS)}
+
+
+def _skill_list(value, what: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(skill, str) for skill in value):
+        raise ApiError(400, f"{what} must be a list of strings")
+    return value
+
+
+def _predictions(skills: List[str], limit: Optional[int] = None) -> List[Dict]:
+    ranked = [{'title': title, **prediction} for title, prediction in sx.predict_job_from_skills(skills).items()]
+    return ranked[:limit] if limit is not None else ranked
+
+
+def predict(payload: Dict) -> Dict:
+    """Predictions for one skill list, or the best title for each list of a batch in one matrix product"""
+    if 'batch' in payload:
+        batch = payload['batch']
+        if not isinstance(batch, list):
+            raise ApiError(400, "batch must be a list of skill lists")
+        if len(batch) > MAX_BATCH:
+            raise ApiError(413, f"batch has {len(batch)} skill lists, the limit is {MAX_BATCH}")
+        skill_lists = [_skill_list(skills, f"batch[{i}]") for i, skills in enumerate(batch)]
+        best = sx.JOB_PREDICTOR.predict_many(skill_lists)
+        best = best.astype(object).where(best.notna(), None)
+        return {'predictions': best.rename(columns={'Predicted Role': 'title', 'Score': 'score',
+                                                    'Confidence': 'confidence'}).to_dict('records')}
+    if 'skills' not in payload:
+        raise ApiError(400, "Send {\"skills\": [...]} or {\"batch\": [[...], ...]}")
+    return {'predictions': _predictions(_skill_list(payload['skills'], "skills"))}
+
+
+def _max_resume_bytes() -> int:
+    """Upload limit set by the admin, as for resumes uploaded in the portal"""
+    return int(storage.get_setting('max_resume_size_mb') * rp.MB)
+
+
+def analyze_resume(data: bytes, file_type: str) -> Dict:
+    try:
+        analysis = sx.analyze_resume(data, file_type, max_bytes=_max_resume_bytes())
+    except Exception as e:  # Oversized, corrupt or undecodable files are the client's error
+        raise ApiError(422, f"{type(e).__name__}: {e}")
+    if analysis is None:
+        raise ApiError(422, "No text could be extracted")
+    predictions = [p for p in _predictions(analysis['skills'], RESUME_PREDICTIONS) if p['score'] > 0]
+    return {'skills': analysis['skills'], 'skills_count': len(analysis['skills']), 'predictions': predictions}
+
+
+async def _read_body(receive, limit: int) -> bytes:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > limit:
+            raise ApiError(413, f"Request body is over {limit / rp.MB:.1f} MB")
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def _json_body(receive) -> Dict:
+    try:
+        payload = json.loads(await _read_body(receive, MAX_JSON_BYTES) or b'{}')
+    except ValueError:
+        raise ApiError(400, "Request body is not valid JSON")
+    if not isinstance(payload, dict):
+        raise ApiError(400, "Request body must be a JSON object")
+    return payload
+
+
+async def _handle_student(receive, params: Dict[str, str], headers: Dict[str, str], student_id: str) -> bytes:
+    args = _page_args(params)
+    return await _cached(f"student|{student_id}|{args}", MATCH_TABLES, student_matches, student_id, *args)
+
+
+async def _handle_job(receive, params: Dict[str, str], headers: Dict[str, str], job_id: str) -> bytes:
+    args = _page_args(params)
+    return await _cached(f"job|{job_id}|{args}", MATCH_TABLES, job_matches, job_id, *args)
+
+
+async def _handle_predict(receive, params: Dict[str, str], headers: Dict[str, str]) -> bytes:
+    payload = await _json_body(receive)
+    key = f"predict|{hashlib.sha256(encode(payload)).hexdigest()}"
+    return await _cached(key, (), predict, payload)  # Depends only on the job categories
+
+
+async def _handle_resume(receive, params: Dict[str, str], headers: Dict[str, str]) -> bytes:
+    content_type = headers.get('content-type', '').split(';')[0].strip()
+    file_type = RESUME_TYPES.get(params.get('type', content_type))
+    if file_type is None:
+        raise ApiError(415, "Send a PDF, DOCX or TXT resume (Content-Type or ?type=pdf|docx|txt)")
+    data = await _read_body(receive, _max_resume_bytes())
+    if not data:
+        raise ApiError(400, "Request body is empty")
+    # Analyses are cached by content in the resume cache; this only shares uploads in flight
+    key = f"resume|{hashlib.sha256(data).hexdigest()}|{file_type}"
+    return await _shared_run(key, lambda: encode(analyze_resume(data, file_type)))
+
+
+ROUTES = [
+    ('GET', re.compile(r'^/match/student/(?P<entity_id>[^/]+)/?$'), _handle_student),
+    ('GET', re.compile(r'^/match/job/(?P<entity_id>[^/]+)/?$'), _handle_job),
+    ('POST', re.compile(r'^/predict/?$'), _handle_predict),
+    ('POST', re.compile(r'^/resume/analyze/?$'), _handle_resume),
+]
+
+
+async def _respond(send, status: int, body: bytes):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            _start_sync()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _sync_task is not None:
+                _sync_task.cancel()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+    _start_sync()  # Servers without lifespan support start syncing on the first request
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+    try:
+        if API_TOKEN is not None and headers.get('authorization') != f"Bearer {API_TOKEN}":
+            raise ApiError(401, "Missing or invalid API token")
+        path = scope['path']
+        for method, pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if scope['method'] != method:
+                raise ApiError(405, f"Use {method} for {path}")
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            params = {name: values[-1] for name, values in query.items()}
+            body = await handler(receive, params, headers, *match.groups())
+            await _respond(send, 200, body)
+            return
+        raise ApiError(404, f"No route for {path}")
+    except ApiError as e:
+        await _respond(send, e.status, encode({'error': str(e)}))
+    except Exception as e:  # Any other failure is answered as a 500 instead of dropping the connection
+        await _respond(send, 500, encode({'error': f"{type(e).__name__}: {e}"}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the matching API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    if uvicorn is None:
+        raise SystemExit("uvicorn is not installed; `pip install uvicorn` or serve api:app with another ASGI server")
+    uvicorn.run(app, host=args.host, port=args.port)
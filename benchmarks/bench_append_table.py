@@ -0,0 +1,80 @@
+"""
+Append Benchmark for the Smart Job Portal
+Compares inserting signup-sized rows one at a time with pd.concat against
+AppendableTable, then times consolidating the appended rows into a DataFrame view.
+
+Run from the repository root: python benchmarks/bench_append_table.py [rows]
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from columnar_table import AppendableTable  # noqa: E402
+from storage import SCHEMA  # noqa: E402
+
+COLUMNS = list(SCHEMA['students'])
+CONCAT_ROWS = 5000  # pd.concat per insert is quadratic, so it is only timed on a small burst
+
+
+def make_row(i: int) -> dict:
+    return {
+        'StudentID': f"STU{1001 + i}", 'Name': f"Student {i}", 'Email': f"s{i}@example.com", 'College': 'Demo College',
+        'Degree': 'Computer Science', 'Year': '3rd Year', 'CGPA': 8.0, 'Resume Score': 80, 'Test Score': 75,
+        'Skills': ['Python', 'SQL'], 'Skills_Count': 2, 'Test_Completed': False, 'Resume_Uploaded': False,
+        'Status': 'Active', 'Registration_Date': datetime.now(), 'Applications_Count': 0,
+    }
+
+
+def bench_concat(rows: int):
+    df = pd.DataFrame(columns=COLUMNS)
+    step = rows // 5
+    start = lap = time.perf_counter()
+    for i in range(rows):
+        df = pd.concat([df, pd.DataFrame([make_row(i)])], ignore_index=True)
+        if (i + 1) % step == 0:
+            now = time.perf_counter()
+            print(f"  pd.concat       rows {i + 1 - step:>7}-{i + 1:<7} {(now - lap) / step * 1e6:9.1f} us/insert")
+            lap = now
+    print(f"  pd.concat       total {time.perf_counter() - start:.2f} s for {rows} rows")
+
+
+def bench_appendable(rows: int):
+    table = AppendableTable(COLUMNS)
+    step = rows // 10
+    start = lap = time.perf_counter()
+    for i in range(rows):
+        table.append(make_row(i))
+        if (i + 1) % step == 0:
+            now = time.perf_counter()
+            print(f"  AppendableTable rows {i + 1 - step:>7}-{i + 1:<7} {(now - lap) / step * 1e6:9.1f} us/insert")
+            lap = now
+    print(f"  AppendableTable total {time.perf_counter() - start:.2f} s for {rows} rows")
+
+    started = time.perf_counter()
+    view = table.to_frame()
+    print(f"  first view of {len(view)} rows built in {(time.perf_counter() - started) * 1e3:.1f} ms")
+    table.append(make_row(rows))
+    started = time.perf_counter()
+    table.to_frame()
+    print(f"  view after one more append built in {(time.perf_counter() - started) * 1e3:.1f} ms")
+    started = time.perf_counter()
+    table.to_frame()
+    print(f"  unchanged view returned in {(time.perf_counter() - started) * 1e3:.3f} ms")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"One insert at a time, {CONCAT_ROWS} rows:")
+    bench_concat(CONCAT_ROWS)
+    print(f"One insert at a time, {rows} rows:")
+    bench_appendable(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Append-Optimized Table for the Smart Job Portal
+Rows are appended to chunked per-column buffers in constant time and consolidated
+into a DataFrame only when a view is requested, so a burst of signups, job posts or
+shortlists never copies the whole table once per insert.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+CHUNK_ROWS = 4096
+
+
+class AppendableTable:
+    """Chunked column buffers behind a lazily consolidated DataFrame view"""
+
+    def __init__(self, columns: Iterable[str], frame: Optional[pd.DataFrame] = None, chunk_rows: int = CHUNK_ROWS):
+        self.columns = list(columns)
+        self.chunk_rows = chunk_rows
+        self._frame = pd.DataFrame(columns=self.columns) if frame is None else frame[self.columns].reset_index(drop=True)
+        self._sealed: List[Dict[str, list]] = []  # Full chunks not yet consolidated
+        self._open = self._new_chunk()
+        self._open_rows = 0
+        self._lock = threading.Lock()
+
+    def _new_chunk(self) -> Dict[str, list]:
+        return {column: [] for column in self.columns}
+
+    @property
+    def pending_rows(self) -> int:
+        """Rows appended since the last consolidation"""
+        return len(self._sealed) * self.chunk_rows + self._open_rows
+
+    def __len__(self) -> int:
+        return len(self._frame) + self.pending_rows
+
+    def append(self, row: Dict):
+        """Append one row; columns missing from row are stored as None"""
+        with self._lock:
+            self._append_locked(row)
+
+    def extend(self, rows: Iterable[Dict]):
+        """Append several rows under one lock acquisition"""
+        with self._lock:
+            for row in rows:
+                self._append_locked(row)
+
+    def _append_locked(self, row: Dict):
+        for column in self.columns:
+            self._open[column].append(row.get(column))
+        self._open_rows += 1
+        if self._open_rows == self.chunk_rows:
+            self._sealed.append(self._open)
+            self._open = self._new_chunk()
+            self._open_rows = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame view of every row, consolidating pending chunks first.
+
+        The view shares memory with the table; callers may add or replace columns
+        but must not write into its cells in place.
+        """
+        with self._lock:
+            if self.pending_rows:
+                chunks = self._sealed + ([self._open] if self._open_rows else [])
+                pieces = [pd.DataFrame(chunk, columns=self.columns) for chunk in chunks]
+                if len(self._frame):
+                    pieces = [self._match_dtypes(piece) for piece in pieces]
+                    pieces.insert(0, self._frame)
+                self._frame = (pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0]).infer_objects()
+                self._sealed = []
+                self._open = self._new_chunk()
+                self._open_rows = 0
+            return self._frame.copy(deep=False)
+
+    def _match_dtypes(self, piece: pd.DataFrame) -> pd.DataFrame:
+        """Cast a new chunk to the consolidated dtypes so missing values do not turn columns into objects"""
+        for column in self.columns:
+            dtype = self._frame[column].dtype
+            if piece[column].dtype == dtype or dtype == object:
+                continue
+            try:
+                piece[column] = piece[column].astype(dtype)
+            except (TypeError, ValueError):
+                if pd.api.types.is_integer_dtype(dtype):
+                    try:
+                        piece[column] = piece[column].astype('float64')  # Integers with gaps, as pandas reads them
+                    except (TypeError, ValueError):
+                        pass
+        return piece
@@ -1,72 +1,15 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from collections import Counter
-
-# Job categories for skill selection (shared with student module)
-JOB_CATEGORIES = {
-    "Backend Developer": {
-        "description": "Develops server-side applications, APIs, databases, and system architecture",
-        "keywords": ["python", "java", "nodejs", "django", "flask", "spring", "api", "database", "mongodb", "postgresql", "mysql", "redis", "microservices", "docker", "rest", "graphql"],
-        "skills_weight": 1.0
-    },
-    "Frontend Developer": {
-        "description": "Creates user interfaces and client-side applications",
-        "keywords": ["react", "angular", "vue", "javascript", "typescript", "html", "css", "sass", "webpack", "bootstrap", "tailwind", "jquery", "nextjs", "nuxtjs", "responsive"],
-        "skills_weight": 1.0
-    },
-    "Full Stack Developer": {
-        "description": "Works on both frontend and backend development",
-        "keywords": ["react", "nodejs", "python", "javascript", "api", "database", "html", "css", "mongodb", "postgresql", "fullstack", "end-to-end"],
-        "skills_weight": 1.2
-    },
-    "Data Scientist": {
-        "description": "Analyzes data to extract insights and build predictive models",
-        "keywords": ["python", "r", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "matplotlib", "seaborn", "jupyter", "machine learning", "statistics", "data analysis", "visualization"],
-        "skills_weight": 1.0
-    },
-    "Machine Learning Engineer": {
-        "description": "Builds and deploys machine learning models and systems",
-        "keywords": ["python", "tensorflow", "pytorch", "scikit-learn", "mlops", "docker", "kubernetes", "aws", "machine learning", "deep learning", "neural networks", "model deployment"],
-        "skills_weight": 1.0
-    },
-    "DevOps Engineer": {
-        "description": "Manages infrastructure, deployment pipelines, and system operations",
-        "keywords": ["docker", "kubernetes", "aws", "azure", "gcp", "terraform", "ansible", "jenkins", "gitlab", "ci/cd", "linux", "bash", "monitoring", "infrastructure"],
-        "skills_weight": 1.0
-    },
-    "Mobile Developer": {
-        "description": "Develops applications for mobile platforms",
-        "keywords": ["react native", "flutter", "swift", "kotlin", "android", "ios", "xamarin", "mobile", "app development"],
-        "skills_weight": 1.0
-    },
-    "Data Engineer": {
-        "description": "Builds data pipelines and manages data infrastructure",
-        "keywords": ["python", "sql", "spark", "hadoop", "kafka", "airflow", "etl", "data pipeline", "big data", "aws", "snowflake", "databricks"],
-        "skills_weight": 1.0
-    },
-    "UI/UX Designer": {
-        "description": "Designs user interfaces and user experiences",
-        "keywords": ["figma", "sketch", "adobe xd", "photoshop", "illustrator", "wireframing", "prototyping", "user research", "design thinking", "usability"],
-        "skills_weight": 1.0
-    },
-    "QA Engineer": {
-        "description": "Tests software applications and ensures quality",
-        "keywords": ["selenium", "cypress", "jest", "junit", "testing", "automation", "manual testing", "api testing", "performance testing", "quality assurance"],
-        "skills_weight": 1.0
-    }
-}
-
-def calculate_match(student_skills, required_skills, student_resume, min_resume, student_test, min_test):
-    """Calculate match score between student and job requirements"""
-    if student_resume < min_resume or student_test < min_test:
-        return 0
-    common_skills = set(student_skills) & set(required_skills)
-    skill_match_score = len(common_skills) / len(required_skills) if len(required_skills) > 0 else 0
-    resume_score_ratio = (student_resume - min_resume) / (100 - min_resume) if (100 - min_resume) > 0 else 0
-    test_score_ratio = (student_test - min_test) / (100 - min_test) if (100 - min_test) > 0 else 0
-    final_score = (0.6 * skill_match_score) + (0.2 * resume_score_ratio) + (0.2 * test_score_ratio)
-    return round(final_score * 100, 2)
+from datetime import datetime
+import skill_index as sidx
+from matching import JOB_CATEGORIES, skill_key
+import match_ranking as mr
+import match_table as mt
+import skill_table
+import storage
+import task_queue as tq
+import task_status as ts
 
 def display_company_dashboard():
     """Main company dashboard function"""
@@ -134,49 +77,14 @@ def display_company_dashboard():
     st.header("🏢 Company Portal")
     
     # Initialize session state
-    if 'students' not in st.session_state:
-        st.session_state.students = pd.DataFrame({
-            'StudentID': ['STU1001', 'STU1002', 'STU1003', 'STU1004', 'STU1005'],
-            'Name': ['Liam Smith', 'Olivia Johnson', 'Noah Williams', 'Emma Brown', 'Oliver Jones'],
-            'Degree': ['Computer Science', 'Data Science', 'Computer Science', 'Mechanical Engg.', 'Data Science'],
-            'Resume Score': [88, 92, 85, 78, 95],
-            'Test Score': [90, 95, 82, 75, 98],
-            'Skills': [
-                ['Python', 'Java', 'SQL', 'Git'],
-                ['Python', 'R', 'TensorFlow', 'SQL', 'Tableau'],
-                ['Python', 'JavaScript', 'React', 'Node.js'],
-                ['AutoCAD', 'SolidWorks', 'MATLAB'],
-                ['Python', 'PyTorch', 'Scikit-learn', 'AWS']
-            ]
-        })
-    if 'jobs' not in st.session_state:
-        st.session_state.jobs = pd.DataFrame({
-            'JobID': ['JOB501', 'JOB502', 'JOB503', 'JOB504'],
-            'Company': ['Innovatech', 'DataSolutions', 'FutureSoft', 'Innovatech'],
-            'Role': ['Software Engineer', 'Data Scientist', 'Frontend Developer', 'AI/ML Engineer'],
-            'Min Resume Score': [80, 85, 80, 90],
-            'Min Test Score': [85, 90, 75, 90],
-            'Required Skills': [
-                ['Python', 'Java', 'SQL', 'Algorithms'],
-                ['Python', 'TensorFlow', 'SQL', 'Statistics'],
-                ['JavaScript', 'React', 'HTML', 'CSS'],
-                ['Python', 'PyTorch', 'AWS', 'NLP']
-            ]
-        })
-    if 'companies' not in st.session_state:
-        st.session_state.companies = pd.DataFrame({
-            'CompanyID': ['COMP001'],
-            'Name': ['Innovatech']
-        })
-    if 'company_credentials' not in st.session_state:
-        st.session_state.company_credentials = {'COMP001': 'comp@123'}
     if 'logged_in' not in st.session_state:
         st.session_state.logged_in = False
     if 'student_matches' not in st.session_state:
         st.session_state.student_matches = {}
     
-    students_df = st.session_state.students
-    jobs_df = st.session_state.jobs
+    repo = storage.get_repository()
+    students_df = repo.frame('students')
+    jobs_df = repo.frame('jobs')
     
     if not st.session_state.logged_in:
         col1, col2 = st.columns(2)
@@ -187,7 +95,7 @@ def display_company_dashboard():
                 company_id = st.text_input("Enter Company ID (e.g., COMP001)")
                 company_password = st.text_input("Password", type="password")
                 if st.form_submit_button("Login"):
-                    if company_id in st.session_state.company_credentials and company_password == st.session_state.company_credentials[company_id]:
+                    if repo.verify_credential('company', company_id, company_password):
                         st.session_state.logged_in = True
                         st.session_state.user_id = company_id
                         st.rerun()
@@ -202,18 +110,23 @@ def display_company_dashboard():
                 new_password = st.text_input("Password", type="password")
                 if st.form_submit_button("Signup"):
                     if new_company_name and new_email and new_password:
-                        new_id = f"COMP{len(st.session_state.companies) + 1:03d}"
                         new_company = {
-                            'CompanyID': new_id,
-                            'Name': new_company_name
+                            'Name': new_company_name,
+                            'Jobs_Posted': 0,
+                            'Total_Applications': 0,
+                            'Approval_Status': 'Pending',
+                            'Registration_Date': datetime.now()
                         }
-                        st.session_state.companies = pd.concat([st.session_state.companies, pd.DataFrame([new_company])], ignore_index=True)
-                        st.session_state.company_credentials[new_id] = new_password
+                        new_id = repo.insert_with_id('companies', new_company)
+                        repo.set_credential('company', new_id, new_password)
                         st.success(f"✅ Signup successful! Your Company ID is {new_id}. Please login.")
                     else:
                         st.error("⚠️ Please complete all fields.")
     else:
-        company_data = st.session_state.companies[st.session_state.companies['CompanyID'] == st.session_state.user_id].iloc[0]
+        company_data = repo.get('companies', st.session_state.user_id)
+        if company_data is None:
+            st.error("❌ Company record not found. Please log in again.")
+            return
         company_name = company_data['Name']
         
         # Company dashboard with tabs
@@ -256,7 +169,6 @@ def display_company_dashboard():
                 if st.form_submit_button("Post Job", type="primary"):
                     if job_role and job_description and required_skills:
                         new_job = {
-                            'JobID': f"JOB{len(st.session_state.jobs) + 501}",
                             'Company': company_name,
                             'Role': job_role,
                             'Min Resume Score': min_resume_score,
@@ -267,12 +179,18 @@ def display_company_dashboard():
                             'Salary': salary_range,
                             'Description': job_description,
                             'Openings': int(num_openings),
-                            'Status': "Active"
+                            'Status': "Active",
+                            'Posted_Date': datetime.now(),
+                            'Applications': 0
                         }
-                        st.session_state.jobs = pd.concat([st.session_state.jobs, pd.DataFrame([new_job])], ignore_index=True)
+                        new_job['JobID'] = repo.insert_with_id('jobs', new_job)
+                        sidx.get_skill_index().add_job(new_job['JobID'], new_job['Required Skills'])
+                        # Candidates are scored by a background task; the Candidate Matches tab shows its progress
+                        ts.track_task(f"match_{new_job['JobID']}",
+                                      tq.get_task_queue().submit('refresh_job_matches', {'job_id': new_job['JobID']}))
                         # Update company's Jobs_Posted count
-                        company_index = st.session_state.companies[st.session_state.companies['CompanyID'] == st.session_state.user_id].index[0]
-                        st.session_state.companies.loc[company_index, 'Jobs_Posted'] += 1
+                        repo.increment('companies', st.session_state.user_id, 'Jobs_Posted')
+                        jobs_df = repo.frame('jobs')
                         st.success(f"✅ Job '{job_role}' posted successfully!")
                         st.balloons()
                     else:
@@ -282,23 +200,23 @@ def display_company_dashboard():
             st.markdown("---")
             st.subheader("Your Posted Jobs")
             
-            company_jobs = st.session_state.jobs[st.session_state.jobs['Company'] == company_name]
+            company_jobs = jobs_df[jobs_df['Company'] == company_name]
             
             if not company_jobs.empty:
                 for index, job in company_jobs.iterrows():
-                    with st.expander(f"{job['Role']} - {job.get('Location', 'N/A')} ({job.get('Status', 'Active')})"):
+                    with st.expander(f"{job['Role']} - {job.get('Location') or 'N/A'} ({job.get('Status') or 'Active'})"):
                         col1, col2 = st.columns(2)
                         with col1:
                             st.write(f"**Company:** {job['Company']}")
-                            st.write(f"**Experience:** {job.get('Experience', 'N/A')}")
-                            st.write(f"**Salary:** {job.get('Salary', 'N/A')} LPA")
-                            st.write(f"**Openings:** {job.get('Openings', 'N/A')}")
+                            st.write(f"**Experience:** {job.get('Experience') or 'N/A'}")
+                            st.write(f"**Salary:** {job.get('Salary') or 'N/A'} LPA")
+                            st.write(f"**Openings:** {job.get('Openings') or 'N/A'}")
                         with col2:
                             st.write(f"**Skills:** {', '.join(job['Required Skills'][:5])}")
                             st.write(f"**Min Resume Score:** {job['Min Resume Score']}%")
                             st.write(f"**Min Test Score:** {job['Min Test Score']}%")
                         
-                        st.write(f"**Description:** {job.get('Description', 'N/A')[:200]}...")
+                        st.write(f"**Description:** {(job.get('Description') or 'N/A')[:200]}...")
                         
                         # Job actions
                         col_edit, col_delete = st.columns(2)
@@ -307,7 +225,9 @@ def display_company_dashboard():
                                 st.info("Edit functionality would be implemented here")
                         with col_delete:
                             if st.button("Delete Job", key=f"delete_{index}"):
-                                st.session_state.jobs = st.session_state.jobs.drop(index)
+                                repo.delete('jobs', job['JobID'])
+                                sidx.get_skill_index().remove_job(job['JobID'])
+                                mt.get_match_table().remove_job(job['JobID'])
                                 st.rerun()
             else:
                 st.info("No jobs posted yet. Create your first job posting above!")
@@ -315,29 +235,24 @@ def display_company_dashboard():
         with tab2:
             st.subheader("🎓 Matched Candidates")
             
-            company_jobs = st.session_state.jobs[st.session_state.jobs['Company'] == company_name]
+            company_jobs = jobs_df[jobs_df['Company'] == company_name]
+            match_counts = []  # Reused by the Analytics tab
             
             if not company_jobs.empty:
                 for index, job_data in company_jobs.iterrows():
                     role = job_data['Role']
                     job_id = job_data['JobID']
                     
-                    # Find matching students
-                    matches = []
-                    for s_index, student in students_df.iterrows():
-                        match_score = calculate_match(
-                            student['Skills'], job_data['Required Skills'],
-                            student['Resume Score'], job_data['Min Resume Score'],
-                            student['Test Score'], job_data['Min Test Score']
-                        )
-                        if match_score > 0:
-                            student_info = student.to_dict()
-                            student_info['Match Score'] = match_score
-                            matches.append(student_info)
-                    
-                    sorted_matches = sorted(matches, key=lambda x: x['Match Score'], reverse=True)
+                    # Rank only the current page of candidates instead of sorting every match
+                    page_key = f"candidates_{job_id}"
+                    page = mr.top_k_matches(job_id, cursor=mr.current_cursor(page_key), students_df=students_df)
+                    sorted_matches = page['matches']
+                    match_counts.append(page['total'])
                     
-                    with st.expander(f"**{role}** ({job_id}) - {len(sorted_matches)} matching candidates", expanded=True):
+                    with st.expander(f"**{role}** ({job_id}) - {page['total']} matching candidates", expanded=True):
+                        match_task = ts.tracked_task(f"match_{job_id}")
+                        if match_task is not None:
+                            ts.finished_task(match_task, "Matching candidates")
                         if not sorted_matches:
                             st.info("No suitable student matches found for this role.")
                         else:
@@ -356,8 +271,9 @@ def display_company_dashboard():
                                 with col2:
                                     st.write("**Skills:**")
                                     skills_html = ""
+                                    required = {skill_key(skill) for skill in job_data['Required Skills']}
                                     for skill in match['Skills']:
-                                        if skill in job_data['Required Skills']:
+                                        if skill_key(skill) in required:
                                             skills_html += f'<span style="background-color: #4CAF50; color: white; padding: 2px 6px; margin: 1px; border-radius: 8px; font-size: 11px;">{skill}</span> '
                                         else:
                                             skills_html += f'<span style="background-color: #e0e0e0; color: #333; padding: 2px 6px; margin: 1px; border-radius: 8px; font-size: 11px;">{skill}</span> '
@@ -381,13 +297,15 @@ def display_company_dashboard():
                                     
                                     if st.button("View Profile", key=f"profile_{job_id}_{match['StudentID']}", use_container_width=True):
                                         st.info(f"Profile details for {match['Name']} would be shown here")
+                            
+                            mr.pagination_controls(page_key, page)
             else:
                 st.info("No jobs posted yet. Post a job to see matched candidates!")
         
         with tab3:
             st.subheader("📊 Company Analytics")
             
-            company_jobs = st.session_state.jobs[st.session_state.jobs['Company'] == company_name]
+            company_jobs = jobs_df[jobs_df['Company'] == company_name]
             
             col1, col2, col3, col4 = st.columns(4)
             
@@ -397,16 +315,7 @@ def display_company_dashboard():
             
             with col2:
                 # Count matches from existing jobs
-                total_matches = 0
-                for _, job_data in company_jobs.iterrows():
-                    for _, student in students_df.iterrows():
-                        match_score = calculate_match(
-                            student['Skills'], job_data['Required Skills'],
-                            student['Resume Score'], job_data['Min Resume Score'],
-                            student['Test Score'], job_data['Min Test Score']
-                        )
-                        if match_score > 0:
-                            total_matches += 1
+                total_matches = sum(match_counts)
                 st.metric("Total Matches", total_matches)
             
             with col3:
@@ -422,13 +331,10 @@ def display_company_dashboard():
             if not company_jobs.empty:
                 st.subheader("Skills in Demand")
                 
-                all_required_skills = []
-                for _, job in company_jobs.iterrows():
-                    all_required_skills.extend(job['Required Skills'])
+                skill_counts = skill_table.get_skill_table().demand(company=company_name)
                 
-                if all_required_skills:
-                    skill_counts = Counter(all_required_skills)
-                    skills_df = pd.DataFrame(list(skill_counts.items()), columns=['Skill', 'Frequency'])
+                if not skill_counts.empty:
+                    skills_df = skill_counts.rename('Frequency').rename_axis('Skill').reset_index()
                     st.bar_chart(skills_df.set_index('Skill'))
             
             # Application trends (mock data)
@@ -0,0 +1,194 @@
+"""
+Streaming Exports for the Smart Job Portal
+Admin downloads written batch by batch to a temporary file instead of being built as one
+string in memory: rows are read from the repository in fixed-size batches and appended
+as CSV, gzip-compressed CSV or Parquet row groups, so memory stays bounded by the batch
+size whatever the export covers. Parquet is offered when pyarrow is installed. Run
+`python data_export.py students --format csv.gz` to export a table from the command line.
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+import analytics
+import partitioned_store
+import skill_table
+import storage
+import task_queue as tq
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, Parquet exports are then unavailable
+    pa = pq = None
+
+EXPORT_DIR = Path(tempfile.gettempdir()) / "job_portal_exports"
+BATCH_ROWS = 10_000
+MAX_AGE_SECONDS = 3600  # Export files older than this are removed before each new export
+# Format -> (file suffix, MIME type)
+FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'csv.gz': ('.csv.gz', 'application/gzip'),
+}
+if pq is not None:
+    FORMATS['parquet'] = ('.parquet', 'application/vnd.apache.parquet')
+SHORTLIST_COLUMNS = ['Name', 'Email', 'Skills', 'Resume Score', 'Test Score']
+
+
+def _remove_old_exports():
+    now = time.time()
+    for path in EXPORT_DIR.glob('*'):
+        try:
+            if now - path.stat().st_mtime > MAX_AGE_SECONDS:
+                path.unlink()
+        except OSError:
+            pass  # Removed by another session, or still being downloaded on Windows
+
+
+def _arrow_schema(df: pd.DataFrame) -> "pa.Schema":
+    """Column types fixed from the first batch, so later batches with missing values still match"""
+    fields = []
+    for column, dtype in df.dtypes.items():
+        if column in storage.LIST_COLUMNS:
+            arrow_type = pa.list_(pa.string())
+        elif column in storage.DATE_COLUMNS or pd.api.types.is_datetime64_any_dtype(dtype):
+            arrow_type = pa.timestamp('ns')
+        elif pd.api.types.is_bool_dtype(dtype):
+            arrow_type = pa.bool_()
+        elif pd.api.types.is_numeric_dtype(dtype):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(str(column), arrow_type))
+    return pa.schema(fields)
+
+
+def _to_arrow(df: pd.DataFrame, schema: "pa.Schema") -> "pa.Table":
+    df = df.copy(deep=False)
+    for field in schema:
+        if field.type == pa.string():
+            df[field.name] = [None if pd.isna(v) else str(v) for v in df[field.name]]
+        elif field.type == pa.list_(pa.string()):
+            df[field.name] = [[str(x) for x in v] if isinstance(v, list) else None for v in df[field.name]]
+        elif field.type == pa.float64():
+            df[field.name] = pd.to_numeric(df[field.name], errors='coerce').astype(float)
+        elif field.type == pa.timestamp('ns'):
+            df[field.name] = pd.to_datetime(df[field.name], errors='coerce')
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+@contextmanager
+def _writer(path: Path, fmt: str):
+    """Callable appending one batch to the export file"""
+    if fmt == 'parquet':
+        state = {'writer': None}
+
+        def write(df: pd.DataFrame):
+            if state['writer'] is None:
+                state['schema'] = _arrow_schema(df)
+                state['writer'] = pq.ParquetWriter(str(path), state['schema'])
+            state['writer'].write_table(_to_arrow(df, state['schema']))
+
+        try:
+            yield write
+        finally:
+            if state['writer'] is not None:
+                state['writer'].close()
+        return
+    opener = gzip.open if fmt == 'csv.gz' else open
+    with opener(path, 'wt', encoding='utf-8', newline='') as handle:
+        state = {'header': True}
+
+        def write(df: pd.DataFrame):
+            df.to_csv(handle, index=False, header=state['header'])
+            state['header'] = False
+
+        yield write
+
+
+def export_batches(batches: Iterable[pd.DataFrame], fmt: str = 'csv', name: str = 'export',
+                   columns: Optional[List[str]] = None) -> Path:
+    """Write batches to a new temporary file in the given format and return its path"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    _remove_old_exports()
+    handle, tmp_name = tempfile.mkstemp(prefix=f"{name}-", suffix=FORMATS[fmt][0], dir=EXPORT_DIR)
+    os.close(handle)
+    path = Path(tmp_name)
+    written = False
+    try:
+        with _writer(path, fmt) as write:
+            for df in batches:
+                if columns is not None:
+                    df = df.reindex(columns=columns)
+                if df.empty:
+                    continue  # An empty first batch would leave Parquet column types unknown
+                write(df)
+                written = True
+            if not written:
+                write(pd.DataFrame(columns=columns or []))
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def table_batches(table: str, where: Optional[Dict] = None, columns: Optional[List[str]] = None,
+                  batch_rows: int = BATCH_ROWS, repo: Optional[storage.Repository] = None) -> Iterator[pd.DataFrame]:
+    """Rows of a table matching where, batch by batch"""
+    repo = repo or storage.get_repository()
+    for df in repo.batches(table, where, batch_rows):
+        yield df if columns is None else df[columns]
+
+
+def shortlisted_batches(job_id: str, batch_rows: int = BATCH_ROWS,
+                        repo: Optional[storage.Repository] = None) -> Iterator[pd.DataFrame]:
+    """Student details of a job's shortlisted candidates, looking up each batch's students by ID"""
+    repo = repo or storage.get_repository()
+    for shortlisted in repo.batches('shortlists', {'JobID': job_id, 'Status': 'Shortlisted'}, batch_rows):
+        students = repo.page('students', {'StudentID': shortlisted['StudentID'].tolist()})
+        yield shortlisted[['StudentID']].merge(students, on='StudentID')[SHORTLIST_COLUMNS]
+
+
+def report_batches(start: Optional[date] = None) -> Iterator[pd.DataFrame]:
+    """Analytics report in long form (Section, Key, Value), one section per batch"""
+    rollups = analytics.get_rollups()
+    archive = partitioned_store.get_archive()
+    skills = skill_table.get_skill_table()
+
+    def section(name: str, values: Dict) -> pd.DataFrame:
+        return pd.DataFrame({'Section': name, 'Key': [str(k) for k in values], 'Value': list(values.values())})
+
+    yield section('Overview', rollups.overview())
+    for table, label in (('students', 'Registrations'), ('jobs', 'Job Postings'), ('applications', 'Applications')):
+        yield section(f"{label} per Day", archive.daily_counts(table, start).to_dict())
+    for dimension in ('Company', 'Role', 'Location'):
+        yield section(f"Applications by {dimension}", rollups.applications_by(dimension, start).to_dict())
+    yield section('Skill Demand', skills.demand(start).to_dict())
+    gap = skills.gap(start)
+    yield section('Skill Gap', dict(zip(gap['Skill'], gap['Gap'])))
+
+
+@tq.task('analytics_report', cache_seconds=60)
+def _report_task(start: Optional[str] = None, fmt: str = 'csv') -> Dict:
+    """Report file for the window starting at an ISO date; identical requests within a minute share it"""
+    start_day = date.fromisoformat(start) if start else None
+    return {'path': str(export_batches(report_batches(start_day), fmt, name='analytics_report')), 'format': fmt}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a portal table to a file")
+    parser.add_argument('table', choices=sorted(storage.SCHEMA))
+    parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+    args = parser.parse_args()
+    print(export_batches(table_batches(args.table), args.format, name=args.table))
@@ -0,0 +1,128 @@
+"""
+Paginated Data Grid for the Smart Job Portal
+Server-side paging for the admin Manage tabs: equality filters and the sort order are
+pushed down to the repository's indexed columns, only the visible page is read and sent
+to the browser, filter options come from cached distinct-value lists, and saving writes
+only the rows the admin actually changed, added or deleted.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import analytics
+import data_layer
+import storage
+
+GRID_PAGE_SIZE = 50
+ALL = "All"
+# Stored counters shown from the applications table instead, as on the dashboards
+COUNT_COLUMNS = {'students': 'Applications_Count', 'jobs': 'Applications', 'companies': 'Total_Applications'}
+COUNT_KEYS = {'students': 'StudentID', 'jobs': 'JobID', 'companies': 'Name'}
+
+
+def filter_select(table: str, column: str, label: str, key: Optional[str] = None) -> Optional[str]:
+    """Selectbox over a column's distinct values; returns None for "All" """
+    options = data_layer.get_shared_data().distinct(table, column)
+    choice = st.selectbox(label, [ALL] + options, key=key)
+    return None if choice == ALL else choice
+
+
+def sort_select(table: str, label: str = "Sort by", key: Optional[str] = None) -> Tuple[Optional[str], bool]:
+    """Sort column (an indexed one, so the database can order without a scan) and direction"""
+    col_sort, col_direction = st.columns([3, 1])
+    with col_sort:
+        column = st.selectbox(label, ["Default"] + storage.INDEXES.get(table, []), key=key)
+    with col_direction:
+        descending = st.checkbox("Descending", key=None if key is None else f"{key}_desc")
+    return (None if column == "Default" else column), descending
+
+
+def _current_page(key: str, signature: tuple) -> int:
+    """Page shown for a grid; back to the first page whenever its filters or sort change"""
+    pages = st.session_state.setdefault('grid_pages', {})
+    if key not in pages or pages[key][0] != signature:
+        pages[key] = (signature, 0)
+    return pages[key][1]
+
+
+def _set_page(key: str, page: int):
+    signature, _ = st.session_state['grid_pages'][key]
+    st.session_state['grid_pages'][key] = (signature, page)
+
+
+def load_page(table: str, key: str, filters: Dict[str, Optional[str]], order_by: Optional[str] = None,
+              descending: bool = False, page_size: int = GRID_PAGE_SIZE) -> Tuple[pd.DataFrame, int, int]:
+    """Visible page of a table under the filters (None values are ignored).
+
+    Returns (normalized page rows, rows matching the filters, page number).
+    """
+    repo = storage.get_repository()
+    where = {column: value for column, value in filters.items() if value is not None}
+    total = repo.count(table, where)
+    page = _current_page(key, (tuple(sorted(where.items())), order_by, descending))
+    page = min(page, max(math.ceil(total / page_size) - 1, 0))
+    df = repo.page(table, where, order_by, descending, offset=page * page_size, limit=page_size)
+    df = data_layer.normalize_frame(table, df)
+    if table in COUNT_COLUMNS and not df.empty:
+        counts = analytics.get_rollups().application_counts(table, df[COUNT_KEYS[table]])
+        df[COUNT_COLUMNS[table]] = counts
+    return df, total, page
+
+
+def page_controls(key: str, total: int, page: int, page_size: int = GRID_PAGE_SIZE):
+    """Previous/Next buttons and a row-range caption for a grid"""
+    pages = max(math.ceil(total / page_size), 1)
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if page > 0 and st.button("⬅️ Previous", key=f"grid_prev_{key}"):
+            _set_page(key, page - 1)
+            st.rerun()
+    with col_info:
+        first = page * page_size + 1 if total else 0
+        st.caption(f"Rows {first}-{min((page + 1) * page_size, total)} of {total} · Page {page + 1} of {pages}")
+    with col_next:
+        if page + 1 < pages and st.button("Next ➡️", key=f"grid_next_{key}"):
+            _set_page(key, page + 1)
+            st.rerun()
+
+
+def editor_key(key: str, filters: Dict, page: int, order_by: Optional[str] = None, descending: bool = False) -> str:
+    """Widget key of the page's data editor, so pending edits (kept by row position) do not carry
+    over to another page or sort order"""
+    return f"grid_editor_{key}_{page}_{abs(hash((tuple(sorted(filters.items())), order_by, descending)))}"
+
+
+def _same(a, b) -> bool:
+    a_list, b_list = isinstance(a, (list, tuple, np.ndarray)), isinstance(b, (list, tuple, np.ndarray))
+    if a_list or b_list:
+        return a_list and b_list and list(a) == list(b)
+    if pd.isna(a) and pd.isna(b):
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+def changed_rows(table: str, original: pd.DataFrame, edited: pd.DataFrame) -> List[Dict]:
+    """Rows of edited that are new or differ from original in any column, matched by primary key"""
+    key = storage.KEY_COLUMNS[table][0]
+    before = {row[key]: row for row in original.to_dict('records')}
+    changed = []
+    for row in edited.to_dict('records'):
+        if row.get(key) in (None, '') or (isinstance(row.get(key), float) and pd.isna(row[key])):
+            continue
+        previous = before.get(row[key])
+        if previous is None or any(not _same(row.get(c), previous.get(c)) for c in row):
+            changed.append(row)
+    return changed
+
+
+def deleted_keys(table: str, original: pd.DataFrame, edited: pd.DataFrame) -> List:
+    """Primary keys of original rows missing from edited, i.e. rows deleted in the editor"""
+    key = storage.KEY_COLUMNS[table][0]
+    return sorted(set(original[key]) - set(edited[key]))
@@ -0,0 +1,120 @@
+"""
+Shared Data Layer for the Smart Job Portal
+One normalized copy of the platform tables, plus artifacts derived from them, shared by
+every session in the process. Each entry remembers the repository write versions of the
+tables it was built from and is rebuilt on the first read after any of them changes.
+"""
+
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+import storage
+
+# Column types the dashboards rely on
+INT_COLUMNS = {
+    'jobs': ['Openings', 'Applications', 'Min Resume Score', 'Min Test Score'],
+    'students': ['Resume Score', 'Test Score', 'Skills_Count', 'Applications_Count'],
+    'companies': ['Jobs_Posted', 'Total_Applications'],
+}
+FLOAT_COLUMNS = {'students': ['CGPA']}
+STRING_COLUMNS = {
+    'jobs': ['JobID', 'Company', 'Role', 'Location', 'Salary', 'Experience', 'Description', 'Status'],
+    'students': ['StudentID', 'Name', 'Email', 'College', 'Degree', 'Year', 'Status'],
+    'companies': ['Name', 'Industry', 'Company_Size', 'Approval_Status'],
+}
+LIST_COLUMNS = {'jobs': ['Required Skills'], 'students': ['Skills']}
+BOOL_COLUMNS = {'students': ['Test_Completed', 'Resume_Uploaded']}
+# Missing dates are shown as the time the frame was normalized
+FILLED_DATE_COLUMNS = {'jobs': ['Posted_Date'], 'students': ['Registration_Date'], 'companies': ['Registration_Date']}
+PLATFORM_TABLES = ('students', 'companies', 'jobs', 'applications', 'shortlists')
+
+
+def normalize_frame(table: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a table to the dtypes used by the dashboards (numbers, strings, lists, bools, dates)"""
+    df = df.copy(deep=False)
+    for col in INT_COLUMNS.get(table, []):
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+    for col in FLOAT_COLUMNS.get(table, []):
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0).astype(float)
+    for col in STRING_COLUMNS.get(table, []):
+        df[col] = df[col].fillna('').astype(str)
+    for col in LIST_COLUMNS.get(table, []):
+        df[col] = df[col].apply(lambda x: x if isinstance(x, list) else [])
+    for col in BOOL_COLUMNS.get(table, []):
+        df[col] = df[col].astype(bool)
+    now = pd.to_datetime(datetime.now())
+    for col in FILLED_DATE_COLUMNS.get(table, []):
+        df[col] = pd.to_datetime(df[col], errors='coerce').fillna(now)
+    return df
+
+
+def _with_application_counts(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Replace the stored application counters with counts from the applications table"""
+    applications_df = frames['applications']
+    if applications_df.empty:
+        return frames
+    frames = {name: df.copy(deep=False) for name, df in frames.items()}
+    jobs_df, students_df, companies_df = frames['jobs'], frames['students'], frames['companies']
+    app_counts_jobs = applications_df.groupby('JobID').size()
+    jobs_df['Applications'] = jobs_df['JobID'].map(app_counts_jobs).fillna(0).astype(int)
+    app_counts_students = applications_df.groupby('StudentID').size()
+    students_df['Applications_Count'] = students_df['StudentID'].map(app_counts_students).fillna(0).astype(int)
+    company_apps = applications_df.merge(jobs_df[['JobID', 'Company']], on='JobID').groupby('Company').size()
+    companies_df['Total_Applications'] = companies_df['Name'].map(company_apps).fillna(0).astype(int)
+    return frames
+
+
+class SharedData:
+    """Version-checked cache of normalized frames and derived artifacts over a repository"""
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.RLock()
+
+    def derived(self, name: str, tables: Iterable[str], build: Callable):
+        """Cached result of build(), rebuilt whenever one of the tables has been written"""
+        tables = tuple(tables)
+        with self._lock:
+            # Versions are read before building, so a write during the build only costs a rebuild
+            versions = tuple(self.repo.version(table) for table in tables)
+            entry = self._entries.get(name)
+            if entry is None or entry[0] != versions:
+                entry = self._entries[name] = (versions, build())
+            return entry[1]
+
+    def frame(self, table: str) -> pd.DataFrame:
+        """Normalized copy of one table; safe to modify, as pandas copies shared data on write"""
+        df = self.derived(f"frame:{table}", (table,), lambda: normalize_frame(table, self.repo.frame(table)))
+        return df.copy(deep=False)
+
+    def distinct(self, table: str, column: str) -> List[str]:
+        """Sorted distinct non-empty values of a column, as strings, for filter options"""
+        return self.derived(f"distinct:{table}:{column}", (table,),
+                            lambda: [str(v) for v in self.repo.distinct(table, column) if str(v) != ''])
+
+    def platform_frames(self) -> Dict[str, pd.DataFrame]:
+        """All platform tables normalized, with application counters derived from applications"""
+        frames = self.derived('platform_frames', PLATFORM_TABLES,
+                              lambda: _with_application_counts({t: self.frame(t) for t in PLATFORM_TABLES}))
+        return {name: df.copy(deep=False) for name, df in frames.items()}
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+_shared: Optional[SharedData] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_data() -> SharedData:
+    """Process-wide shared data layer over the process-wide repository"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedData(storage.get_repository())
+        return _shared
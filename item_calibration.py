@@ -0,0 +1,235 @@
+"""
+Item Calibration for the Smart Job Portal
+Batch job that folds new skill-test answer logs into per-question statistics: classical
+difficulty (p-value), point-biserial discrimination against the test's ability estimate,
+distractor shares and the mean ability of each option's choosers, plus 2PL IRT parameters
+(discrimination a, difficulty b) used by the adaptive tests to select questions.
+
+Only answer logs after the job's watermark are read. Each item keeps running sums and
+per-ability-bin response counts, which are sufficient statistics for all of the above, so
+a run costs time proportional to the new logs plus the number of items. Run
+`python item_calibration.py` (add --full to recompute from every log).
+"""
+
+import argparse
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import adaptive_test as at
+import data_layer
+import storage
+import task_queue as tq
+
+JOB_NAME = 'item_calibration'
+BATCH_ROWS = 200_000  # Answer logs folded in per pass
+BIN_EDGES = np.linspace(-4.0, 4.0, 17)
+BIN_CENTERS = (BIN_EDGES[:-1] + BIN_EDGES[1:]) / 2
+MAX_OPTIONS = 6
+MIN_RESPONSES = 30  # Items answered fewer times keep their bank-level defaults
+PRIOR_WEIGHT = 2.0  # Ridge pull of the fitted slope and intercept towards the defaults
+NEWTON_STEPS = 25
+
+
+def _list_matrix(values, width: int) -> np.ndarray:
+    """Stack stored JSON lists into a fixed-width matrix, zero-padded"""
+    matrix = np.zeros((len(values), width))
+    for row, stored in enumerate(values):
+        stored = list(stored)[:width]
+        matrix[row, :len(stored)] = stored
+    return matrix
+
+
+class ItemStatistics:
+    """Sufficient statistics for every calibrated item, as parallel NumPy arrays"""
+
+    def __init__(self, item_ids, skills):
+        self.index = pd.Index(item_ids)
+        self.skills = np.asarray(skills, dtype=object)
+        size = len(self.index)
+        self.responses = np.zeros(size)
+        self.correct = np.zeros(size)
+        self.ability_sum = np.zeros(size)
+        self.ability_sqsum = np.zeros(size)
+        self.correct_ability_sum = np.zeros(size)
+        self.bin_counts = np.zeros((size, len(BIN_CENTERS)))
+        self.bin_correct = np.zeros((size, len(BIN_CENTERS)))
+        self.option_counts = np.zeros((size, MAX_OPTIONS))
+        self.option_ability_sums = np.zeros((size, MAX_OPTIONS))
+
+    @classmethod
+    def from_frame(cls, stats_df: pd.DataFrame) -> "ItemStatistics":
+        stats = cls(stats_df['ItemID'].tolist(), stats_df['Skill'].tolist())
+        if stats_df.empty:
+            return stats
+        # Copies, since add_logs adds to them in place and a column's array may be read-only
+        stats.responses = stats_df['Responses'].to_numpy(dtype=float, copy=True)
+        stats.correct = stats_df['Correct_Count'].to_numpy(dtype=float, copy=True)
+        stats.ability_sum = stats_df['Ability_Sum'].to_numpy(dtype=float, copy=True)
+        stats.ability_sqsum = stats_df['Ability_SqSum'].to_numpy(dtype=float, copy=True)
+        stats.correct_ability_sum = stats_df['Correct_Ability_Sum'].to_numpy(dtype=float, copy=True)
+        stats.bin_counts = _list_matrix(stats_df['Bin_Counts'], len(BIN_CENTERS))
+        stats.bin_correct = _list_matrix(stats_df['Bin_Correct'], len(BIN_CENTERS))
+        stats.option_counts = _list_matrix(stats_df['Option_Counts'], MAX_OPTIONS)
+        stats.option_ability_sums = _list_matrix(stats_df['Option_Ability_Sums'], MAX_OPTIONS)
+        return stats
+
+    def _grow(self, logs: pd.DataFrame):
+        """Add rows for items seen for the first time in logs"""
+        new = logs.drop_duplicates('ItemID')
+        new = new[~new['ItemID'].isin(self.index)]
+        if new.empty:
+            return
+        extra = len(new)
+        self.index = self.index.append(pd.Index(new['ItemID']))
+        self.skills = np.concatenate([self.skills, new['Skill'].to_numpy(dtype=object)])
+        for name in ('responses', 'correct', 'ability_sum', 'ability_sqsum', 'correct_ability_sum'):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+        for name in ('bin_counts', 'bin_correct', 'option_counts', 'option_ability_sums'):
+            matrix = getattr(self, name)
+            setattr(self, name, np.vstack([matrix, np.zeros((extra, matrix.shape[1]))]))
+
+    def add_logs(self, logs: pd.DataFrame):
+        """Fold a batch of answer logs into the running statistics"""
+        self._grow(logs)
+        size = len(self.index)
+        rows = self.index.get_indexer(logs['ItemID'])
+        correct = logs['Correct'].to_numpy(dtype=float)
+        ability = np.clip(logs['Ability'].to_numpy(dtype=float), BIN_EDGES[0], BIN_EDGES[-1])
+        selected = logs['Selected'].to_numpy(dtype=int)
+        chose = (selected >= 0) & (selected < MAX_OPTIONS)  # Unanswered questions count only as incorrect
+        bins = np.clip(np.digitize(ability, BIN_EDGES[1:-1]), 0, len(BIN_CENTERS) - 1)
+
+        self.responses += np.bincount(rows, minlength=size)
+        self.correct += np.bincount(rows, weights=correct, minlength=size)
+        self.ability_sum += np.bincount(rows, weights=ability, minlength=size)
+        self.ability_sqsum += np.bincount(rows, weights=ability ** 2, minlength=size)
+        self.correct_ability_sum += np.bincount(rows, weights=correct * ability, minlength=size)
+
+        cells = rows * len(BIN_CENTERS) + bins
+        self.bin_counts += np.bincount(cells, minlength=self.bin_counts.size).reshape(self.bin_counts.shape)
+        self.bin_correct += np.bincount(cells, weights=correct, minlength=self.bin_correct.size).reshape(self.bin_correct.shape)
+        cells = rows[chose] * MAX_OPTIONS + selected[chose]
+        self.option_counts += np.bincount(cells, minlength=self.option_counts.size).reshape(self.option_counts.shape)
+        self.option_ability_sums += np.bincount(cells, weights=ability[chose],
+                                                minlength=self.option_ability_sums.size).reshape(self.option_ability_sums.shape)
+
+    def classical(self) -> Tuple[np.ndarray, np.ndarray]:
+        """p-value and point-biserial correlation of correctness with ability, per item"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_value = self.correct / self.responses
+            mean = self.ability_sum / self.responses
+            sd = np.sqrt(np.maximum(self.ability_sqsum / self.responses - mean ** 2, 0.0))
+            mean_correct = self.correct_ability_sum / self.correct
+            point_biserial = (mean_correct - mean) / sd * np.sqrt(p_value / (1.0 - p_value))
+        return p_value, np.nan_to_num(point_biserial, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def fit_2pl(self) -> Tuple[np.ndarray, np.ndarray]:
+        """2PL (a, b) per item by penalized Newton steps on the binned responses, all items at once"""
+        x = BIN_CENTERS[None, :]
+        n, y = self.bin_counts, self.bin_correct
+        slope = np.full(len(self.index), at.DEFAULT_DISCRIMINATION)
+        intercept = np.zeros(len(self.index))
+        for _ in range(NEWTON_STEPS):
+            p = 1.0 / (1.0 + np.exp(-(slope[:, None] * x + intercept[:, None])))
+            residual = y - n * p
+            weight = n * p * (1.0 - p)
+            grad_s = (residual * x).sum(axis=1) - PRIOR_WEIGHT * (slope - at.DEFAULT_DISCRIMINATION)
+            grad_c = residual.sum(axis=1) - PRIOR_WEIGHT * intercept
+            h_ss = (weight * x ** 2).sum(axis=1) + PRIOR_WEIGHT
+            h_sc = (weight * x).sum(axis=1)
+            h_cc = weight.sum(axis=1) + PRIOR_WEIGHT
+            det = h_ss * h_cc - h_sc ** 2
+            slope = np.clip(slope + (h_cc * grad_s - h_sc * grad_c) / det, 0.2, 4.0)
+            intercept = intercept + (h_ss * grad_c - h_sc * grad_s) / det
+        return slope, np.clip(-intercept / slope, -4.0, 4.0)
+
+    def to_rows(self):
+        p_value, point_biserial = self.classical()
+        slope, difficulty = self.fit_2pl()
+        for i, item in enumerate(self.index):
+            yield {
+                'ItemID': item, 'Skill': self.skills[i], 'Responses': int(self.responses[i]),
+                'Correct_Count': int(self.correct[i]), 'Ability_Sum': float(self.ability_sum[i]),
+                'Ability_SqSum': float(self.ability_sqsum[i]), 'Correct_Ability_Sum': float(self.correct_ability_sum[i]),
+                'Bin_Counts': self.bin_counts[i].tolist(), 'Bin_Correct': self.bin_correct[i].tolist(),
+                'Option_Counts': self.option_counts[i].tolist(), 'Option_Ability_Sums': self.option_ability_sums[i].tolist(),
+                'PValue': float(np.nan_to_num(p_value[i])), 'Point_Biserial': float(point_biserial[i]),
+                'Discrimination': float(slope[i]), 'Difficulty': float(difficulty[i]),
+                'Calibrated': bool(self.responses[i] >= MIN_RESPONSES),
+            }
+
+
+def run_calibration(repo: Optional[storage.Repository] = None, full: bool = False) -> int:
+    """Fold answer logs newer than the watermark into item_stats; returns the number of logs read"""
+    repo = repo or storage.get_repository()
+    watermark = repo.get('watermarks', JOB_NAME)
+    position = 0 if full or watermark is None else int(watermark['Position'])
+    stats_df = repo.frame('item_stats')
+    stats = ItemStatistics.from_frame(stats_df.iloc[0:0] if full else stats_df)
+    processed = 0
+    while True:
+        logs, last = repo.frame_after('answer_logs', position, limit=BATCH_ROWS)
+        if logs.empty:
+            break
+        stats.add_logs(logs)
+        processed += len(logs)
+        position = last
+    if processed:
+        # Stats are written before the watermark, so an interrupted run is redone rather than lost
+        if full:
+            repo.replace_rows('item_stats', stats.to_rows())
+        else:
+            repo.upsert('item_stats', stats.to_rows())
+        repo.upsert('watermarks', [{'Job': JOB_NAME, 'Position': position}])
+    return processed
+
+
+@tq.task('calibrate_questions', max_attempts=1, cache_seconds=0)
+def _calibration_task(full: bool = False) -> Dict:
+    return {'processed': run_calibration(full=full)}
+
+
+def item_parameters() -> Dict[str, Tuple[float, float]]:
+    """ItemID -> (a, b) for every calibrated item, cached until item_stats changes"""
+    shared = data_layer.get_shared_data()
+
+    def build():
+        stats_df = shared.repo.frame('item_stats')
+        stats_df = stats_df[stats_df['Calibrated']]
+        return dict(zip(stats_df['ItemID'], zip(stats_df['Discrimination'].astype(float),
+                                                stats_df['Difficulty'].astype(float))))
+
+    return shared.derived('item_parameters', ('item_stats',), build)
+
+
+def distractor_report(repo: Optional[storage.Repository] = None, skill: Optional[str] = None) -> pd.DataFrame:
+    """One row per (item, option): share of responses and mean ability of those choosing it"""
+    repo = repo or storage.get_repository()
+    stats_df = repo.frame('item_stats')
+    if skill:
+        stats_df = stats_df[stats_df['Skill'] == skill.strip().lower()]
+    stats = ItemStatistics.from_frame(stats_df)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = stats.option_counts / stats.responses[:, None]
+        mean_ability = stats.option_ability_sums / stats.option_counts
+    report = pd.DataFrame({
+        'ItemID': np.repeat(stats.index.to_numpy(), MAX_OPTIONS),
+        'Skill': np.repeat(stats.skills, MAX_OPTIONS),
+        'Option': np.tile(np.arange(MAX_OPTIONS), len(stats.index)),
+        'Share': share.ravel(),
+        'Mean_Ability': mean_ability.ravel(),
+    })
+    return report[stats.option_counts.ravel() > 0].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate skill-test questions from answer logs")
+    parser.add_argument('--full', action='store_true', help="recompute from every answer log")
+    parser.add_argument('--distractors', metavar='SKILL', help="print option statistics for a skill")
+    args = parser.parse_args()
+    if args.distractors:
+        print(distractor_report(skill=args.distractors).to_string(index=False))
+    else:
+        print(f"Calibrated from {run_calibration(full=args.full)} new answer logs")
@@ -0,0 +1,91 @@
+"""
+Job Title Prediction for the Smart Job Portal
+Job categories compiled once into a category x skill weight matrix (each keyword weighted
+by its category's skills_weight), so predicting titles for a skill list is one
+matrix-vector product and re-classifying many students is one matrix product.
+"""
+
+from typing import Dict, Iterable, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+
+class JobPredictor:
+    """Weight matrix over the keyword vocabulary of a set of job categories"""
+
+    def __init__(self, categories: Mapping[str, Mapping]):
+        self.titles = list(categories)
+        self.vocabulary = sorted({k.lower() for data in categories.values() for k in data['keywords']})
+        self.codes = {skill: i for i, skill in enumerate(self.vocabulary)}
+        self.members = np.zeros((len(self.titles), len(self.vocabulary)), dtype=bool)
+        for row, data in enumerate(categories.values()):
+            self.members[row, [self.codes[k.lower()] for k in data['keywords']]] = True
+        weights = np.array([float(data['skills_weight']) for data in categories.values()])
+        self.weights = self.members * weights[:, None]
+        self.totals = np.array([len(data['keywords']) for data in categories.values()], dtype=float)
+
+    def _codes(self, skills: Iterable[str]) -> np.ndarray:
+        """Vocabulary code of each skill, -1 for skills no category lists"""
+        return np.array([self.codes.get(str(skill).lower(), -1) for skill in skills], dtype=np.int64)
+
+    def _percentages(self, scores: np.ndarray) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.totals > 0, scores / self.totals * 100, 0.0)
+
+    def predict(self, skills: List[str]) -> Dict:
+        """Per title: score (% of weighted keywords matched), matched_skills, total_matches and
+        confidence, ordered by score then matches, best first"""
+        codes = self._codes(skills)
+        known = codes >= 0
+        counts = np.bincount(codes[known], minlength=len(self.vocabulary)).astype(float)
+        percentages = self._percentages(self.weights @ counts)
+        hits = np.zeros((len(self.titles), len(codes)), dtype=bool)
+        hits[:, known] = self.members[:, codes[known]]
+        matches = hits.sum(axis=1)
+        order = np.lexsort((-matches, -percentages))  # Stable, so ties keep category order
+        return {
+            self.titles[c]: {
+                'score': float(percentages[c]),
+                'matched_skills': [skills[j] for j in np.flatnonzero(hits[c])],
+                'total_matches': int(matches[c]),
+                'confidence': min(float(percentages[c]) * 2, 100),
+            }
+            for c in order
+        }
+
+    def _count_matrix(self, skill_lists: Iterable[List[str]]) -> np.ndarray:
+        """Occurrences of each vocabulary skill: one row per skill list"""
+        rows, codes = [], []
+        for row, skills in enumerate(skill_lists):
+            skill_codes = self._codes(skills if isinstance(skills, (list, tuple, np.ndarray)) else [])
+            skill_codes = skill_codes[skill_codes >= 0]
+            rows.append(np.full(len(skill_codes), row))
+            codes.append(skill_codes)
+        n_rows = len(rows)
+        counts = np.zeros((n_rows, len(self.vocabulary)))
+        if n_rows:
+            np.add.at(counts, (np.concatenate(rows).astype(np.int64), np.concatenate(codes)), 1.0)
+        return counts
+
+    def score_matrix(self, skill_lists: Iterable[List[str]]) -> np.ndarray:
+        """Score (%) of every title for every skill list: one row per list, one column per title"""
+        return self._percentages(self._count_matrix(skill_lists) @ self.weights.T)
+
+    def predict_many(self, skill_lists: Iterable[List[str]]) -> pd.DataFrame:
+        """Best title, its score and confidence for each skill list, in input order"""
+        counts = self._count_matrix(skill_lists)
+        if not len(counts):
+            return pd.DataFrame({'Predicted Role': pd.Series(dtype='object'), 'Score': pd.Series(dtype=float),
+                                 'Confidence': pd.Series(dtype=float)})
+        scores = self._percentages(counts @ self.weights.T)
+        matches = counts @ self.members.T
+        # Ties on score go to the title with more matched skills, then to the first category, as in predict()
+        top = scores == scores.max(axis=1, keepdims=True)
+        best = np.argmax(np.where(top, matches, -1), axis=1)
+        best_scores = scores[np.arange(len(scores)), best]
+        return pd.DataFrame({
+            'Predicted Role': [self.titles[c] if s > 0 else None for c, s in zip(best, best_scores)],
+            'Score': best_scores,
+            'Confidence': np.minimum(best_scores * 2, 100),
+        })
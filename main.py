@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 
 # Import custom modules
@@ -7,9 +6,10 @@ try:
     import student_module as student
     import company_module as company
     import admin_module as admin
+    import storage
 except ImportError as e:
     st.error(f"Error importing modules: {e}. Please ensure all module files are present and correctly named.")
-    st.error("Required modules: student_module.py, company_module.py, admin_module.py")
+    st.error("Required modules: student_module.py, company_module.py, admin_module.py, storage.py")
     st.stop()
 
 # ---------------------- CONFIG ----------------------
@@ -128,7 +128,7 @@ st.markdown(
 
 # ---------------------- SESSION STATE ----------------------
 def initialize_session_state():
-    """Initialize session state variables and shared DataFrames."""
+    """Initialize per-session state variables."""
     if "role" not in st.session_state:
         st.session_state.role = None
     if "logged_in" not in st.session_state:
@@ -140,33 +140,9 @@ def initialize_session_state():
     if "announcement" not in st.session_state:
         st.session_state.announcement = "Welcome! Job fair next week. All companies will be present."
     
-    # Initialize shared DataFrames if not present
-    if 'students' not in st.session_state:
-        st.session_state.students = pd.DataFrame(columns=[
-            'StudentID', 'Name', 'Email', 'College', 'Degree', 'Year', 'CGPA', 
-            'Resume Score', 'Test Score', 'Skills', 'Skills_Count', 
-            'Test_Completed', 'Resume_Uploaded', 'Status', 'Registration_Date', 
-            'Applications_Count'
-        ])
-    if 'companies' not in st.session_state:
-        st.session_state.companies = pd.DataFrame(columns=[
-            'CompanyID', 'Name', 'Industry', 'Company_Size', 'Jobs_Posted', 
-            'Total_Applications', 'Approval_Status', 'Registration_Date'
-        ])
-    if 'jobs' not in st.session_state:
-        st.session_state.jobs = pd.DataFrame(columns=[
-            'JobID', 'Company', 'Role', 'Location', 'Salary', 'Experience', 
-            'Description', 'Openings', 'Status', 'Posted_Date', 'Applications', 
-            'Min Resume Score', 'Min Test Score', 'Required Skills'
-        ])
-    if 'applications' not in st.session_state:
-        st.session_state.applications = pd.DataFrame(columns=['JobID', 'StudentID', 'ApplicationDate', 'Status'])
-    if 'student_credentials' not in st.session_state:
-        st.session_state.student_credentials = {}
-    if 'company_credentials' not in st.session_state:
-        st.session_state.company_credentials = {}
-    if 'admin_credentials' not in st.session_state:
-        st.session_state.admin_credentials = {'ADMIN001': 'admin@123'}
+    # Platform data lives in the shared repository (see storage.py), not in per-session DataFrames.
+    # Picks up writes by other processes (bulk resume imports, task workers, match table rebuilds)
+    storage.get_repository().sync()
 
 def go_back():
     """Reset session state to return to main page."""
@@ -227,9 +203,10 @@ def display_role_selection():
     st.subheader("Portal at a Glance")
     colA, colB, colC = st.columns(3)
     # Dynamically calculate metrics
-    candidates_registered = len(st.session_state.students)
-    companies_onboarded = len(st.session_state.companies)
-    jobs_posted = len(st.session_state.jobs)
+    repo = storage.get_repository()
+    candidates_registered = repo.count('students')
+    companies_onboarded = repo.count('companies')
+    jobs_posted = repo.count('jobs')
     colA.metric("👥 Candidates Registered", f"{candidates_registered:,}")
     colB.metric("🏢 Companies Onboarded", f"{companies_onboarded:,}")
     colC.metric("📝 Jobs Posted", f"{jobs_posted:,}")
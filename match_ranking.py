@@ -0,0 +1,111 @@
+"""
+Top-K Match Ranking for the Smart Job Portal
+Returns only the best matches for a job or a student from the materialized match table,
+using partial selection instead of sorting every scored pair, with score thresholds and
+pagination cursors. Only the pagination widgets use Streamlit, imported when they are
+called, so the REST API ranks matches without it.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+import match_table as mt
+import storage
+
+PAGE_SIZE = 20
+
+
+def _empty_page() -> Dict:
+    return {'matches': [], 'next_cursor': None, 'total': 0}
+
+
+def select_top_k(scores: np.ndarray, ids: List[str], k: int, min_score: float = 0.0,
+                 cursor: Optional[Tuple[float, str]] = None) -> Tuple[List[int], bool, int]:
+    """Positions of the k best scores ordered by (score desc, id asc).
+
+    Only positive scores at or above min_score are kept. cursor is the (score, id) of the
+    last item of the previous page; only items ranked after it are returned.
+    Returns (positions, has_more, total) where total counts every qualifying item.
+    """
+    ids_arr = np.asarray(ids, dtype=object)
+    mask = (scores > 0) & (scores >= min_score)
+    total = int(mask.sum())
+    if cursor is not None:
+        last_score, last_id = cursor
+        mask &= (scores < last_score) | ((scores == last_score) & (ids_arr > last_id))
+    positions = np.flatnonzero(mask)
+    has_more = len(positions) > k
+    if has_more:
+        # Partial selection: keep everything scoring at least the k-th best, ties included
+        cut = len(positions) - k
+        kth_best = np.partition(scores[positions], cut)[cut]
+        positions = positions[scores[positions] >= kth_best]
+    ranked = sorted(positions, key=lambda p: (-scores[p], ids_arr[p]))[:k]
+    return [int(p) for p in ranked], has_more, total
+
+
+def _page(df: pd.DataFrame, id_column: str, scores: np.ndarray, k: int, min_score: float,
+          cursor: Optional[Tuple[float, str]]) -> Dict:
+    """Build a result page from scored rows of df"""
+    ids = df[id_column].tolist()
+    positions, has_more, total = select_top_k(scores, ids, k, min_score, cursor)
+    matches = df.iloc[positions].to_dict('records')
+    for match, position in zip(matches, positions):
+        match['Match Score'] = float(scores[position])
+    next_cursor = (matches[-1]['Match Score'], str(matches[-1][id_column])) if has_more and matches else None
+    return {'matches': matches, 'next_cursor': next_cursor, 'total': total}
+
+
+def _scored_page(df: pd.DataFrame, id_column: str, scores: Dict[str, float], k: int, min_score: float,
+                 cursor: Optional[Tuple[float, str]]) -> Dict:
+    """Page of the rows of df whose IDs have a materialized score"""
+    rows = df[df[id_column].isin(scores.keys())]
+    score_array = np.array([scores[i] for i in rows[id_column]], dtype=float)
+    return _page(rows, id_column, score_array, k, min_score, cursor)
+
+
+def top_k_matches(job_id: str, k: int = PAGE_SIZE, min_score: float = 0.0,
+                  cursor: Optional[Tuple[float, str]] = None, students_df: Optional[pd.DataFrame] = None) -> Dict:
+    """Best k students for a job, read from the materialized match table.
+
+    Returns {'matches': student records with 'Match Score', 'next_cursor': cursor for the
+    following page or None, 'total': number of matching students}.
+    """
+    students_df = storage.get_repository().frame('students') if students_df is None else students_df
+    scores = mt.get_match_table().scores_for_job(job_id)
+    if not scores:
+        return _empty_page()
+    return _scored_page(students_df, 'StudentID', scores, k, min_score, cursor)
+
+
+def top_k_jobs(student_id: str, k: int = PAGE_SIZE, min_score: float = 0.0,
+               cursor: Optional[Tuple[float, str]] = None, jobs_df: Optional[pd.DataFrame] = None) -> Dict:
+    """Best k jobs for a student, in the same page format as top_k_matches"""
+    jobs_df = storage.get_repository().frame('jobs') if jobs_df is None else jobs_df
+    scores = mt.get_match_table().scores_for_student(student_id)
+    if not scores:
+        return _empty_page()
+    return _scored_page(jobs_df, 'JobID', scores, k, min_score, cursor)
+
+
+def current_cursor(key: str) -> Optional[Tuple[float, str]]:
+    """Cursor of the page currently shown for a paginated match list"""
+    import streamlit as st
+    return st.session_state.setdefault('match_cursors', {}).get(key, [None])[-1]
+
+
+def pagination_controls(key: str, page: Dict):
+    """Previous/Next buttons moving the cursor stack kept in session state for this list"""
+    import streamlit as st
+    stack = st.session_state.setdefault('match_cursors', {}).setdefault(key, [None])
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if len(stack) > 1 and st.button("⬅️ Previous", key=f"prev_{key}"):
+            stack.pop()
+            st.rerun()
+    with col_info:
+        st.caption(f"Page {len(stack)} · {page['total']} matches")
+    with col_next:
+        if page['next_cursor'] is not None and st.button("Next ➡️", key=f"next_{key}"):
+            stack.append(page['next_cursor'])
+            st.rerun()
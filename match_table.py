@@ -0,0 +1,237 @@
+"""
+Materialized Match Table for the Smart Job Portal
+Keeps the score of every matching (student, job) pair in the repository's matches table
+and in memory, updated incrementally: posting or editing a job rescores only that job,
+a change to a student's skills or scores rescores only that student, and deletions drop
+their rows. Run `python match_table.py --rebuild` to recompute it from scratch.
+"""
+
+import argparse
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pandas as pd
+import matching
+import skill_index as sidx
+import storage
+import task_queue as tq
+
+
+class MatchTable:
+    """(student, job) -> match score for every pair scoring above zero"""
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self.job_scores: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.student_scores: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._lock = threading.Lock()
+        # Held from reading the inputs to storing the scores, so a refresh that read older
+        # student or job rows cannot overwrite the scores of one that read newer rows
+        self._refresh_lock = threading.RLock()
+
+    @classmethod
+    def load(cls, repo: storage.Repository) -> "MatchTable":
+        """Read the materialized scores stored in the repository"""
+        table = cls(repo)
+        table.reload()
+        return table
+
+    def reload(self, where: Optional[Dict] = None):
+        """Re-read the stored scores of every pair, or only of the job or student where names, e.g.
+        after another process rescored it"""
+        df = self.repo.page('matches', where) if where else self.repo.frame('matches')
+        with self._lock:
+            if not where:
+                self.job_scores = defaultdict(dict)
+                self.student_scores = defaultdict(dict)
+            elif 'JobID' in where:
+                self._drop_job_locked(where['JobID'])
+            else:
+                self._drop_student_locked(where['StudentID'])
+            for match in df.to_dict('records'):
+                self.job_scores[match['JobID']][match['StudentID']] = float(match['Score'])
+                self.student_scores[match['StudentID']][match['JobID']] = float(match['Score'])
+
+    def __len__(self) -> int:
+        return sum(len(scores) for scores in self.job_scores.values())
+
+    def scores_for_job(self, job_id: str) -> Dict[str, float]:
+        """StudentID -> score for one job"""
+        with self._lock:
+            return dict(self.job_scores.get(job_id, {}))
+
+    def scores_for_student(self, student_id: str) -> Dict[str, float]:
+        """JobID -> score for one student"""
+        with self._lock:
+            return dict(self.student_scores.get(student_id, {}))
+
+    def refresh_job(self, job_id: str):
+        """Rescore one job against its candidates from the skill index"""
+        with self._refresh_lock:
+            self._refresh_job(job_id)
+
+    def _refresh_job(self, job_id: str):
+        job = self.repo.get('jobs', job_id)
+        if job is None:
+            self.remove_job(job_id)
+            return
+        candidate_ids = sidx.get_skill_index().candidates_for_job(
+            job['Required Skills'], job['Min Resume Score'], job['Min Test Score']
+        )
+        students_df = self.repo.frame('students')
+        candidates = students_df[students_df['StudentID'].isin(candidate_ids)]
+        scores = matching.MatchEngine(candidates, pd.DataFrame([job])).score_matrix()[:, 0]
+        new_scores = {sid: float(score) for sid, score in zip(candidates['StudentID'], scores) if score > 0}
+        with self._lock:
+            self.repo.replace_rows('matches', _rows(job_id, new_scores.items(), by_job=True), where={'JobID': job_id})
+            self._drop_job_locked(job_id)
+            for student_id, score in new_scores.items():
+                self.job_scores[job_id][student_id] = score
+                self.student_scores[student_id][job_id] = score
+
+    def refresh_student(self, student_id: str):
+        """Rescore one student against the jobs sharing a skill with them"""
+        with self._refresh_lock:
+            self._refresh_student(student_id)
+
+    def _refresh_student(self, student_id: str):
+        student = self.repo.get('students', student_id)
+        if student is None:
+            self.remove_student(student_id)
+            return
+        job_ids = sidx.get_skill_index().jobs_for_student(student['Skills'])
+        jobs_df = self.repo.frame('jobs')
+        candidate_jobs = jobs_df[jobs_df['JobID'].isin(job_ids)]
+        scores = matching.MatchEngine(pd.DataFrame([student]), candidate_jobs).score_matrix()[0]
+        new_scores = {jid: float(score) for jid, score in zip(candidate_jobs['JobID'], scores) if score > 0}
+        with self._lock:
+            self.repo.replace_rows('matches', _rows(student_id, new_scores.items(), by_job=False),
+                                   where={'StudentID': student_id})
+            self._drop_student_locked(student_id)
+            for job_id, score in new_scores.items():
+                self.student_scores[student_id][job_id] = score
+                self.job_scores[job_id][student_id] = score
+
+    def remove_job(self, job_id: str):
+        with self._refresh_lock, self._lock:
+            self.repo.replace_rows('matches', [], where={'JobID': job_id})
+            self._drop_job_locked(job_id)
+
+    def remove_student(self, student_id: str):
+        with self._refresh_lock, self._lock:
+            self.repo.replace_rows('matches', [], where={'StudentID': student_id})
+            self._drop_student_locked(student_id)
+
+    def _drop_job_locked(self, job_id: str):
+        for student_id in self.job_scores.pop(job_id, {}):
+            self.student_scores[student_id].pop(job_id, None)
+            if not self.student_scores[student_id]:
+                del self.student_scores[student_id]
+
+    def _drop_student_locked(self, student_id: str):
+        for job_id in self.student_scores.pop(student_id, {}):
+            self.job_scores[job_id].pop(student_id, None)
+            if not self.job_scores[job_id]:
+                del self.job_scores[job_id]
+
+    def rebuild(self) -> int:
+        """Recompute every pair from the repository; returns the number of matches"""
+        with self._refresh_lock:
+            return self._rebuild()
+
+    def _rebuild(self) -> int:
+        students_df = self.repo.frame('students')
+        jobs_df = self.repo.frame('jobs')
+        index = sidx.SkillIndex.from_frames(students_df, jobs_df)  # Not trusting the live index during recovery
+        job_scores: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for j in range(len(jobs_df)):
+            job = jobs_df.iloc[j]
+            candidates = students_df[students_df['StudentID'].isin(
+                index.candidates_for_job(job['Required Skills'], job['Min Resume Score'], job['Min Test Score']))]
+            scores = matching.MatchEngine(candidates, jobs_df.iloc[[j]]).score_matrix()[:, 0]
+            for student_id, score in zip(candidates['StudentID'], scores):
+                if score > 0:
+                    job_scores[job['JobID']][student_id] = float(score)
+        rows = [row for job_id, scores in job_scores.items() for row in _rows(job_id, scores.items(), by_job=True)]
+        with self._lock:
+            self.repo.replace_rows('matches', rows)
+            self.job_scores = job_scores
+            self.student_scores = defaultdict(dict)
+            for job_id, scores in job_scores.items():
+                for student_id, score in scores.items():
+                    self.student_scores[student_id][job_id] = score
+        return len(rows)
+
+
+def _rows(entity_id: str, scores, by_job: bool) -> List[Dict]:
+    """matches rows for one job (by_job) or one student"""
+    if by_job:
+        return [{'JobID': entity_id, 'StudentID': other, 'Score': score} for other, score in scores]
+    return [{'JobID': other, 'StudentID': entity_id, 'Score': score} for other, score in scores]
+
+
+_table: Optional[MatchTable] = None
+_table_lock = threading.Lock()
+
+
+def get_match_table() -> MatchTable:
+    """Process-wide match table, loaded from the repository (and built if it has never been)"""
+    global _table
+    with _table_lock:
+        if _table is None:
+            repo = storage.get_repository()
+            _table = MatchTable.load(repo)
+            repo.add_listener(_on_write)
+            if not len(_table) and repo.count('students') and repo.count('jobs'):
+                _table.rebuild()
+        return _table
+
+
+def rebuild_match_table() -> MatchTable:
+    """Recompute the whole table, e.g. after bulk admin edits or to recover from drift"""
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = MatchTable(storage.get_repository())
+            _table.repo.add_listener(_on_write)
+        _table.rebuild()
+        return _table
+
+
+def _on_write(table: str, rows: Optional[List[Dict]], change: Optional[Dict] = None):
+    """Re-read the scores another process rewrote; this process's own writes already updated the table"""
+    if table != 'matches' or not (change or {}).get('remote') or _table is None:
+        return
+    _table.reload(change.get('where'))
+
+
+# One refresh runs at a time anyway (see MatchTable._refresh_lock), so a second worker would only wait
+@tq.task('refresh_student_matches', max_concurrency=1, cache_seconds=0)
+def _refresh_student_task(student_id: str) -> Dict:
+    table = get_match_table()
+    table.refresh_student(student_id)
+    return {'matches': len(table.scores_for_student(student_id))}
+
+
+@tq.task('refresh_job_matches', max_concurrency=1, cache_seconds=0)
+def _refresh_job_task(job_id: str) -> Dict:
+    table = get_match_table()
+    table.refresh_job(job_id)
+    return {'matches': len(table.scores_for_job(job_id))}
+
+
+@tq.task('rebuild_matches', max_attempts=1, cache_seconds=0)
+def _rebuild_task() -> Dict:
+    sidx.rebuild_skill_index()
+    return {'matches': len(rebuild_match_table())}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the materialized match table")
+    parser.add_argument('--rebuild', action='store_true', help="recompute every match from the repository")
+    args = parser.parse_args()
+    if args.rebuild:
+        print(f"Rebuilt match table: {len(rebuild_match_table())} matches")
+    else:
+        print(f"Match table holds {len(get_match_table())} matches")
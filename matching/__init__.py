@@ -0,0 +1,17 @@
+"""
+Matching Library for the Smart Job Portal
+The one definition of job categories and of the student-job match score, shared by the
+dashboards, the match table and the API: a MatchPolicy holds the weights and the
+eligibility rule, calculate_match scores one pair and MatchEngine scores whole frames.
+Run `python -m matching` to check the two agree on the stored data.
+"""
+
+from matching.categories import JOB_CATEGORIES
+from matching.engine import MatchEngine, build_vocabulary, disagreements, encode_skills
+from matching.policy import DEFAULT_POLICY, MatchPolicy, score_ratio
+from matching.scoring import as_score, as_skill_list, calculate_match, skill_key, unique_skills
+
+__all__ = [
+    'JOB_CATEGORIES', 'MatchEngine', 'build_vocabulary', 'disagreements', 'encode_skills', 'DEFAULT_POLICY',
+    'MatchPolicy', 'score_ratio', 'as_score', 'as_skill_list', 'calculate_match', 'skill_key', 'unique_skills',
+]
@@ -0,0 +1,19 @@
+"""
+Run `python -m matching` to check that MatchEngine and calculate_match agree on every
+stored student x job pair.
+"""
+
+import argparse
+
+import storage
+from matching.engine import disagreements
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that the vectorized and scalar scorers agree on stored data")
+    parser.parse_args()
+    repo = storage.get_repository()
+    students_df, jobs_df = repo.frame('students'), repo.frame('jobs')
+    mismatches = disagreements(students_df, jobs_df)
+    print(f"{len(students_df) * len(jobs_df)} pairs scored, {mismatches} disagreements")
+    raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,58 @@
+"""
+Job Categories for the Smart Job Portal
+Job titles with their description, skill keywords and keyword weight: the skill vocabulary
+of resume parsing, job-title prediction and the skill options offered to recruiters.
+"""
+
+JOB_CATEGORIES = {
+    "Backend Developer": {
+        "description": "Develops server-side applications, APIs, databases, and system architecture",
+        "keywords": ["python", "java", "nodejs", "django", "flask", "spring", "api", "database", "mongodb", "postgresql", "mysql", "redis", "microservices", "docker", "rest", "graphql"],
+        "skills_weight": 1.0
+    },
+    "Frontend Developer": {
+        "description": "Creates user interfaces and client-side applications",
+        "keywords": ["react", "angular", "vue", "javascript", "typescript", "html", "css", "sass", "webpack", "bootstrap", "tailwind", "jquery", "nextjs", "nuxtjs", "responsive"],
+        "skills_weight": 1.0
+    },
+    "Full Stack Developer": {
+        "description": "Works on both frontend and backend development",
+        "keywords": ["react", "nodejs", "python", "javascript", "api", "database", "html", "css", "mongodb", "postgresql", "fullstack", "end-to-end"],
+        "skills_weight": 1.2
+    },
+    "Data Scientist": {
+        "description": "Analyzes data to extract insights and build predictive models",
+        "keywords": ["python", "r", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "matplotlib", "seaborn", "jupyter", "machine learning", "statistics", "data analysis", "visualization"],
+        "skills_weight": 1.0
+    },
+    "Machine Learning Engineer": {
+        "description": "Builds and deploys machine learning models and systems",
+        "keywords": ["python", "tensorflow", "pytorch", "scikit-learn", "mlops", "docker", "kubernetes", "aws", "machine learning", "deep learning", "neural networks", "model deployment"],
+        "skills_weight": 1.0
+    },
+    "DevOps Engineer": {
+        "description": "Manages infrastructure, deployment pipelines, and system operations",
+        "keywords": ["docker", "kubernetes", "aws", "azure", "gcp", "terraform", "ansible", "jenkins", "gitlab", "ci/cd", "linux", "bash", "monitoring", "infrastructure"],
+        "skills_weight": 1.0
+    },
+    "Mobile Developer": {
+        "description": "Develops applications for mobile platforms",
+        "keywords": ["react native", "flutter", "swift", "kotlin", "android", "ios", "xamarin", "mobile", "app development"],
+        "skills_weight": 1.0
+    },
+    "Data Engineer": {
+        "description": "Builds data pipelines and manages data infrastructure",
+        "keywords": ["python", "sql", "spark", "hadoop", "kafka", "airflow", "etl", "data pipeline", "big data", "aws", "snowflake", "databricks"],
+        "skills_weight": 1.0
+    },
+    "UI/UX Designer": {
+        "description": "Designs user interfaces and user experiences",
+        "keywords": ["figma", "sketch", "adobe xd", "photoshop", "illustrator", "wireframing", "prototyping", "user research", "design thinking", "usability"],
+        "skills_weight": 1.0
+    },
+    "QA Engineer": {
+        "description": "Tests software applications and ensures quality",
+        "keywords": ["selenium", "cypress", "jest", "junit", "testing", "automation", "manual testing", "api testing", "performance testing", "quality assurance"],
+        "skills_weight": 1.0
+    }
+}
@@ -0,0 +1,135 @@
+"""
+Matching Engine for the Smart Job Portal
+Scores every student against every job in one batched pass instead of calling
+calculate_match inside nested DataFrame.iterrows() loops.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from matching.policy import DEFAULT_POLICY, MatchPolicy
+from matching.scoring import as_skill_list, calculate_match
+
+try:
+    from scipy import sparse
+except ImportError:  # SciPy is optional, dense NumPy products are used instead
+    sparse = None
+
+
+def _numeric_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Return a DataFrame column as float64, with missing columns/values as NaN"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+
+
+def build_vocabulary(skill_lists: List[List[str]]) -> Dict[str, int]:
+    """Map every distinct skill string to a column index"""
+    vocabulary = {}
+    for skills in skill_lists:
+        for skill in skills:
+            if skill not in vocabulary:
+                vocabulary[skill] = len(vocabulary)
+    return vocabulary
+
+
+def encode_skills(skill_lists: List[List[str]], vocabulary: Dict[str, int]):
+    """Encode skill lists as a binary (rows x vocabulary) matrix, sparse when SciPy is available"""
+    rows, cols = [], []
+    for row, skills in enumerate(skill_lists):
+        for col in {vocabulary[s] for s in skills if s in vocabulary}:
+            rows.append(row)
+            cols.append(col)
+    shape = (len(skill_lists), len(vocabulary))
+    data = np.ones(len(rows), dtype=np.float64)
+    if sparse is not None:
+        return sparse.csr_matrix((data, (rows, cols)), shape=shape)
+    matrix = np.zeros(shape, dtype=np.float64)
+    matrix[rows, cols] = 1.0
+    return matrix
+
+
+class MatchEngine:
+    """Encodes student and job skills once and scores all student x job pairs with matrix operations.
+
+    Scores agree with calculate_match under the same policy (by default: 0 when the
+    student is below either job minimum, otherwise 0.6 * skill overlap + 0.2 * resume
+    ratio + 0.2 * test ratio, as a percentage rounded to 2 decimals). Rows and columns
+    follow the order of the input DataFrames.
+    """
+
+    def __init__(self, students_df: pd.DataFrame, jobs_df: pd.DataFrame, policy: MatchPolicy = DEFAULT_POLICY):
+        self.policy = policy
+        self.student_ids = students_df['StudentID'].tolist() if 'StudentID' in students_df.columns else []
+        self.job_ids = jobs_df['JobID'].tolist() if 'JobID' in jobs_df.columns else []
+
+        student_skills = [as_skill_list(s) for s in students_df['Skills']] if 'Skills' in students_df.columns else [[] for _ in range(len(students_df))]
+        job_skills = [as_skill_list(s) for s in jobs_df['Required Skills']] if 'Required Skills' in jobs_df.columns else [[] for _ in range(len(jobs_df))]
+
+        # Only skills that appear in at least one job can contribute to an overlap
+        self.vocabulary = build_vocabulary(job_skills)
+        self.student_matrix = encode_skills(student_skills, self.vocabulary)
+        self.job_matrix = encode_skills(job_skills, self.vocabulary)
+        # calculate_match divides by len(required_skills), duplicates included
+        self.required_counts = np.array([len(s) for s in job_skills], dtype=float)
+
+        self.resume_scores = _numeric_column(students_df, 'Resume Score')
+        self.test_scores = _numeric_column(students_df, 'Test Score')
+        self.min_resume = _numeric_column(jobs_df, 'Min Resume Score')
+        self.min_test = _numeric_column(jobs_df, 'Min Test Score')
+
+    def _overlap(self, student_rows, job_rows) -> np.ndarray:
+        """Number of distinct shared skills for each selected student x job pair"""
+        product = self.student_matrix[student_rows] @ self.job_matrix[job_rows].T
+        if sparse is not None and sparse.issparse(product):
+            product = product.toarray()
+        return np.asarray(product, dtype=float)
+
+    def score_matrix(self, student_rows=None, job_rows=None) -> np.ndarray:
+        """Return match scores (students x jobs), optionally restricted to row/column positions"""
+        student_rows = np.arange(len(self.student_ids)) if student_rows is None else np.asarray(student_rows, dtype=int)
+        job_rows = np.arange(len(self.job_ids)) if job_rows is None else np.asarray(job_rows, dtype=int)
+        if len(student_rows) == 0 or len(job_rows) == 0:
+            return np.zeros((len(student_rows), len(job_rows)))
+
+        resume = self.resume_scores[student_rows][:, None]
+        test = self.test_scores[student_rows][:, None]
+        min_resume = self.min_resume[job_rows][None, :]
+        min_test = self.min_test[job_rows][None, :]
+        required = self.required_counts[job_rows][None, :]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill_match = np.where(required > 0, self._overlap(student_rows, job_rows) / required, 0.0)
+        return self.policy.combine(skill_match, resume, min_resume, test, min_test)
+
+    def scores_for_student(self, student_id: str) -> Optional[pd.Series]:
+        """Scores of one student against every job, indexed by JobID"""
+        if student_id not in self.student_ids:
+            return None
+        row = self.student_ids.index(student_id)
+        return pd.Series(self.score_matrix([row])[0], index=self.job_ids, name='Match Score')
+
+    def scores_for_job(self, job_id: str) -> Optional[pd.Series]:
+        """Scores of every student against one job, indexed by StudentID"""
+        if job_id not in self.job_ids:
+            return None
+        col = self.job_ids.index(job_id)
+        return pd.Series(self.score_matrix(job_rows=[col])[:, 0], index=self.student_ids, name='Match Score')
+
+    def count_matches(self) -> int:
+        """Number of student x job pairs with a positive match score"""
+        return int((self.score_matrix() > 0).sum())
+
+
+def disagreements(students_df: pd.DataFrame, jobs_df: pd.DataFrame, policy: MatchPolicy = DEFAULT_POLICY) -> int:
+    """Number of student x job pairs where MatchEngine and calculate_match give different scores"""
+    matrix = MatchEngine(students_df, jobs_df, policy).score_matrix()
+    students, jobs = students_df.to_dict('records'), jobs_df.to_dict('records')
+    return sum(
+        matrix[i, j] != calculate_match(student.get('Skills'), job.get('Required Skills'), student.get('Resume Score'),
+                                        job.get('Min Resume Score'), student.get('Test Score'),
+                                        job.get('Min Test Score'), policy)
+        for i, student in enumerate(students) for j, job in enumerate(jobs)
+    )
+
@@ -0,0 +1,56 @@
+"""
+Match Policy for the Smart Job Portal
+The weights and eligibility rule of the match score, written once with NumPy operations
+that accept scalars and arrays alike, so the scalar and vectorized scorers share the
+same arithmetic and agree exactly.
+"""
+
+import numpy as np
+
+SKILL_WEIGHT = 0.6
+RESUME_WEIGHT = 0.2
+TEST_WEIGHT = 0.2
+
+
+def score_ratio(scores, minimums):
+    """(score - min) / (100 - min), 0 where the denominator is not positive"""
+    denominator = np.subtract(100, minimums)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, np.subtract(scores, minimums) / denominator, 0.0)
+
+
+class MatchPolicy:
+    """How a student's skill overlap and scores combine into a match percentage for a job.
+
+    Subclass and override eligible() or combine() to plug in other rules; every scorer
+    (calculate_match, MatchEngine and the materialized match table) goes through them.
+    """
+
+    def __init__(self, skill_weight: float = SKILL_WEIGHT, resume_weight: float = RESUME_WEIGHT,
+                 test_weight: float = TEST_WEIGHT):
+        self.skill_weight = skill_weight
+        self.resume_weight = resume_weight
+        self.test_weight = test_weight
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(skill_weight={self.skill_weight}, resume_weight={self.resume_weight}, "
+                f"test_weight={self.test_weight})")
+
+    def eligible(self, resume, min_resume, test, min_test):
+        """True where the student meets both job minimums; comparisons against NaN never reject"""
+        return np.logical_not(np.logical_or(np.less(resume, min_resume), np.less(test, min_test)))
+
+    def combine(self, skill_match, resume, min_resume, test, min_test):
+        """Match percentage rounded to 2 decimals: 0 where ineligible or a score is missing.
+
+        skill_match is the share of required skills the student has; arguments are scalars
+        or arrays broadcasting against each other.
+        """
+        final = ((self.skill_weight * skill_match) + (self.resume_weight * score_ratio(resume, min_resume))
+                 + (self.test_weight * score_ratio(test, min_test)))
+        scores = np.where(self.eligible(resume, min_resume, test, min_test), np.round(final * 100, 2), 0.0)
+        # Unparseable scores give NaN, which is never treated as a match
+        return np.nan_to_num(scores, nan=0.0)
+
+
+DEFAULT_POLICY = MatchPolicy()
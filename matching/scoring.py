@@ -0,0 +1,52 @@
+"""
+Scalar Match Scoring for the Smart Job Portal
+Scores one student against one job with the same policy arithmetic as MatchEngine.
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from matching.policy import DEFAULT_POLICY, MatchPolicy
+
+
+def skill_key(skill) -> str:
+    """A skill name as compared everywhere: resumes yield 'python', seeded and edited rows 'Python'"""
+    return str(skill).strip().casefold()
+
+
+def as_skill_list(value) -> List[str]:
+    """Return a skills cell as a list of skill keys (missing or malformed cells become empty)"""
+    if isinstance(value, (list, tuple, set, np.ndarray)):
+        return [skill_key(skill) for skill in value]
+    return []
+
+
+def unique_skills(skills: Iterable[str], spellings: Iterable[str] = ()) -> List[str]:
+    """Skills in order without case variants of an earlier one, spelled as in spellings where
+    one matches (e.g. a student's current skills when storing the skills of their resume)"""
+    spelled: Dict[str, str] = {skill_key(s): s for s in spellings}
+    result: Dict[str, str] = {}
+    for skill in skills:
+        result.setdefault(skill_key(skill), spelled.get(skill_key(skill), skill))
+    return list(result.values())
+
+
+def as_score(value) -> float:
+    """A score as a float, NaN when missing or unparseable"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def calculate_match(student_skills, required_skills, student_resume, min_resume, student_test, min_test,
+                    policy: MatchPolicy = DEFAULT_POLICY) -> float:
+    """Match score (0-100) of one student for one job"""
+    required = as_skill_list(required_skills)
+    common_skills = set(as_skill_list(student_skills)) & set(required)
+    # Divides by len(required_skills), duplicates included
+    skill_match = len(common_skills) / len(required) if len(required) > 0 else 0.0
+    return float(policy.combine(skill_match, as_score(student_resume), as_score(min_resume),
+                                as_score(student_test), as_score(min_test)))
@@ -0,0 +1,277 @@
+"""
+Time-Partitioned Archive for the Smart Job Portal
+Applications, student registrations and job postings mirrored on disk as one directory per
+month, each holding part files sorted by the table's timestamp. A date-range read opens
+only the months the range overlaps and slices each part with a binary search on its sorted
+timestamps, so windowed analytics touch just the relevant rows. Parts are Parquet when
+pyarrow is installed and pickled frames otherwise.
+
+Inserted rows are buffered from repository write notifications and flushed as new parts.
+Updates and deletes of known rows rewrite only the months those rows were or now are in,
+updates of columns that are not archived are ignored, and writes that may have changed any
+row rewrite the table's partitions on the next read.
+"""
+
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import storage
+
+try:
+    import pyarrow  # noqa: F401
+    PART_SUFFIX = '.parquet'
+except ImportError:  # pyarrow is optional, partitions are pickled frames instead
+    PART_SUFFIX = '.pkl'
+
+ARCHIVE_DIR = Path(__file__).resolve().parent / "data" / "partitions"
+MANIFEST_FILE = "manifest.json"
+# Table -> (timestamp column, archived columns)
+PARTITIONED = {
+    'applications': ('ApplicationDate', ['JobID', 'StudentID', 'Status']),
+    'students': ('Registration_Date', ['StudentID', 'College', 'Degree', 'Status']),
+    'jobs': ('Posted_Date', ['JobID', 'Company', 'Location', 'Role', 'Status']),
+}
+FLUSH_ROWS = 5000  # Buffered inserts written as one part
+COMPACT_PARTS = 16  # A month with more parts than this is merged into one
+
+
+def _month(value) -> str:
+    return pd.Timestamp(value).strftime('%Y-%m')
+
+
+def _write_part(df: pd.DataFrame, path: Path):
+    tmp_path = path.with_name(path.name + '.tmp')
+    if PART_SUFFIX == '.parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_part(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    if PART_SUFFIX == '.parquet':
+        return pd.read_parquet(path, columns=columns)
+    df = pd.read_pickle(path)
+    return df if columns is None else df[columns]
+
+
+class PartitionedArchive:
+    """Month-partitioned, timestamp-sorted copies of the time-series tables"""
+
+    def __init__(self, repo: storage.Repository, root: Path = ARCHIVE_DIR):
+        self.repo = repo
+        self.root = Path(root)
+        self._buffers: Dict[str, List[Dict]] = {table: [] for table in PARTITIONED}
+        self._stale = set()
+        self._dirty: Dict[str, set] = {table: set() for table in PARTITIONED}  # Keys of rows changed in place
+        self._moved = set()  # Tables whose dirty rows may have left their month or been deleted
+        self._lock = threading.RLock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._counts = self._read_manifest()  # Rows archived per table
+        for table in PARTITIONED:
+            # Partitions written by an earlier process are reused if they still hold every row
+            if self._counts.get(table) != repo.count(table):
+                self._stale.add(table)
+        repo.add_listener(self._on_write)
+
+    def _read_manifest(self) -> Dict[str, int]:
+        try:
+            with open(self.root / MANIFEST_FILE, 'r', encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        counts = {table: n for table, n in self._counts.items()
+                  if table not in self._stale and not self._dirty.get(table)}
+        tmp_path = self.root / (MANIFEST_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(counts, handle)
+        os.replace(tmp_path, self.root / MANIFEST_FILE)
+
+    def _on_write(self, table: str, rows: Optional[List[Dict]], change: Optional[Dict] = None):
+        if table not in PARTITIONED:
+            return
+        with self._lock:
+            if table in self._stale:
+                return
+            if rows is not None:
+                self._buffers[table].extend(rows)
+                if len(self._buffers[table]) >= FLUSH_ROWS:
+                    self._flush(table)
+                return
+            change = change or {}
+            ts_column, columns = PARTITIONED[table]
+            written = change.get('columns')
+            if written is not None and not (set(written) - set(storage.KEY_COLUMNS[table])) & {ts_column, *columns}:
+                return  # Only columns the archive does not hold
+            if change.get('keys') is None:
+                self._stale.add(table)
+                self._buffers[table] = []
+                self._dirty[table] = set()
+                self._moved.discard(table)
+            else:
+                self._dirty[table].update(tuple(key) for key in change['keys'])
+                if not change.get('inserted') and (written is None or ts_column in written):
+                    self._moved.add(table)
+            self._write_manifest()  # So a restart does not reuse the outdated partitions
+
+    def _table_dir(self, table: str) -> Path:
+        return self.root / table
+
+    def _parts(self, table: str, months: Optional[List[str]] = None) -> List[Path]:
+        table_dir = self._table_dir(table)
+        if not table_dir.exists():
+            return []
+        month_dirs = sorted(p for p in table_dir.iterdir() if p.is_dir())
+        if months is not None:
+            month_dirs = [p for p in month_dirs if p.name in months]
+        return [part for month_dir in month_dirs for part in sorted(month_dir.glob(f"part-*{PART_SUFFIX}"))]
+
+    def _frame_for(self, table: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Archived columns, with missing timestamps counted as now as on the dashboards"""
+        ts_column, columns = PARTITIONED[table]
+        df = df.reindex(columns=[ts_column] + columns)
+        df[ts_column] = pd.to_datetime(df[ts_column], errors='coerce').fillna(pd.Timestamp(datetime.now()))
+        return df
+
+    def _append_parts(self, table: str, df: pd.DataFrame):
+        """Write df as one new sorted part per month it covers"""
+        ts_column = PARTITIONED[table][0]
+        df = df.sort_values(ts_column, kind='stable')
+        for month, month_df in df.groupby(df[ts_column].dt.strftime('%Y-%m'), sort=False):
+            month_dir = self._table_dir(table) / month
+            month_dir.mkdir(parents=True, exist_ok=True)
+            existing = sorted(month_dir.glob(f"part-*{PART_SUFFIX}"))
+            _write_part(month_df.reset_index(drop=True), month_dir / f"part-{len(existing):05d}{PART_SUFFIX}")
+            if len(existing) + 1 > COMPACT_PARTS:
+                self._compact(table, month_dir)
+
+    def _compact(self, table: str, month_dir: Path):
+        """Merge a month's parts into one sorted part"""
+        ts_column = PARTITIONED[table][0]
+        parts = sorted(month_dir.glob(f"part-*{PART_SUFFIX}"))
+        merged = pd.concat([_read_part(p) for p in parts], ignore_index=True).sort_values(ts_column, kind='stable')
+        _write_part(merged.reset_index(drop=True), month_dir / f"merged{PART_SUFFIX}")
+        for part in parts:
+            part.unlink()
+        os.replace(month_dir / f"merged{PART_SUFFIX}", month_dir / f"part-00000{PART_SUFFIX}")
+
+    def _flush(self, table: str):
+        rows, self._buffers[table] = self._buffers[table], []
+        if rows:
+            self._append_parts(table, self._frame_for(table, pd.DataFrame(rows)))
+            self._counts[table] = self._counts.get(table, 0) + len(rows)
+            self._write_manifest()
+
+    def _rewrite_rows(self, table: str, keys: set, located: bool):
+        """Replace the archived copies of the rows with these keys by their current versions,
+        rewriting only the months they were in and are in now. located: the rows cannot have
+        left the month they are in now (updates that keep the timestamp)"""
+        ts_column = PARTITIONED[table][0]
+        key_columns = list(storage.KEY_COLUMNS[table])
+        current = self.repo.frame(table)
+        current = self._frame_for(table, current[pd.MultiIndex.from_frame(current[key_columns]).isin(keys)])
+        months = set(current[ts_column].dt.strftime('%Y-%m'))
+        if not located:
+            # The old copies may be in any month, found from the archived key columns
+            for path in self._parts(table):
+                part = _read_part(path, key_columns)
+                if pd.MultiIndex.from_frame(part).isin(keys).any():
+                    months.add(path.parent.name)
+        for month in sorted(months):
+            month_dir = self._table_dir(table) / month
+            parts = sorted(month_dir.glob(f"part-*{PART_SUFFIX}"))
+            old = pd.concat([_read_part(p) for p in parts], ignore_index=True) if parts else current.iloc[:0]
+            kept = old[~pd.MultiIndex.from_frame(old[key_columns]).isin(keys)]
+            added = current[current[ts_column].dt.strftime('%Y-%m') == month]
+            merged = pd.concat([kept, added], ignore_index=True).sort_values(ts_column, kind='stable')
+            if merged.empty:
+                shutil.rmtree(month_dir, ignore_errors=True)
+            else:
+                month_dir.mkdir(parents=True, exist_ok=True)
+                _write_part(merged.reset_index(drop=True), month_dir / f"merged{PART_SUFFIX}")
+                for part in parts:
+                    part.unlink()
+                os.replace(month_dir / f"merged{PART_SUFFIX}", month_dir / f"part-00000{PART_SUFFIX}")
+            self._counts[table] = self._counts.get(table, 0) + len(merged) - len(old)
+
+    def _rebuild(self, table: str):
+        shutil.rmtree(self._table_dir(table), ignore_errors=True)
+        self._stale.discard(table)  # Before reading, so writes during the read re-mark it
+        self._dirty[table] = set()
+        self._moved.discard(table)
+        self._buffers[table] = []
+        df = self._frame_for(table, self.repo.frame(table))
+        if not df.empty:
+            self._append_parts(table, df)
+        self._counts[table] = len(df)
+        self._write_manifest()
+
+    def sync(self, table: str):
+        """Bring a table's partitions up to date with the repository"""
+        with self._lock:
+            if table in self._stale:
+                self._rebuild(table)
+                return
+            self._flush(table)
+            if self._dirty[table]:
+                keys, self._dirty[table] = self._dirty[table], set()
+                located = table not in self._moved
+                self._moved.discard(table)
+                self._rewrite_rows(table, keys, located)
+                self._write_manifest()
+
+    def read_range(self, table: str, start: Optional[date] = None, end: Optional[date] = None,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Archived rows with start <= timestamp day <= end, reading only the overlapping months"""
+        ts_column, archived = PARTITIONED[table]
+        columns = [ts_column] + [c for c in (columns or archived) if c != ts_column]
+        lower = pd.Timestamp(start) if start is not None else None
+        upper = pd.Timestamp(end) + pd.Timedelta(days=1) if end is not None else None
+        with self._lock:
+            self.sync(table)
+            months = None
+            if lower is not None or upper is not None:
+                existing = sorted(p.name for p in self._table_dir(table).glob('*') if p.is_dir())
+                months = [m for m in existing
+                          if (start is None or m >= _month(start)) and (end is None or m <= _month(end))]
+            pieces = []
+            for path in self._parts(table, months):
+                part = _read_part(path, columns)
+                stamps = part[ts_column].to_numpy()
+                # Parts are sorted by timestamp, so the window is one contiguous slice
+                lo = 0 if lower is None else np.searchsorted(stamps, lower.to_datetime64(), side='left')
+                hi = len(part) if upper is None else np.searchsorted(stamps, upper.to_datetime64(), side='left')
+                if hi > lo:
+                    pieces.append(part.iloc[lo:hi])
+        if not pieces:
+            return pd.DataFrame({c: pd.Series(dtype='datetime64[ns]' if c == ts_column else 'object') for c in columns})
+        return pd.concat(pieces, ignore_index=True)
+
+    def daily_counts(self, table: str, start: Optional[date] = None, end: Optional[date] = None) -> pd.Series:
+        """Rows per day in the window, indexed by date"""
+        ts_column = PARTITIONED[table][0]
+        df = self.read_range(table, start, end, columns=[ts_column])
+        return df.groupby(df[ts_column].dt.date).size()
+
+
+_archive: Optional[PartitionedArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> PartitionedArchive:
+    """Process-wide archive over the process-wide repository"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = PartitionedArchive(storage.get_repository())
+        return _archive
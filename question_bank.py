@@ -0,0 +1,81 @@
+"""
+Skill Test Question Bank for the Smart Job Portal
+Fallback questions live in data/question_bank as one JSON file per skill plus a manifest
+of difficulties and skill aliases. Each skill file is loaded on first use and compiled
+into read-only tuples keyed by (skill, difficulty), shared by every session in the process.
+"""
+
+import json
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+BANK_DIR = Path(__file__).resolve().parent / "data" / "question_bank"
+MANIFEST_FILE = "manifest.json"
+
+Question = Mapping[str, object]
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def _freeze(question: Dict) -> Question:
+    """Read-only view of a question with its options as a tuple"""
+    frozen = dict(question)
+    frozen['options'] = tuple(question['options'])
+    return MappingProxyType(frozen)
+
+
+class QuestionBank:
+    """Lazily loaded, immutable index of fallback questions by (skill, difficulty)"""
+
+    def __init__(self, bank_dir: Path = BANK_DIR):
+        self.bank_dir = Path(bank_dir)
+        with open(self.bank_dir / MANIFEST_FILE, 'r', encoding='utf-8') as handle:
+            manifest = json.load(handle)
+        self.difficulties: Tuple[str, ...] = tuple(manifest['difficulties'])
+        self._files: Dict[str, str] = dict(manifest['skills'])
+        self._aliases: Dict[str, str] = {alias.lower(): skill for alias, skill in manifest.get('aliases', {}).items()}
+        self._index: Dict[Tuple[str, str], Tuple[Question, ...]] = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+
+    @property
+    def skills(self) -> Tuple[str, ...]:
+        """Skills with a question file, in manifest order"""
+        return tuple(self._files)
+
+    def resolve(self, skill: str) -> Optional[str]:
+        """Canonical bank skill for a skill name or alias, or None if the bank has no questions for it"""
+        key = skill.strip().lower()
+        key = self._aliases.get(key, key)
+        return key if key in self._files else None
+
+    def _load(self, skill: str):
+        with self._lock:
+            if skill in self._loaded:
+                return
+            with open(self.bank_dir / self._files[skill], 'r', encoding='utf-8') as handle:
+                by_difficulty = json.load(handle)
+            for difficulty, questions in by_difficulty.items():
+                self._index[(skill, difficulty)] = tuple(_freeze(q) for q in questions)
+            self._loaded.add(skill)
+
+    def get(self, skill: str, difficulty: str) -> Optional[Tuple[Question, ...]]:
+        """Questions for a skill (or alias) at a difficulty, or None if the bank has none"""
+        canonical = self.resolve(skill)
+        if canonical is None:
+            return None
+        if canonical not in self._loaded:
+            self._load(canonical)
+        return self._index.get((canonical, difficulty))
+
+
+def get_question_bank() -> QuestionBank:
+    """Process-wide question bank shared by all sessions"""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuestionBank()
+        return _bank
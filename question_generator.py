@@ -0,0 +1,281 @@
+"""
+Dynamic Question Generation for the Smart Job Portal
+Fetches skill-test questions from a question service over a pooled HTTP session with
+timeouts and retries, driven from asyncio so every skill of a resume can be prefetched
+concurrently. Generated sets are kept in a persistent cache keyed by (skill, difficulty,
+seed) with TTL eviction; any failure falls back to the static question bank.
+
+The service is configured with QUESTION_API_URL (and optionally QUESTION_API_KEY). It
+receives a JSON POST {"skill", "difficulty", "seed", "count"} and answers
+{"questions": [{"question", "options", "answer", "explanation"}, ...]}.
+Run `python question_generator.py --stub-server` for a local stub service that serves
+shuffled questions from the static bank.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from question_bank import get_question_bank
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "questions"
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+REQUEST_TIMEOUT = (3.0, 10.0)  # (connect, read) seconds per attempt
+FETCH_TIMEOUT_SECONDS = 30.0  # Overall budget for one question set, retries included
+MAX_RETRIES = 2
+POOL_SIZE = 8
+QUESTIONS_PER_TEST = 5
+SEED_VARIANTS = 4  # Distinct question sets per (skill, difficulty) shared across students
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def _valid_question(question: Dict) -> bool:
+    options = question.get('options')
+    answer = question.get('answer')
+    return (isinstance(question.get('question'), str) and isinstance(options, list) and len(options) >= 2
+            and isinstance(answer, int) and 0 <= answer < len(options))
+
+
+def seed_for(user_id: Optional[str]) -> int:
+    """Question-set variant served to a user"""
+    if not user_id:
+        return 0
+    return int(hashlib.sha256(str(user_id).encode('utf-8')).hexdigest(), 16) % SEED_VARIANTS
+
+
+class QuestionCache:
+    """Memory + disk cache of generated question sets with a time-to-live"""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self._memory: Dict[Tuple[str, str, int], Tuple[float, List[Dict]]] = {}
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: Tuple[str, str, int]) -> Path:
+        digest = hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _expired(self, created: float) -> bool:
+        return time.time() - created > self.ttl_seconds
+
+    def get(self, key: Tuple[str, str, int]) -> Optional[List[Dict]]:
+        """Cached questions for a key, or None if missing or expired"""
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as handle:
+                    stored = json.load(handle)
+                entry = (float(stored['created']), stored['questions'])
+            except (OSError, ValueError, KeyError):
+                return None
+            with self._lock:
+                self._memory[key] = entry
+        created, questions = entry
+        if self._expired(created):
+            self.discard(key)
+            return None
+        return questions
+
+    def put(self, key: Tuple[str, str, int], questions: List[Dict]):
+        """Store a question set in both tiers"""
+        created = time.time()
+        with self._lock:
+            self._memory[key] = (created, questions)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump({'key': list(key), 'created': created, 'questions': questions}, handle)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def discard(self, key: Tuple[str, str, int]):
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def evict_expired(self) -> int:
+        """Delete every expired entry from both tiers; returns the number of files removed"""
+        with self._lock:
+            for key in [k for k, (created, _) in self._memory.items() if self._expired(created)]:
+                del self._memory[key]
+        removed = 0
+        for entry in os.scandir(self.cache_dir):
+            if not (entry.is_file() and entry.name.endswith('.json')):
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as handle:
+                    created = float(json.load(handle)['created'])
+            except (OSError, ValueError, KeyError):
+                created = 0.0  # Unreadable entries are dropped
+            if self._expired(created):
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+class QuestionGenerator:
+    """Async client for the question service with caching and static-bank fallback"""
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 cache: Optional[QuestionCache] = None, pool_size: int = POOL_SIZE):
+        self.base_url = base_url if base_url is not None else os.environ.get('QUESTION_API_URL', '')
+        self.api_key = api_key if api_key is not None else os.environ.get('QUESTION_API_KEY')
+        self.cache = cache or QuestionCache()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='questions')
+        self._session = requests.Session()
+        retry = Retry(total=MAX_RETRIES, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=None)  # The service is idempotent for a given seed, so POST is retried too
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._inflight = set()
+        self._inflight_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.base_url)
+
+    def _post(self, skill: str, difficulty: str, seed: int) -> List[Dict]:
+        headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+        payload = {'skill': skill, 'difficulty': difficulty, 'seed': seed, 'count': QUESTIONS_PER_TEST}
+        response = self._session.post(self.base_url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        questions = response.json().get('questions', [])
+        if not questions or not all(_valid_question(q) for q in questions):
+            raise ValueError(f"Malformed question set for {skill}/{difficulty}")
+        return questions
+
+    async def fetch(self, skill: str, difficulty: str, seed: int = 0) -> Optional[List[Dict]]:
+        """Generated questions from the cache or the service, or None if neither has them"""
+        key = (skill.strip().lower(), difficulty, seed)
+        cached = self.cache.get(key)
+        if cached is not None or not self.enabled:
+            return cached
+        loop = asyncio.get_running_loop()
+        try:
+            questions = await asyncio.wait_for(loop.run_in_executor(self._executor, self._post, *key),
+                                               FETCH_TIMEOUT_SECONDS)
+        except (requests.RequestException, ValueError, asyncio.TimeoutError):
+            return None
+        self.cache.put(key, questions)
+        return questions
+
+    async def prefetch_async(self, skills: Iterable[str], difficulties: Sequence[str] = DIFFICULTIES,
+                             seed: int = 0) -> int:
+        """Fetch every (skill, difficulty) set concurrently; returns how many are now cached"""
+        results = await asyncio.gather(*(self.fetch(skill, difficulty, seed)
+                                         for skill in skills for difficulty in difficulties))
+        return sum(1 for questions in results if questions)
+
+    def prefetch(self, skills: Iterable[str], difficulties: Sequence[str] = DIFFICULTIES, seed: int = 0):
+        """Start a background prefetch unless one is already running for the same skills"""
+        if not self.enabled:
+            return
+        job = (tuple(sorted({s.strip().lower() for s in skills})), tuple(difficulties), seed)
+        with self._inflight_lock:
+            if not job[0] or job in self._inflight:
+                return
+            self._inflight.add(job)
+
+        def run():
+            try:
+                self.cache.evict_expired()
+                asyncio.run(self.prefetch_async(job[0], job[1], seed))
+            finally:
+                with self._inflight_lock:
+                    self._inflight.discard(job)
+
+        threading.Thread(target=run, name='question-prefetch', daemon=True).start()
+
+    def get_questions(self, skill: str, difficulty: str, seed: int = 0) -> Optional[List[Dict]]:
+        """Blocking lookup used when a test starts; falls back to the static bank"""
+        questions = None
+        if self.enabled:
+            questions = asyncio.run(self.fetch(skill, difficulty, seed))
+        if questions is None:
+            questions = get_question_bank().get(skill, difficulty)
+        return questions
+
+
+def get_question_generator() -> QuestionGenerator:
+    """Process-wide generator shared by all sessions"""
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = QuestionGenerator()
+        return _generator
+
+
+class StubQuestionHandler(BaseHTTPRequestHandler):
+    """Question service stand-in answering from the static bank, shuffled by seed"""
+
+    def do_POST(self):
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            questions = [dict(q, options=list(q['options']))
+                         for q in get_question_bank().get(payload['skill'], payload['difficulty']) or []]
+        except (ValueError, KeyError):
+            self.send_error(400)
+            return
+        random.Random(payload.get('seed', 0)).shuffle(questions)
+        body = json.dumps({'questions': questions[:payload.get('count', QUESTIONS_PER_TEST)]}).encode('utf-8')
+        self.send_response(200 if questions else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_stub(host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """Start the stub question service on a background thread"""
+    server = ThreadingHTTPServer((host, port), StubQuestionHandler)
+    threading.Thread(target=server.serve_forever, name='question-stub', daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Question generation utilities")
+    parser.add_argument('--stub-server', action='store_true', help="run the local stub question service")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--evict', action='store_true', help="delete expired cached question sets")
+    args = parser.parse_args()
+    if args.stub_server:
+        stub = serve_stub(port=args.port)
+        print(f"Stub question service on http://127.0.0.1:{args.port}/ (set QUESTION_API_URL to use it)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            stub.shutdown()
+    elif args.evict:
+        print(f"Removed {QuestionCache().evict_expired()} expired question sets")
@@ -0,0 +1,124 @@
+"""
+Resume Analysis Cache for the Smart Job Portal
+Content-addressed cache of parsed resumes (extracted text, skills and job predictions)
+keyed by a hash of the file bytes plus the skill-vocabulary version. An in-memory LRU
+tier is shared by every session in the process and backed by a size-bounded disk tier.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "resumes"
+MEMORY_ITEMS = 256
+DISK_BYTES = 200 * 1024 * 1024
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class ResumeCache:
+    """Two-tier (memory LRU + disk) cache of resume analyses"""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, memory_items: int = MEMORY_ITEMS, disk_bytes: int = DISK_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._disk_usage = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+
+    @staticmethod
+    def key(file_bytes: bytes, vocabulary_version: str) -> str:
+        """Content address of a resume for a given skill vocabulary"""
+        return f"{hashlib.sha256(file_bytes).hexdigest()}-{vocabulary_version}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached analysis, promoting disk hits into memory"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                entry = json.load(handle)
+            os.utime(path)  # Eviction is least-recently-used by mtime
+        except (OSError, ValueError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: Dict):
+        """Store an analysis in both tiers"""
+        self._remember(key, entry)
+        path = self._path(key)
+        data = json.dumps(entry).encode('utf-8')
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as handle:
+                handle.write(data)
+            try:
+                replaced = path.stat().st_size  # Overwriting a key frees its old file
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_usage += len(data) - replaced
+            if self._disk_usage > self.disk_bytes:
+                self._evict_disk()
+
+    def _remember(self, key: str, entry: Dict):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier is back under 90% of its budget"""
+        entries = sorted((e for e in os.scandir(self.cache_dir) if e.is_file() and e.name.endswith('.json')),
+                         key=lambda e: e.stat().st_mtime)
+        usage = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if usage <= self.disk_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                usage -= size
+            except OSError:
+                continue
+        self._disk_usage = usage
+
+    def clear(self):
+        """Drop every cached analysis from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file():
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+            self._disk_usage = 0
+
+
+def get_resume_cache() -> ResumeCache:
+    """Process-wide cache shared by all sessions"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResumeCache()
+        return _cache
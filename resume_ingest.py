@@ -0,0 +1,217 @@
+"""
+Bulk Resume Ingestion for the Smart Job Portal
+Processes a campus ZIP of resumes in one run: files are streamed out of the archive one at
+a time, their text is extracted in a process pool with at most a few files in flight, and
+skills and job predictions are computed per file (identical files are served from the
+resume cache). Each resume belongs to the student whose ID (e.g. STU1001) appears in its
+file name; Skills, Skills_Count and Resume_Uploaded are written back in bulk upserts.
+Run `python resume_ingest.py resumes.zip` or use the admin Bulk Resume Upload section,
+which runs it as a background task.
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+import match_table as mt
+from matching import unique_skills
+import resume_cache as rc
+import resume_parser as rp
+import skill_extraction as sx
+import skill_index as sidx
+import storage
+import task_queue as tq
+
+SUFFIX_TYPES = {
+    '.pdf': "application/pdf",
+    '.docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    '.txt': "text/plain",
+}
+MAX_WORKERS = rp.MAX_WORKERS
+IN_FLIGHT_PER_WORKER = 2  # Files read from the archive ahead of the pool
+WRITE_BATCH = 200  # Student updates per upsert
+FULL_REBUILD_STUDENTS = 100  # More updated students than this rebuild the match table instead of rescoring each
+STUDENT_ID_PATTERN = re.compile(r'STU\d+', re.IGNORECASE)
+UPLOAD_DIR = Path(tempfile.gettempdir()) / "job_portal_uploads"
+
+
+def iter_archive(archive, max_bytes: int) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """(name, file bytes, error) for each resume in a ZIP path or file object, read one at a time"""
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            path = PurePosixPath(info.filename)
+            if info.is_dir() or path.name.startswith('.') or '__MACOSX' in path.parts:
+                continue
+            if path.suffix.lower() not in SUFFIX_TYPES:
+                yield info.filename, None, f"Unsupported file type {path.suffix or '(none)'}"
+            elif info.file_size > max_bytes:
+                yield info.filename, None, f"File is {info.file_size / rp.MB:.1f} MB, the limit is {max_bytes / rp.MB:.1f} MB"
+            else:
+                yield info.filename, zf.read(info), None
+
+
+def extract_text(name: str, data: bytes) -> str:
+    """Worker task: text of one resume (PDF pages are parsed in this process, not split again)"""
+    suffix = PurePosixPath(name).suffix.lower()
+    if suffix == '.pdf':
+        return rp.extract_pdf_text(data, parallel_min_pages=rp.MAX_PAGES + 1)
+    if suffix == '.docx':
+        return rp.extract_docx_text(data)
+    return data.decode('utf-8', errors='replace')
+
+
+def student_id_for(name: str) -> Optional[str]:
+    match = STUDENT_ID_PATTERN.search(PurePosixPath(name).name)
+    return match.group(0).upper() if match else None
+
+
+def _analysis(text: str) -> Dict:
+    skills = sx.extract_skills_from_text(text)
+    return {'text': text, 'skills': skills, 'predictions': sx.predict_job_from_skills(skills)}
+
+
+def _write_back(repo: storage.Repository, updates: List[Dict]):
+    """Bulk-write skills, then bring the skill index and match table up to date"""
+    students = repo.frame('students').set_index('StudentID')
+    for update in updates:
+        # Skills the student already lists keep their spelling, as for single uploads
+        current = students.at[update['StudentID'], 'Skills']
+        update['Skills'] = unique_skills(update['Skills'], current if isinstance(current, list) else [])
+        update['Skills_Count'] = len(update['Skills'])
+    for start in range(0, len(updates), WRITE_BATCH):
+        repo.upsert('students', updates[start:start + WRITE_BATCH])
+    if len(updates) > FULL_REBUILD_STUDENTS:
+        sidx.rebuild_skill_index()
+        mt.rebuild_match_table()
+        return
+    index, matches = sidx.get_skill_index(), mt.get_match_table()
+    for update in updates:
+        student = students.loc[update['StudentID']]
+        index.add_student(update['StudentID'], update['Skills'], student['Resume Score'], student['Test Score'])
+        matches.refresh_student(update['StudentID'])
+
+
+def ingest_archive(archive, workers: int = MAX_WORKERS, repo: Optional[storage.Repository] = None,
+                   progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """Analyze every resume in a ZIP and store the skills of the matched students.
+
+    Returns {'files', 'succeeded', 'bytes', 'seconds', 'files_per_second', 'results' (one
+    row per stored resume), 'failures' (one row per file that could not be used)}.
+    progress, if given, is called with the number of files finished so far.
+    """
+    repo = repo or storage.get_repository()
+    max_bytes = int(storage.get_setting('max_resume_size_mb', repo) * rp.MB)  # Same limit as single uploads
+    cache = rc.get_resume_cache()
+    known_ids = set(repo.frame('students')['StudentID'])
+    started = time.monotonic()
+    results, failures, updates = [], [], {}
+    files = total_bytes = 0
+
+    def finish(name: str, student_id: str, analysis: Optional[Dict], error: Optional[str]):
+        nonlocal files
+        files += 1
+        if error is None and not analysis['text'].strip():
+            error = "No text could be extracted"
+        if error is not None:
+            failures.append({'File': name, 'StudentID': student_id, 'Error': error})
+        else:
+            skills = analysis['skills']
+            # A later file for the same student replaces an earlier one, as a re-upload would
+            updates[student_id] = {'StudentID': student_id, 'Skills': list(skills), 'Skills_Count': len(skills),
+                                   'Resume_Uploaded': True}
+            best = next(iter(analysis['predictions'].items()), (None, {'score': 0}))
+            results.append({'File': name, 'StudentID': student_id, 'Skills_Count': len(skills),
+                            'Predicted Role': best[0] if best[1]['score'] > 0 else None})
+        if progress is not None:
+            progress(files)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for name, data, error in iter_archive(archive, max_bytes):
+            student_id = student_id_for(name)
+            if error is None and student_id not in known_ids:
+                error = "No student ID in file name" if student_id is None else f"Unknown student {student_id}"
+            if error is not None:
+                finish(name, student_id, None, error)
+                continue
+            total_bytes += len(data)
+            cache_key = cache.key(data, sx.SKILL_VOCABULARY_VERSION)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                finish(name, student_id, cached, None)
+                continue
+            pending[pool.submit(extract_text, name, data)] = (name, student_id, cache_key)
+            # Bound the archive bytes held in memory by the number of files in flight
+            while len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _collect(future, pending.pop(future), cache, finish)
+        for future in list(pending):
+            _collect(future, pending.pop(future), cache, finish)
+
+    if updates:
+        _write_back(repo, list(updates.values()))
+    seconds = time.monotonic() - started
+    return {
+        'files': files,
+        'succeeded': len(results),
+        'bytes': total_bytes,
+        'seconds': seconds,
+        'files_per_second': files / seconds if seconds > 0 else 0.0,
+        'results': pd.DataFrame(results, columns=['File', 'StudentID', 'Skills_Count', 'Predicted Role']),
+        'failures': pd.DataFrame(failures, columns=['File', 'StudentID', 'Error']),
+    }
+
+
+def _collect(future, job: Tuple[str, str, str], cache: rc.ResumeCache, finish: Callable):
+    name, student_id, cache_key = job
+    try:
+        text = future.result()
+    except Exception as e:  # A corrupt file fails on its own without stopping the batch
+        finish(name, student_id, None, f"{type(e).__name__}: {e}")
+        return
+    analysis = _analysis(text)
+    if text:
+        cache.put(cache_key, analysis)
+    finish(name, student_id, analysis, None)
+
+
+def save_upload(data: bytes) -> str:
+    """Write an uploaded archive to a temporary file for an ingest_resumes task"""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    handle, path = tempfile.mkstemp(suffix='.zip', dir=UPLOAD_DIR)
+    with os.fdopen(handle, 'wb') as upload:
+        upload.write(data)
+    return path
+
+
+@tq.task('ingest_resumes', max_attempts=1, cache_seconds=0)
+def _ingest_task(path: str, workers: int = MAX_WORKERS) -> Dict:
+    """Ingest an archive saved by save_upload, deleting it afterwards; the report's frames become records"""
+    try:
+        report = ingest_archive(path, workers=workers)
+    finally:
+        Path(path).unlink(missing_ok=True)
+    report['results'] = report['results'].astype(object).where(report['results'].notna(), None).to_dict('records')
+    report['failures'] = report['failures'].astype(object).where(report['failures'].notna(), None).to_dict('records')
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze a ZIP of resumes and store the students' skills")
+    parser.add_argument('archive', help="ZIP file of resumes named with student IDs, e.g. STU1001_resume.pdf")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+    report = ingest_archive(args.archive, workers=args.workers)
+    print(f"Processed {report['files']} files ({report['bytes'] / rp.MB:.1f} MB) in {report['seconds']:.1f}s, "
+          f"{report['files_per_second']:.1f} files/s; {report['succeeded']} stored, {len(report['failures'])} failed")
+    if not report['failures'].empty:
+        print(report['failures'].to_string(index=False))
@@ -0,0 +1,119 @@
+"""
+Resume Parser for the Smart Job Portal
+Streaming PDF/DOCX text extraction with page, size and time budgets. Large PDFs
+are split across a process pool; extraction stops once enough text is gathered.
+This module has no Streamlit dependency so it can run in worker processes.
+"""
+
+import io
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Iterator, List, Optional
+
+import PyPDF2
+import docx
+
+# Default budgets for a single resume
+MAX_PAGES = 40
+TIME_BUDGET_SECONDS = 20.0
+TARGET_CHARS = 60000  # Far more than skill extraction needs from any real resume
+PARALLEL_MIN_PAGES = 12  # Smaller documents are parsed in-process
+MAX_WORKERS = 4
+MB = 1024 * 1024
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised when an uploaded file exceeds the configured size limit"""
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all parses in this server process"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _pool
+
+
+def read_upload_bytes(file, max_bytes: Optional[int] = None) -> bytes:
+    """Read an uploaded file (or path/bytes) into memory, enforcing max_bytes"""
+    if isinstance(file, (bytes, bytearray)):
+        data = bytes(file)
+    elif isinstance(file, str):
+        with open(file, 'rb') as handle:
+            data = handle.read()
+    elif hasattr(file, 'getvalue'):
+        data = file.getvalue()
+    else:
+        data = file.read()
+    if max_bytes is not None and len(data) > max_bytes:
+        raise ResumeTooLargeError(f"File is {len(data) / MB:.1f} MB, the limit is {max_bytes / MB:.1f} MB")
+    return data
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> List[str]:
+    """Worker task: text of pages [start, stop)"""
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages(pdf_bytes: bytes, max_pages: int = MAX_PAGES, deadline: Optional[float] = None,
+                   parallel_min_pages: int = PARALLEL_MIN_PAGES) -> Iterator[str]:
+    """Yield page text in order, stopping at max_pages or the time.monotonic() deadline.
+
+    Documents with at least parallel_min_pages pages are split into page ranges parsed
+    in the process pool; ranges not yet consumed are cancelled when the caller stops early.
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    page_count = min(len(reader.pages), max_pages)
+
+    if page_count < parallel_min_pages:
+        for i in range(page_count):
+            if deadline is not None and time.monotonic() > deadline:
+                return
+            yield reader.pages[i].extract_text() or ""
+        return
+
+    chunk = max(1, math.ceil(page_count / MAX_WORKERS))
+    pool = _get_pool()
+    futures = [pool.submit(_extract_page_range, pdf_bytes, start, min(start + chunk, page_count))
+               for start in range(0, page_count, chunk)]
+    try:
+        for future in futures:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                pages = future.result(timeout=timeout)
+            except FutureTimeout:
+                return
+            yield from pages
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf_text(file, max_pages: int = MAX_PAGES, max_bytes: Optional[int] = None,
+                     time_budget: Optional[float] = TIME_BUDGET_SECONDS, target_chars: Optional[int] = TARGET_CHARS,
+                     parallel_min_pages: int = PARALLEL_MIN_PAGES) -> str:
+    """Extract PDF text within the given budgets, joining the pages once"""
+    pdf_bytes = read_upload_bytes(file, max_bytes)
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    parts = []
+    gathered = 0
+    pages = iter_pdf_pages(pdf_bytes, max_pages, deadline, parallel_min_pages)
+    try:
+        for text in pages:
+            parts.append(text)
+            gathered += len(text)
+            if target_chars is not None and gathered >= target_chars:
+                break
+    finally:
+        pages.close()
+    return "".join(parts)
+
+
+def extract_docx_text(file, max_bytes: Optional[int] = None) -> str:
+    """Extract DOCX paragraph text, one paragraph per line"""
+    document = docx.Document(io.BytesIO(read_upload_bytes(file, max_bytes)))
+    return "".join(paragraph.text + "\n" for paragraph in document.paragraphs)
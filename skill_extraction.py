@@ -0,0 +1,115 @@
+"""
+Skill Extraction for the Smart Job Portal
+Keyword skill extraction over the JOB_CATEGORIES vocabulary (one precompiled regex scanned
+once per text) and job-title prediction from the extracted skills, plus the cached
+analysis of an uploaded resume file. Shared by the student pages, the REST API and bulk
+ingestion. This module has no Streamlit dependency.
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional
+
+import job_prediction as jp
+import resume_cache as rc
+import resume_parser as rp
+from matching import JOB_CATEGORIES
+
+
+def preprocess_text(text: str) -> str:
+    """Clean and preprocess text"""
+    text = text.lower()
+    text = re.sub(r'[^\w\s\.\-\+\#\/]', ' ', text)
+    text = ' '.join(text.split())
+    return text
+
+
+def _compile_skill_pattern(vocabulary: List[str]):
+    """Compile the skill vocabulary into one regex scanned once per text.
+
+    The alternation is wrapped in a lookahead so a match is tried at every word start,
+    longest keyword first. Keywords are delimited by non-word characters rather than \\b
+    so skills ending in symbols (e.g. "c++", "c#") still match.
+    """
+    alternatives = sorted(vocabulary, key=len, reverse=True)
+    return re.compile(r'(?<!\w)(?=(' + '|'.join(re.escape(k) for k in alternatives) + r')(?!\w))')
+
+
+def _implied_skills(vocabulary: List[str]) -> Dict[str, frozenset]:
+    """For each keyword, the shorter keywords that also match wherever it matches (e.g. "api" in "api testing")"""
+    implied = {}
+    for keyword in vocabulary:
+        implied[keyword] = frozenset(
+            other for other in vocabulary
+            if len(other) < len(keyword) and keyword.startswith(other) and not re.match(r'\w', keyword[len(other)])
+        )
+    return implied
+
+
+# Precompiled once at import; the pattern only changes with JOB_CATEGORIES
+SKILL_VOCABULARY = sorted({k.lower() for job_data in JOB_CATEGORIES.values() for k in job_data['keywords']})
+SKILL_PATTERN = _compile_skill_pattern(SKILL_VOCABULARY)
+IMPLIED_SKILLS = _implied_skills(SKILL_VOCABULARY)
+JOB_PREDICTOR = jp.JobPredictor(JOB_CATEGORIES)
+# Cached resume analyses are invalidated whenever the categories, keywords or weights change
+SKILL_VOCABULARY_VERSION = hashlib.sha256(json.dumps(JOB_CATEGORIES, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+def extract_skills_from_text(text: str) -> List[str]:
+    """Extract skills using keyword matching"""
+    text = preprocess_text(text)
+    found_skills = set()
+
+    for match in SKILL_PATTERN.finditer(text):
+        keyword = match.group(1)
+        found_skills.add(keyword)
+        found_skills.update(IMPLIED_SKILLS[keyword])
+
+    return sorted(found_skills)
+
+
+def extract_skills_many(texts: List[str]) -> List[List[str]]:
+    """Extract skills from many texts (e.g. bulk re-extraction) with the shared compiled pattern"""
+    return [extract_skills_from_text(text) for text in texts]
+
+
+def predict_job_from_skills(skills: List[str]) -> Dict:
+    """Predict job title using keyword matching"""
+    return JOB_PREDICTOR.predict(skills)
+
+
+def cached_resume_analysis(file_bytes: bytes) -> Optional[Dict]:
+    """Analysis of an identical file already parsed by any session, if still cached"""
+    cache = rc.get_resume_cache()
+    return cache.get(cache.key(file_bytes, SKILL_VOCABULARY_VERSION))
+
+
+def analyze_resume(file_bytes: bytes, file_type: str, max_bytes=None) -> Optional[Dict]:
+    """Parse a resume and extract skills and job predictions, reusing the cached analysis of identical files.
+
+    Extraction errors (e.g. a file over max_bytes) are raised, so a background task reports them.
+    """
+    analysis = cached_resume_analysis(file_bytes)
+    if analysis is not None:
+        return analysis
+
+    # Extract text based on file type
+    if file_type == "application/pdf":
+        resume_text = rp.extract_pdf_text(file_bytes, max_bytes=max_bytes)
+    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        resume_text = rp.extract_docx_text(file_bytes, max_bytes=max_bytes)
+    else:  # txt file
+        resume_text = str(file_bytes, "utf-8")
+    if not resume_text:
+        return None
+
+    skills = extract_skills_from_text(resume_text)
+    analysis = {
+        'text': resume_text,
+        'skills': skills,
+        'predictions': predict_job_from_skills(skills)
+    }
+    cache = rc.get_resume_cache()
+    cache.put(cache.key(file_bytes, SKILL_VOCABULARY_VERSION), analysis)
+    return analysis
@@ -0,0 +1,174 @@
+"""
+Inverted Skill Index for the Smart Job Portal
+Maps each skill to the students and jobs that list it, so matching only scores
+candidates that share at least one skill with a job instead of scanning everyone.
+One index is shared by all sessions, like the repository it is built from.
+"""
+
+import threading
+import pandas as pd
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+import storage
+from matching import skill_key
+
+# Columns of each table the index is built from
+INDEXED_COLUMNS = {'students': {'StudentID', 'Skills', 'Resume Score', 'Test Score'},
+                   'jobs': {'JobID', 'Required Skills'}}
+
+
+def _as_skill_set(value) -> frozenset:
+    """Return a skills cell as a frozenset of skill keys (missing or malformed cells become empty)"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return frozenset(skill_key(skill) for skill in value)
+    return frozenset()
+
+
+def _as_score(value) -> float:
+    """Coerce a Resume/Test score cell to float, NaN when it is not numeric"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class SkillIndex:
+    """Skill -> posting lists of StudentIDs and JobIDs, maintained incrementally"""
+
+    def __init__(self):
+        self.student_postings: Dict[str, Set[str]] = defaultdict(set)
+        self.job_postings: Dict[str, Set[str]] = defaultdict(set)
+        self.student_skills: Dict[str, frozenset] = {}
+        self.job_skills: Dict[str, frozenset] = {}
+        self.student_scores: Dict[str, tuple] = {}
+
+    @classmethod
+    def from_frames(cls, students_df: pd.DataFrame, jobs_df: pd.DataFrame) -> "SkillIndex":
+        """Build the index from the students and jobs DataFrames"""
+        index = cls()
+        for student in students_df.to_dict('records'):
+            index.add_student(student.get('StudentID'), student.get('Skills'),
+                              student.get('Resume Score'), student.get('Test Score'))
+        for job in jobs_df.to_dict('records'):
+            index.add_job(job.get('JobID'), job.get('Required Skills'))
+        return index
+
+    def add_student(self, student_id: str, skills, resume_score=None, test_score=None):
+        """Insert or update a student's skills and scores"""
+        if student_id is None:
+            return
+        new_skills = _as_skill_set(skills)
+        old_skills = self.student_skills.get(student_id, frozenset())
+        for skill in old_skills - new_skills:
+            self._discard(self.student_postings, skill, student_id)
+        for skill in new_skills - old_skills:
+            self.student_postings[skill].add(student_id)
+        self.student_skills[student_id] = new_skills
+        self.student_scores[student_id] = (_as_score(resume_score), _as_score(test_score))
+
+    def remove_student(self, student_id: str):
+        """Drop a student from every posting list"""
+        for skill in self.student_skills.pop(student_id, frozenset()):
+            self._discard(self.student_postings, skill, student_id)
+        self.student_scores.pop(student_id, None)
+
+    def add_job(self, job_id: str, required_skills):
+        """Insert or update a job's required skills"""
+        if job_id is None:
+            return
+        new_skills = _as_skill_set(required_skills)
+        old_skills = self.job_skills.get(job_id, frozenset())
+        for skill in old_skills - new_skills:
+            self._discard(self.job_postings, skill, job_id)
+        for skill in new_skills - old_skills:
+            self.job_postings[skill].add(job_id)
+        self.job_skills[job_id] = new_skills
+
+    def remove_job(self, job_id: str):
+        """Drop a job from every posting list"""
+        for skill in self.job_skills.pop(job_id, frozenset()):
+            self._discard(self.job_postings, skill, job_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], skill: str, entity_id: str):
+        ids = postings.get(skill)
+        if ids is not None:
+            ids.discard(entity_id)
+            if not ids:
+                del postings[skill]
+
+    def candidates_for_job(self, required_skills, min_resume=None, min_test=None) -> Set[str]:
+        """StudentIDs sharing at least one required skill and passing the Min Resume/Test Score gate"""
+        candidates = set()
+        for skill in _as_skill_set(required_skills):
+            candidates |= self.student_postings.get(skill, set())
+        min_resume = _as_score(min_resume)
+        min_test = _as_score(min_test)
+        # Same gate as MatchPolicy.eligible: comparisons against NaN never reject
+        return {
+            student_id for student_id in candidates
+            if not (self.student_scores[student_id][0] < min_resume or self.student_scores[student_id][1] < min_test)
+        }
+
+    def jobs_for_student(self, skills) -> Set[str]:
+        """JobIDs requiring at least one of the given skills"""
+        jobs = set()
+        for skill in _as_skill_set(skills):
+            jobs |= self.job_postings.get(skill, set())
+        return jobs
+
+
+_index: Optional[SkillIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index() -> SkillIndex:
+    """Return the process-wide index, building it from the repository on first use"""
+    with _index_lock:
+        if _index is None:
+            _rebuild_locked(None, None)
+        return _index
+
+
+def rebuild_skill_index(students_df: Optional[pd.DataFrame] = None, jobs_df: Optional[pd.DataFrame] = None) -> SkillIndex:
+    """Rebuild the index from scratch, e.g. after bulk admin edits"""
+    with _index_lock:
+        return _rebuild_locked(students_df, jobs_df)
+
+
+def _rebuild_locked(students_df: Optional[pd.DataFrame], jobs_df: Optional[pd.DataFrame]) -> SkillIndex:
+    global _index
+    repo = storage.get_repository()
+    if _index is None:
+        repo.add_listener(_on_write)
+    students_df = repo.frame('students') if students_df is None else students_df
+    jobs_df = repo.frame('jobs') if jobs_df is None else jobs_df
+    _index = SkillIndex.from_frames(students_df, jobs_df)
+    return _index
+
+
+def _on_write(table: str, rows: Optional[List[Dict]], change: Optional[Dict] = None):
+    """Apply students and jobs written by another process (e.g. a bulk resume import); writes
+    made in this process update the index where they are made"""
+    if table not in INDEXED_COLUMNS or not (change or {}).get('remote'):
+        return
+    if change.get('columns') is not None and not INDEXED_COLUMNS[table] & set(change['columns']):
+        return
+    with _index_lock:
+        if _index is None:
+            return
+        if change.get('keys') is None:
+            _rebuild_locked(None, None)
+            return
+        repo = storage.get_repository()
+        for key in change['keys']:
+            row = repo.get(table, key[0])
+            if table == 'students':
+                if row is None:
+                    _index.remove_student(key[0])
+                else:
+                    _index.add_student(key[0], row['Skills'], row['Resume Score'], row['Test Score'])
+            elif row is None:
+                _index.remove_job(key[0])
+            else:
+                _index.add_job(key[0], row['Required Skills'])
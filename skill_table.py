@@ -0,0 +1,150 @@
+"""
+Skill Membership Table for the Smart Job Portal
+Long-format (entity, skill) rows for the list-valued Required Skills of jobs and Skills of
+students, with skills stored as integer codes into one shared vocabulary. Each row also
+carries the entity's posting or registration day and, for jobs, the company, so skill
+demand, supply and gaps over any date window are a mask plus a bincount. Rows follow the
+repository's write notifications: inserts append, while any other write to jobs or
+students rebuilds that table's rows in full on the next read.
+"""
+
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import storage
+from columnar_table import AppendableTable
+from matching import skill_key
+
+# Table -> (key column, skills column, date column)
+SOURCES = {
+    'jobs': ('JobID', 'Required Skills', 'Posted_Date'),
+    'students': ('StudentID', 'Skills', 'Registration_Date'),
+}
+COLUMNS = ['EntityID', 'SkillID', 'Day', 'Company']
+
+
+class SkillTable:
+    """(entity, skill code, day, company) membership rows for jobs and students"""
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self.skills: List[str] = []  # Skill code -> name
+        self.codes: Dict[str, int] = {}
+        self._tables: Dict[str, AppendableTable] = {}
+        self._stale = set(SOURCES)
+        self._lock = threading.RLock()
+        repo.add_listener(self._on_write)
+
+    def _encode(self, names: pd.Series) -> np.ndarray:
+        """Skill codes for names, adding unseen skills to the vocabulary"""
+        for name in names.unique():
+            if name not in self.codes:
+                self.codes[name] = len(self.skills)
+                self.skills.append(name)
+        return names.map(self.codes).to_numpy(dtype=np.int64)
+
+    def _memberships(self, table: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Explode an entity frame into membership rows"""
+        key, skills_column, date_column = SOURCES[table]
+        df = df[[c for c in (key, skills_column, date_column, 'Company') if c in df.columns]]
+        df = df.assign(**{skills_column: df[skills_column].apply(lambda x: x if isinstance(x, list) else [])})
+        long = df.explode(skills_column).dropna(subset=[skills_column])
+        if long.empty:
+            return pd.DataFrame({c: pd.Series(dtype=t) for c, t in
+                                 zip(COLUMNS, ('object', 'int64', 'datetime64[ns]', 'object'))})
+        days = pd.to_datetime(long[date_column], errors='coerce').dt.normalize()
+        return pd.DataFrame({
+            'EntityID': long[key].to_numpy(),
+            # Keyed like the matcher, so supply of 'python' meets demand for 'Python'
+            'SkillID': self._encode(long[skills_column].map(skill_key)),
+            # Missing dates count as today, as on the dashboards
+            'Day': days.fillna(pd.Timestamp(datetime.now().date())).to_numpy(),
+            'Company': long['Company'].to_numpy() if 'Company' in long else None,
+        })
+
+    def _on_write(self, table: str, rows: Optional[List[Dict]], change: Optional[Dict] = None):
+        if table not in SOURCES:
+            return
+        with self._lock:
+            if table in self._stale:
+                return
+            if rows is None:
+                self._stale.add(table)
+            else:
+                self._tables[table].extend(self._memberships(table, pd.DataFrame(rows)).to_dict('records'))
+
+    def frame(self, table: str) -> pd.DataFrame:
+        """Membership rows for jobs or students, rebuilt first if the table changed in place"""
+        with self._lock:
+            if table in self._stale:
+                self._stale.discard(table)  # Before reading, so writes during the read re-mark it
+                self._tables[table] = AppendableTable(COLUMNS, self._memberships(table, self.repo.frame(table)))
+            return self._tables[table].to_frame()
+
+    def counts(self, table: str, start: Optional[date] = None, end: Optional[date] = None,
+               company: Optional[str] = None) -> np.ndarray:
+        """Entities per skill code, optionally within [start, end] days and for one company"""
+        df = self.frame(table)
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= (df['Day'] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (df['Day'] <= pd.Timestamp(end)).to_numpy()
+        if company is not None:
+            mask &= (df['Company'] == company).to_numpy()
+        codes = df['SkillID'].to_numpy(dtype=np.int64)[mask]
+        return np.bincount(codes, minlength=len(self.skills))
+
+    def _named(self, counts: np.ndarray, name: str) -> pd.Series:
+        present = np.flatnonzero(counts)
+        series = pd.Series(counts[present], index=[self.skills[i] for i in present], name=name)
+        return series.sort_values(ascending=False, kind='stable')
+
+    def demand(self, start: Optional[date] = None, company: Optional[str] = None) -> pd.Series:
+        """Jobs requiring each skill, most demanded first"""
+        return self._named(self.counts('jobs', start=start, company=company), 'Demand')
+
+    def supply(self, start: Optional[date] = None) -> pd.Series:
+        """Students listing each skill, most common first"""
+        return self._named(self.counts('students', start=start), 'Supply')
+
+    def gap(self, start: Optional[date] = None) -> pd.DataFrame:
+        """Demand from jobs posted since start against supply from all students, for demanded skills"""
+        demand = self.counts('jobs', start=start)
+        supply = self.counts('students')
+        demanded = np.flatnonzero(demand)
+        return pd.DataFrame({
+            'Skill': [self.skills[i] for i in demanded],
+            'Demand': demand[demanded],
+            'Supply': supply[demanded],
+            'Gap': demand[demanded] - supply[demanded],
+        })
+
+    def demand_by_period(self, start: Optional[date] = None, freq: str = 'W', top: int = 5) -> pd.DataFrame:
+        """Jobs requiring each of the top skills per period: one column per skill, one row per period"""
+        df = self.frame('jobs')
+        if start is not None:
+            df = df[df['Day'] >= pd.Timestamp(start)]
+        if df.empty:
+            return pd.DataFrame()
+        top_codes = np.argsort(-np.bincount(df['SkillID'].to_numpy(dtype=np.int64)), kind='stable')[:top]
+        df = df[df['SkillID'].isin(top_codes)]
+        table = df.groupby([df['Day'].dt.to_period(freq).dt.start_time, 'SkillID']).size().unstack(fill_value=0)
+        return table.rename(columns=lambda code: self.skills[code]).rename_axis(index='Period', columns=None)
+
+
+_table: Optional[SkillTable] = None
+_table_lock = threading.Lock()
+
+
+def get_skill_table() -> SkillTable:
+    """Process-wide skill membership table over the process-wide repository"""
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = SkillTable(storage.get_repository())
+        return _table
@@ -0,0 +1,710 @@
+"""
+Storage Layer for the Smart Job Portal
+Repository interface over the portal's entities (students, companies, jobs, applications,
+shortlists and credentials) with a SQLite implementation. One repository and its
+connection pool are shared by every Streamlit session in the process, so data persists
+across sessions and restarts.
+"""
+
+import hashlib
+import json
+import math
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from columnar_table import AppendableTable
+
+DB_PATH = Path(__file__).resolve().parent / "data" / "portal.db"
+POOL_SIZE = 4
+
+# Column name -> SQLite type, in display order
+SCHEMA = {
+    'students': {
+        'StudentID': 'TEXT PRIMARY KEY', 'Name': 'TEXT', 'Email': 'TEXT', 'College': 'TEXT', 'Degree': 'TEXT',
+        'Year': 'TEXT', 'CGPA': 'REAL', 'Resume Score': 'NUMERIC', 'Test Score': 'NUMERIC', 'Skills': 'TEXT',
+        'Skills_Count': 'INTEGER', 'Test_Completed': 'INTEGER', 'Resume_Uploaded': 'INTEGER', 'Status': 'TEXT',
+        'Registration_Date': 'TEXT', 'Applications_Count': 'INTEGER',
+    },
+    'companies': {
+        'CompanyID': 'TEXT PRIMARY KEY', 'Name': 'TEXT', 'Industry': 'TEXT', 'Company_Size': 'TEXT',
+        'Jobs_Posted': 'INTEGER', 'Total_Applications': 'INTEGER', 'Approval_Status': 'TEXT', 'Registration_Date': 'TEXT',
+    },
+    'jobs': {
+        'JobID': 'TEXT PRIMARY KEY', 'Company': 'TEXT', 'Role': 'TEXT', 'Location': 'TEXT', 'Salary': 'TEXT',
+        'Experience': 'TEXT', 'Description': 'TEXT', 'Openings': 'INTEGER', 'Status': 'TEXT', 'Posted_Date': 'TEXT',
+        'Applications': 'INTEGER', 'Min Resume Score': 'NUMERIC', 'Min Test Score': 'NUMERIC', 'Required Skills': 'TEXT',
+    },
+    'applications': {'JobID': 'TEXT', 'StudentID': 'TEXT', 'ApplicationDate': 'TEXT', 'Status': 'TEXT'},
+    'shortlists': {'JobID': 'TEXT', 'StudentID': 'TEXT', 'ShortlistDate': 'TEXT', 'Status': 'TEXT'},
+    'matches': {'JobID': 'TEXT', 'StudentID': 'TEXT', 'Score': 'REAL'},
+    # One row per answered skill-test question; Ability is the test's final estimate
+    'answer_logs': {
+        'StudentID': 'TEXT', 'Skill': 'TEXT', 'ItemID': 'TEXT', 'Selected': 'INTEGER', 'Correct': 'INTEGER',
+        'Ability': 'REAL', 'AnsweredAt': 'TEXT',
+    },
+    # Running sufficient statistics and calibrated IRT parameters per question
+    'item_stats': {
+        'ItemID': 'TEXT PRIMARY KEY', 'Skill': 'TEXT', 'Responses': 'INTEGER', 'Correct_Count': 'INTEGER',
+        'Ability_Sum': 'REAL', 'Ability_SqSum': 'REAL', 'Correct_Ability_Sum': 'REAL', 'Bin_Counts': 'TEXT',
+        'Bin_Correct': 'TEXT', 'Option_Counts': 'TEXT', 'Option_Ability_Sums': 'TEXT', 'PValue': 'REAL',
+        'Point_Biserial': 'REAL', 'Discrimination': 'REAL', 'Difficulty': 'REAL', 'Calibrated': 'INTEGER',
+    },
+    # Last row position each batch job has consumed
+    'watermarks': {'Job': 'TEXT PRIMARY KEY', 'Position': 'INTEGER'},
+    # Admin portal settings; Value is JSON
+    'settings': {'Name': 'TEXT PRIMARY KEY', 'Value': 'TEXT'},
+    # Background tasks; Args and Result are JSON, NotBefore is a retry time in epoch seconds, and
+    # Heartbeat is when the queue running the task (Owner) last renewed its claim
+    'tasks': {
+        'TaskID': 'TEXT PRIMARY KEY', 'Kind': 'TEXT', 'Args': 'TEXT', 'CacheKey': 'TEXT', 'Status': 'TEXT',
+        'Attempts': 'INTEGER', 'Result': 'TEXT', 'Error': 'TEXT', 'SubmittedAt': 'TEXT', 'FinishedAt': 'TEXT',
+        'NotBefore': 'REAL', 'Owner': 'TEXT', 'Heartbeat': 'REAL',
+    },
+}
+KEY_COLUMNS = {
+    'students': ('StudentID',), 'companies': ('CompanyID',), 'jobs': ('JobID',),
+    'applications': ('JobID', 'StudentID'), 'shortlists': ('JobID', 'StudentID'), 'matches': ('JobID', 'StudentID'),
+    'answer_logs': (), 'item_stats': ('ItemID',), 'watermarks': ('Job',), 'settings': ('Name',),
+    'tasks': ('TaskID',),
+}
+INDEXES = {
+    'students': ['Registration_Date', 'College', 'Degree', 'Status'],
+    'companies': ['Name', 'Industry', 'Approval_Status'],
+    'jobs': ['Company', 'Role', 'Posted_Date', 'Status', 'Location'],
+    'applications': ['StudentID', 'ApplicationDate'],
+    'shortlists': ['StudentID'],
+    'matches': ['StudentID'],
+    'answer_logs': ['StudentID'],
+    'item_stats': ['Skill'],
+    'tasks': ['Status', 'CacheKey'],
+}
+LIST_COLUMNS = {'Skills', 'Required Skills', 'Bin_Counts', 'Bin_Correct', 'Option_Counts', 'Option_Ability_Sums'}
+DATE_COLUMNS = {'Registration_Date', 'Posted_Date', 'ApplicationDate', 'ShortlistDate', 'AnsweredAt', 'SubmittedAt',
+                'FinishedAt'}
+BOOL_COLUMNS = {'Test_Completed', 'Resume_Uploaded', 'Correct', 'Calibrated'}
+# ID prefix and first number per table, e.g. STU1001, COMP001, JOB501
+ID_FORMATS = {'students': ('STU', 1001, 0), 'companies': ('COMP', 1, 3), 'jobs': ('JOB', 501, 0)}
+ROLES = ('student', 'company', 'admin')
+CHANGE_LOG_KEYS = 1000  # Keys logged per write; larger writes are logged as changing any row
+CHANGE_LOG_SECONDS = 3600  # Logged writes are kept this long for other processes to pick up
+CHANGE_LOG_PRUNE_EVERY = 500  # Logged writes between prunes of old entries
+DEFAULT_SETTINGS = {'max_resume_size_mb': 5}
+ID_ATTEMPTS = 5  # Tries to claim a new ID when concurrent signups take the same one
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def encode_value(column: str, value):
+    """Convert a DataFrame cell to a value SQLite can store"""
+    if column in LIST_COLUMNS:
+        return json.dumps(list(value)) if isinstance(value, (list, tuple, set, np.ndarray)) else json.dumps([])
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    return value
+
+
+def decode_frame(table: str, rows: List[tuple], columns: List[str]) -> pd.DataFrame:
+    """Build a typed DataFrame from SQLite rows"""
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    for column in columns:
+        if column in LIST_COLUMNS:
+            df[column] = [json.loads(v) if v else [] for v in df[column]]
+        elif column in DATE_COLUMNS:
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+        elif column in BOOL_COLUMNS:
+            df[column] = df[column].fillna(0).astype(bool)
+    return df
+
+
+def decode_row(table: str, row: Dict) -> Dict:
+    """Normalize an inserted row to the values frame() would read back for it"""
+    decoded = {}
+    for column, column_type in SCHEMA[table].items():
+        value = encode_value(column, row.get(column))
+        if column in LIST_COLUMNS:
+            value = json.loads(value)
+        elif column in DATE_COLUMNS:
+            value = pd.Timestamp(value) if value else pd.NaT
+        elif column in BOOL_COLUMNS:
+            value = bool(value)
+        elif column_type == 'REAL' and value is not None:
+            value = float(value)
+        decoded[column] = value
+    return decoded
+
+
+def _hash_password(password: str, salt: str) -> str:
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), bytes.fromhex(salt), 100_000).hex()
+
+
+class Repository(ABC):
+    """Storage interface used by the dashboards; implement it to plug in another store"""
+
+    @abstractmethod
+    def frame(self, table: str) -> pd.DataFrame:
+        """All rows of a table as a DataFrame"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, table: str, key) -> Optional[Dict]:
+        """One row by primary key (a value, or a tuple for composite keys)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self, table: str, where: Optional[Dict] = None) -> int:
+        """Number of rows, or of rows matching every where column (equal to a value, or in a list of values)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def page(self, table: str, where: Optional[Dict] = None, order_by: Optional[str] = None,
+             descending: bool = False, offset: int = 0, limit: Optional[int] = None) -> pd.DataFrame:
+        """Rows matching every where column, sorted by order_by then insertion order, from offset up to limit"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def distinct(self, table: str, column: str) -> List:
+        """Sorted non-null values of a column"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def batches(self, table: str, where: Optional[Dict] = None, batch_rows: int = 10_000) -> Iterator[pd.DataFrame]:
+        """Rows matching where as consecutive frames of up to batch_rows, in insertion order"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def frame_after(self, table: str, position: int, limit: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+        """Up to limit rows inserted after a position, in insertion order, and the position of the last one"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def version(self, table: str) -> int:
+        """Counter bumped by every write to a table, for caches built from it"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def sync(self) -> Dict[str, List[Dict]]:
+        """Apply writes made by other processes since the last call: drop cached reads of the tables they
+        changed and notify listeners. Returns table -> changes (see add_listener)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_listener(self, listener: Callable[[str, Optional[List[Dict]], Dict], None]) -> None:
+        """Call listener(table, rows, change) after every write: rows are the inserted rows as frame()
+        reads them back, or None for other writes (updates, upserts, deletes, and any write picked up
+        by sync()). change describes the write: 'keys', the primary keys written (None if unknown or
+        too many), 'columns', the columns written (None if any or the rows were deleted), 'where',
+        the filter of replace_rows, and 'remote', True for writes by another process"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert(self, table: str, rows: Iterable[Dict], ignore_existing: bool = False) -> int:
+        """Insert rows in one batch; returns the number inserted"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert(self, table: str, rows: Iterable[Dict]) -> int:
+        """Insert rows or update the given columns of existing rows, in one batch"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def replace_rows(self, table: str, rows: Iterable[Dict], where: Optional[Dict] = None) -> int:
+        """Delete the rows matching every where column (all rows if None) and insert rows, in one transaction"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, table: str, key, fields: Dict, expected: Optional[Dict] = None) -> bool:
+        """Set fields on one row, only if its columns still hold the expected values (None matching
+        NULL), so concurrent writers can claim a row; returns whether the row was updated"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def increment(self, table: str, key, column: str, amount: int = 1) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, table: str, key) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def next_id(self, table: str) -> str:
+        """Next free ID for students, companies or jobs (e.g. STU1006)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_with_id(self, table: str, row: Dict) -> str:
+        """Insert one student, company or job under the next free ID, safe against concurrent inserts; returns the ID"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_credential(self, role: str, user_id: str, password: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def verify_credential(self, role: str, user_id: str, password: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_credentials(self, role: str) -> int:
+        raise NotImplementedError
+
+
+class SQLiteRepository(Repository):
+    """Repository backed by a SQLite file, with a pool of connections shared across sessions.
+
+    Each table read by frame() is kept in memory as an AppendableTable: inserts append
+    to it directly, while updates and deletes drop it so the next read reloads it.
+    """
+
+    def __init__(self, path: Path = DB_PATH, pool_size: int = POOL_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tables: Dict[str, AppendableTable] = {}
+        self._tables_lock = threading.Lock()
+        self._versions: Dict[str, int] = {table: 0 for table in SCHEMA}
+        self._listeners: List[Callable[[str, Optional[List[Dict]], Dict], None]] = []
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._origin = uuid.uuid4().hex  # Marks this process's entries in the change log
+        self._synced = 0  # Last change log entry applied by sync()
+        self._logged = 0
+        self._sync_lock = threading.Lock()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        self._create_schema()
+        with self._connection() as conn:
+            self._synced = self._last_seq(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Statements are parameterized and reused, so the per-connection statement cache acts as prepared statements
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30, cached_statements=256)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection; the block runs in one transaction"""
+        connection = self._pool.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self._pool.put(connection)
+
+    def _create_schema(self):
+        with self._connection() as conn:
+            for table, columns in SCHEMA.items():
+                column_sql = ', '.join(f"{_quote(c)} {t}" for c, t in columns.items())
+                keys = KEY_COLUMNS[table]
+                if len(keys) > 1:
+                    column_sql += f", PRIMARY KEY ({', '.join(_quote(k) for k in keys)})"
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({column_sql})")
+                # Columns added to SCHEMA since the file was created
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for column, column_type in columns.items():
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(column)} {column_type}")
+                for column in INDEXES.get(table, []):
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column.replace(' ', '_').lower()} "
+                                 f"ON {table} ({_quote(column)})")
+            conn.execute("CREATE TABLE IF NOT EXISTS credentials "
+                         "(Role TEXT, UserID TEXT, PasswordHash TEXT, Salt TEXT, PRIMARY KEY (Role, UserID))")
+            # Every write, so processes sharing the file can tell which tables and rows the others changed
+            conn.execute("CREATE TABLE IF NOT EXISTS change_log "
+                         "(Seq INTEGER PRIMARY KEY AUTOINCREMENT, Origin TEXT, TableName TEXT, Change TEXT, At REAL)")
+
+    @staticmethod
+    def _check_table(table: str):
+        if table not in SCHEMA:
+            raise ValueError(f"Unknown table: {table}")
+
+    @staticmethod
+    def _key_clause(table: str, key) -> tuple:
+        keys = KEY_COLUMNS[table]
+        values = key if isinstance(key, tuple) else (key,)
+        return ' AND '.join(f"{_quote(k)} = ?" for k in keys), tuple(values)
+
+    def frame(self, table: str) -> pd.DataFrame:
+        self._check_table(table)
+        with self._tables_lock:
+            cached = self._tables.get(table)
+            if cached is None:
+                columns = list(SCHEMA[table])
+                with self._connection() as conn:
+                    rows = conn.execute(f"SELECT {', '.join(_quote(c) for c in columns)} FROM {table}").fetchall()
+                cached = self._tables[table] = AppendableTable(columns, decode_frame(table, rows, columns))
+        return cached.to_frame()
+
+    def _invalidate(self, table: str, change: Dict):
+        with self._tables_lock:
+            self._tables.pop(table, None)
+            self._versions[table] += 1
+        self._notify(table, None, change)
+
+    @staticmethod
+    def _keys(table: str, rows: List[Dict]) -> Optional[List[list]]:
+        keys = KEY_COLUMNS[table]
+        if not keys or len(rows) > CHANGE_LOG_KEYS:
+            return None
+        return [[row.get(k) for k in keys] for row in rows]
+
+    @staticmethod
+    def _last_seq(conn: sqlite3.Connection) -> int:
+        """Seq of the latest change log entry ever written, pruned or not"""
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+        return row[0] if row else 0
+
+    def _log(self, conn: sqlite3.Connection, table: str, change: Dict):
+        """Record a write in the change log, in the write's own transaction"""
+        now = time.time()
+        conn.execute("INSERT INTO change_log (Origin, TableName, Change, At) VALUES (?, ?, ?, ?)",
+                     (self._origin, table, json.dumps(change, default=str), now))
+        self._logged += 1
+        if self._logged % CHANGE_LOG_PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM change_log WHERE At < ?", (now - CHANGE_LOG_SECONDS,))
+
+    def version(self, table: str) -> int:
+        self._check_table(table)
+        return self._versions[table]
+
+    def sync(self) -> Dict[str, List[Dict]]:
+        with self._sync_lock:
+            with self._connection() as conn:
+                entries = conn.execute("SELECT Seq, TableName, Change FROM change_log WHERE Seq > ? AND Origin != ? "
+                                       "ORDER BY Seq", (self._synced, self._origin)).fetchall()
+                oldest = conn.execute("SELECT MIN(Seq) FROM change_log").fetchone()[0]
+                latest = self._last_seq(conn)
+            changes: Dict[str, List[Dict]] = {}
+            if oldest is not None and oldest > self._synced + 1:
+                # Entries this process had not seen were pruned, so any row of any table may have changed
+                changes = {table: [{'keys': None, 'columns': None, 'remote': True}] for table in SCHEMA}
+            else:
+                for _, table, change in entries:
+                    if table in SCHEMA:
+                        changes.setdefault(table, []).append({**json.loads(change), 'remote': True})
+            self._synced = latest
+        for table, table_changes in changes.items():
+            with self._tables_lock:
+                self._tables.pop(table, None)
+            # Listeners update their state before the version moves, so caches keyed by it never
+            # store a result built from the old state under the new version
+            for change in table_changes:
+                self._notify(table, None, change)
+            with self._tables_lock:
+                self._versions[table] += 1
+        return changes
+
+    def add_listener(self, listener: Callable[[str, Optional[List[Dict]], Dict], None]) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, table: str, rows: Optional[List[Dict]], change: Dict):
+        for listener in self._listeners:
+            listener(table, rows, change)
+
+    def get(self, table: str, key) -> Optional[Dict]:
+        self._check_table(table)
+        columns = list(SCHEMA[table])
+        where, params = self._key_clause(table, key)
+        with self._connection() as conn:
+            row = conn.execute(f"SELECT {', '.join(_quote(c) for c in columns)} FROM {table} WHERE {where}", params).fetchone()
+        if row is None:
+            return None
+        return decode_frame(table, [row], columns).iloc[0].to_dict()
+
+    @staticmethod
+    def _check_columns(table: str, columns: Iterable[str]):
+        unknown = [c for c in columns if c not in SCHEMA[table]]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {unknown}")
+
+    def _where_clause(self, table: str, where: Optional[Dict]) -> tuple:
+        """SQL condition and parameters: column = value, or column IN (...) for list values"""
+        where = where or {}
+        self._check_columns(table, where)
+        conditions, params = [], []
+        for column, value in where.items():
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                conditions.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})" if values else '0')
+                params.extend(encode_value(column, v) for v in values)
+            else:
+                conditions.append(f"{_quote(column)} = ?")
+                params.append(encode_value(column, value))
+        return ' AND '.join(conditions) or '1', tuple(params)
+
+    def count(self, table: str, where: Optional[Dict] = None) -> int:
+        self._check_table(table)
+        condition, params = self._where_clause(table, where)
+        with self._connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {condition}", params).fetchone()[0]
+
+    def page(self, table: str, where: Optional[Dict] = None, order_by: Optional[str] = None,
+             descending: bool = False, offset: int = 0, limit: Optional[int] = None) -> pd.DataFrame:
+        self._check_table(table)
+        columns = list(SCHEMA[table])
+        condition, params = self._where_clause(table, where)
+        order = 'rowid'
+        if order_by is not None:
+            self._check_columns(table, [order_by])
+            order = f"{_quote(order_by)} {'DESC' if descending else 'ASC'}, rowid"
+        with self._connection() as conn:
+            rows = conn.execute(f"SELECT {', '.join(_quote(c) for c in columns)} FROM {table} WHERE {condition} "
+                                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                                params + (-1 if limit is None else limit, offset)).fetchall()
+        return decode_frame(table, rows, columns)
+
+    def distinct(self, table: str, column: str) -> List:
+        self._check_table(table)
+        self._check_columns(table, [column])
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute(f"SELECT DISTINCT {_quote(column)} FROM {table} "
+                                                   f"WHERE {_quote(column)} IS NOT NULL ORDER BY 1")]
+
+    def frame_after(self, table: str, position: int, limit: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+        self._check_table(table)
+        columns = list(SCHEMA[table])
+        with self._connection() as conn:
+            rows = conn.execute(f"SELECT rowid, {', '.join(_quote(c) for c in columns)} FROM {table} "
+                                f"WHERE rowid > ? ORDER BY rowid LIMIT ?", (position, -1 if limit is None else limit)).fetchall()
+        if not rows:
+            return decode_frame(table, [], columns), position
+        return decode_frame(table, [row[1:] for row in rows], columns), rows[-1][0]
+
+    def batches(self, table: str, where: Optional[Dict] = None, batch_rows: int = 10_000) -> Iterator[pd.DataFrame]:
+        self._check_table(table)
+        columns = list(SCHEMA[table])
+        condition, params = self._where_clause(table, where)
+        position = 0
+        while True:
+            # Keyset paging on rowid, so the connection is returned to the pool between batches
+            with self._connection() as conn:
+                rows = conn.execute(f"SELECT rowid, {', '.join(_quote(c) for c in columns)} FROM {table} "
+                                    f"WHERE {condition} AND rowid > ? ORDER BY rowid LIMIT ?",
+                                    params + (position, batch_rows)).fetchall()
+            if not rows:
+                return
+            yield decode_frame(table, [row[1:] for row in rows], columns)
+            position = rows[-1][0]
+
+    def _rows_params(self, table: str, rows: Iterable[Dict], columns: List[str]) -> List[tuple]:
+        return [tuple(encode_value(c, row.get(c)) for c in columns) for row in rows]
+
+    def insert(self, table: str, rows: Iterable[Dict], ignore_existing: bool = False) -> int:
+        self._check_table(table)
+        rows = list(rows)
+        columns = list(SCHEMA[table])
+        params = self._rows_params(table, rows, columns)
+        verb = "INSERT OR IGNORE" if ignore_existing else "INSERT"
+        sql = f"{verb} INTO {table} ({', '.join(_quote(c) for c in columns)}) VALUES ({', '.join('?' * len(columns))})"
+        # Held across the write so a concurrent frame() cannot load these rows and then see them appended again
+        with self._tables_lock:
+            with self._connection() as conn:
+                if ignore_existing:
+                    # Row by row so only the rows actually inserted reach the in-memory table
+                    inserted = [row for row, row_params in zip(rows, params) if conn.execute(sql, row_params).rowcount]
+                else:
+                    conn.executemany(sql, params)
+                    inserted = rows
+                change = {'keys': self._keys(table, inserted), 'columns': None, 'inserted': True}
+                if inserted:
+                    self._log(conn, table, change)
+            decoded = [decode_row(table, row) for row in inserted] if inserted else []
+            cached = self._tables.get(table)
+            if cached is not None and decoded:
+                cached.extend(decoded)
+            if decoded:
+                self._versions[table] += 1
+        if decoded:
+            self._notify(table, decoded, change)
+        return len(inserted)
+
+    def upsert(self, table: str, rows: Iterable[Dict]) -> int:
+        self._check_table(table)
+        rows = [row for row in rows if all(row.get(k) not in (None, '') for k in KEY_COLUMNS[table])]
+        if not rows:
+            return 0
+        columns = [c for c in SCHEMA[table] if c in rows[0]]
+        keys = KEY_COLUMNS[table]
+        updates = ', '.join(f"{_quote(c)} = excluded.{_quote(c)}" for c in columns if c not in keys)
+        sql = (f"INSERT INTO {table} ({', '.join(_quote(c) for c in columns)}) VALUES ({', '.join('?' * len(columns))}) "
+               f"ON CONFLICT ({', '.join(_quote(k) for k in keys)}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING"))
+        change = {'keys': self._keys(table, rows), 'columns': columns}
+        with self._connection() as conn:
+            conn.executemany(sql, self._rows_params(table, rows, columns))
+            self._log(conn, table, change)
+        self._invalidate(table, change)
+        return len(rows)
+
+    def replace_rows(self, table: str, rows: Iterable[Dict], where: Optional[Dict] = None) -> int:
+        self._check_table(table)
+        columns = list(SCHEMA[table])
+        params = self._rows_params(table, rows, columns)
+        condition, where_params = self._where_clause(table, where)
+        change = {'keys': None, 'columns': None, 'where': where}
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {table} WHERE {condition}", where_params)
+            conn.executemany(f"INSERT INTO {table} ({', '.join(_quote(c) for c in columns)}) "
+                             f"VALUES ({', '.join('?' * len(columns))})", params)
+            self._log(conn, table, change)
+        self._invalidate(table, change)
+        return len(params)
+
+    def update(self, table: str, key, fields: Dict, expected: Optional[Dict] = None) -> bool:
+        self._check_table(table)
+        if not fields:
+            return False
+        where, key_params = self._key_clause(table, key)
+        expected = expected or {}
+        self._check_columns(table, list(fields) + list(expected))
+        for column in expected:
+            where += f" AND {_quote(column)} IS ?"
+        assignments = ', '.join(f"{_quote(c)} = ?" for c in fields)
+        params = (tuple(encode_value(c, v) for c, v in fields.items()) + key_params
+                  + tuple(encode_value(c, v) for c, v in expected.items()))
+        change = {'keys': [list(key_params)], 'columns': list(fields)}
+        with self._connection() as conn:
+            updated = conn.execute(f"UPDATE {table} SET {assignments} WHERE {where}", params).rowcount > 0
+            if updated:
+                self._log(conn, table, change)
+        if updated:
+            self._invalidate(table, change)
+        return updated
+
+    def increment(self, table: str, key, column: str, amount: int = 1) -> None:
+        self._check_table(table)
+        where, key_params = self._key_clause(table, key)
+        change = {'keys': [list(key_params)], 'columns': [column]}
+        with self._connection() as conn:
+            conn.execute(f"UPDATE {table} SET {_quote(column)} = COALESCE({_quote(column)}, 0) + ? WHERE {where}",
+                         (amount,) + key_params)
+            self._log(conn, table, change)
+        self._invalidate(table, change)
+
+    def delete(self, table: str, key) -> None:
+        self._check_table(table)
+        where, params = self._key_clause(table, key)
+        change = {'keys': [list(params)], 'columns': None}
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {table} WHERE {where}", params)
+            self._log(conn, table, change)
+        self._invalidate(table, change)
+
+    def next_id(self, table: str) -> str:
+        prefix, first, width = ID_FORMATS[table]
+        key = KEY_COLUMNS[table][0]
+        with self._connection() as conn:
+            ids = [row[0] for row in conn.execute(f"SELECT {_quote(key)} FROM {table} WHERE {_quote(key)} LIKE ?", (prefix + '%',))]
+        numbers = [int(m.group(1)) for m in (re.fullmatch(re.escape(prefix) + r'(\d+)', i or '') for i in ids) if m]
+        return f"{prefix}{max(numbers + [first - 1]) + 1:0{width}d}"
+
+    def insert_with_id(self, table: str, row: Dict) -> str:
+        key = KEY_COLUMNS[table][0]
+        for _ in range(ID_ATTEMPTS):
+            new_id = self.next_id(table)
+            try:
+                self.insert(table, [{**row, key: new_id}])
+                return new_id
+            except sqlite3.IntegrityError:
+                continue  # Taken by a concurrent insert since next_id read the table
+        raise RuntimeError(f"Could not allocate a new {table} ID after {ID_ATTEMPTS} attempts")
+
+    def set_credential(self, role: str, user_id: str, password: str) -> None:
+        salt = secrets.token_hex(16)
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO credentials (Role, UserID, PasswordHash, Salt) VALUES (?, ?, ?, ?)",
+                         (role, user_id, _hash_password(password, salt), salt))
+
+    def verify_credential(self, role: str, user_id: str, password: str) -> bool:
+        with self._connection() as conn:
+            row = conn.execute("SELECT PasswordHash, Salt FROM credentials WHERE Role = ? AND UserID = ?",
+                               (role, user_id)).fetchone()
+        return row is not None and secrets.compare_digest(row[0], _hash_password(password, row[1]))
+
+    def count_credentials(self, role: str) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM credentials WHERE Role = ?", (role,)).fetchone()[0]
+
+
+def seed_demo_data(repo: Repository):
+    """Load the demo students, jobs, company and logins into an empty store"""
+    if repo.count('students') or repo.count('jobs') or repo.count_credentials('admin'):
+        return
+    now = datetime.now()
+    students = [
+        ('STU1001', 'Liam Smith', 'Computer Science', 88, 90, ['Python', 'Java', 'SQL', 'Git']),
+        ('STU1002', 'Olivia Johnson', 'Data Science', 92, 95, ['Python', 'R', 'TensorFlow', 'SQL', 'Tableau']),
+        ('STU1003', 'Noah Williams', 'Computer Science', 85, 82, ['Python', 'JavaScript', 'React', 'Node.js']),
+        ('STU1004', 'Emma Brown', 'Mechanical Engg.', 78, 75, ['AutoCAD', 'SolidWorks', 'MATLAB']),
+        ('STU1005', 'Oliver Jones', 'Data Science', 95, 98, ['Python', 'PyTorch', 'Scikit-learn', 'AWS']),
+    ]
+    repo.insert('students', [
+        {'StudentID': sid, 'Name': name, 'Degree': degree, 'Resume Score': resume, 'Test Score': test,
+         'Skills': skills, 'Skills_Count': len(skills), 'Test_Completed': False, 'Resume_Uploaded': False,
+         'Status': 'Active', 'Registration_Date': now, 'Applications_Count': 0}
+        for sid, name, degree, resume, test, skills in students
+    ])
+    jobs = [
+        ('JOB501', 'Innovatech', 'Software Engineer', 80, 85, ['Python', 'Java', 'SQL', 'Algorithms']),
+        ('JOB502', 'DataSolutions', 'Data Scientist', 85, 90, ['Python', 'TensorFlow', 'SQL', 'Statistics']),
+        ('JOB503', 'FutureSoft', 'Frontend Developer', 80, 75, ['JavaScript', 'React', 'HTML', 'CSS']),
+        ('JOB504', 'Innovatech', 'AI/ML Engineer', 90, 90, ['Python', 'PyTorch', 'AWS', 'NLP']),
+    ]
+    repo.insert('jobs', [
+        {'JobID': jid, 'Company': company, 'Role': role, 'Min Resume Score': min_resume, 'Min Test Score': min_test,
+         'Required Skills': skills, 'Status': 'Active', 'Posted_Date': now, 'Applications': 0}
+        for jid, company, role, min_resume, min_test, skills in jobs
+    ])
+    repo.insert('companies', [{'CompanyID': 'COMP001', 'Name': 'Innovatech', 'Jobs_Posted': 2, 'Total_Applications': 0,
+                               'Approval_Status': 'Verified', 'Registration_Date': now}])
+    for sid, *_ in students:
+        repo.set_credential('student', sid, 'stu@1234')
+    repo.set_credential('company', 'COMP001', 'comp@123')
+    repo.set_credential('admin', 'ADMIN001', 'admin@123')
+
+
+_repository: Optional[Repository] = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> Repository:
+    """Process-wide repository shared by all sessions (seeded with demo data on first run)"""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = SQLiteRepository()
+            seed_demo_data(_repository)
+        return _repository
+
+
+def get_setting(name: str, repo: Optional[Repository] = None):
+    """Portal setting saved by the admin, or its default"""
+    row = (repo or get_repository()).get('settings', name)
+    return DEFAULT_SETTINGS[name] if row is None else json.loads(row['Value'])
+
+
+def set_setting(name: str, value, repo: Optional[Repository] = None) -> None:
+    (repo or get_repository()).upsert('settings', [{'Name': name, 'Value': json.dumps(value)}])
@@ -1,187 +1,73 @@
 import streamlit as st
-import re
-import PyPDF2
-import io
-import docx
-from typing import List, Dict
-import pandas as pd
-import numpy as np
+import hashlib
+import base64
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Optional
 import skill_testing_module as stm  # Assuming the provided skill_testing_module.py is saved in the same directory
+import skill_index as sidx
+import match_ranking as mr
+import match_table  # noqa: F401  registers the match refresh tasks submitted here
+import resume_parser as rp
+from matching import skill_key, unique_skills
+from skill_extraction import JOB_PREDICTOR, analyze_resume, cached_resume_analysis
+import storage
+import task_queue as tq
+import task_status as ts
 
-# Job categories for skill selection (unchanged)
-JOB_CATEGORIES = {
-    "Backend Developer": {
-        "description": "Develops server-side applications, APIs, databases, and system architecture",
-        "keywords": ["python", "java", "nodejs", "django", "flask", "spring", "api", "database", "mongodb", "postgresql", "mysql", "redis", "microservices", "docker", "rest", "graphql"],
-        "skills_weight": 1.0
-    },
-    "Frontend Developer": {
-        "description": "Creates user interfaces and client-side applications",
-        "keywords": ["react", "angular", "vue", "javascript", "typescript", "html", "css", "sass", "webpack", "bootstrap", "tailwind", "jquery", "nextjs", "nuxtjs", "responsive"],
-        "skills_weight": 1.0
-    },
-    "Full Stack Developer": {
-        "description": "Works on both frontend and backend development",
-        "keywords": ["react", "nodejs", "python", "javascript", "api", "database", "html", "css", "mongodb", "postgresql", "fullstack", "end-to-end"],
-        "skills_weight": 1.2
-    },
-    "Data Scientist": {
-        "description": "Analyzes data to extract insights and build predictive models",
-        "keywords": ["python", "r", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "matplotlib", "seaborn", "jupyter", "machine learning", "statistics", "data analysis", "visualization"],
-        "skills_weight": 1.0
-    },
-    "Machine Learning Engineer": {
-        "description": "Builds and deploys machine learning models and systems",
-        "keywords": ["python", "tensorflow", "pytorch", "scikit-learn", "mlops", "docker", "kubernetes", "aws", "machine learning", "deep learning", "neural networks", "model deployment"],
-        "skills_weight": 1.0
-    },
-    "DevOps Engineer": {
-        "description": "Manages infrastructure, deployment pipelines, and system operations",
-        "keywords": ["docker", "kubernetes", "aws", "azure", "gcp", "terraform", "ansible", "jenkins", "gitlab", "ci/cd", "linux", "bash", "monitoring", "infrastructure"],
-        "skills_weight": 1.0
-    },
-    "Mobile Developer": {
-        "description": "Develops applications for mobile platforms",
-        "keywords": ["react native", "flutter", "swift", "kotlin", "android", "ios", "xamarin", "mobile", "app development"],
-        "skills_weight": 1.0
-    },
-    "Data Engineer": {
-        "description": "Builds data pipelines and manages data infrastructure",
-        "keywords": ["python", "sql", "spark", "hadoop", "kafka", "airflow", "etl", "data pipeline", "big data", "aws", "snowflake", "databricks"],
-        "skills_weight": 1.0
-    },
-    "UI/UX Designer": {
-        "description": "Designs user interfaces and user experiences",
-        "keywords": ["figma", "sketch", "adobe xd", "photoshop", "illustrator", "wireframing", "prototyping", "user research", "design thinking", "usability"],
-        "skills_weight": 1.0
-    },
-    "QA Engineer": {
-        "description": "Tests software applications and ensures quality",
-        "keywords": ["selenium", "cypress", "jest", "junit", "testing", "automation", "manual testing", "api testing", "performance testing", "quality assurance"],
-        "skills_weight": 1.0
-    }
-}
-
-# Utility functions (unchanged)
-def extract_text_from_pdf(pdf_file):
+# Utility functions
+def extract_text_from_pdf(pdf_file, max_bytes=None):
     """Extract text from PDF file"""
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+        return rp.extract_pdf_text(pdf_file, max_bytes=max_bytes)
+    except rp.ResumeTooLargeError as e:
+        st.error(f"⚠️ {str(e)}")
+        return ""
     except Exception as e:
         st.error(f"Error reading PDF: {str(e)}")
         return ""
 
-def extract_text_from_docx(docx_file):
+def extract_text_from_docx(docx_file, max_bytes=None):
     """Extract text from DOCX file"""
     try:
-        doc = docx.Document(docx_file)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return rp.extract_docx_text(docx_file, max_bytes=max_bytes)
+    except rp.ResumeTooLargeError as e:
+        st.error(f"⚠️ {str(e)}")
+        return ""
     except Exception as e:
         st.error(f"Error reading DOCX: {str(e)}")
         return ""
 
-def preprocess_text(text: str) -> str:
-    """Clean and preprocess text"""
-    text = text.lower()
-    text = re.sub(r'[^\w\s\.\-\+\#\/]', ' ', text)
-    text = ' '.join(text.split())
-    return text
-
-def extract_skills_from_text(text: str) -> List[str]:
-    """Extract skills using keyword matching"""
-    text = preprocess_text(text)
-    found_skills = []
-    
-    all_keywords = set()
-    for job_data in JOB_CATEGORIES.values():
-        all_keywords.update([k.lower() for k in job_data['keywords']])
-    
-    for keyword in all_keywords:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text):
-            found_skills.append(keyword)
-    
-    return list(set(found_skills))
-
-def predict_job_from_skills(skills: List[str]) -> Dict:
-    """Predict job title using keyword matching"""
-    job_scores = {}
-    
-    for job_title, job_data in JOB_CATEGORIES.items():
-        score = 0
-        matched_skills = []
-        
-        for skill in skills:
-            if skill.lower() in [k.lower() for k in job_data['keywords']]:
-                score += job_data['skills_weight']
-                matched_skills.append(skill)
-        
-        total_possible = len(job_data['keywords'])
-        match_percentage = (score / total_possible) * 100 if total_possible > 0 else 0
-        
-        job_scores[job_title] = {
-            'score': match_percentage,
-            'matched_skills': matched_skills,
-            'total_matches': len(matched_skills),
-            'confidence': min(match_percentage * 2, 100)
-        }
-    
-    sorted_jobs = sorted(job_scores.items(), 
-                        key=lambda x: (x[1]['score'], x[1]['total_matches']), 
-                        reverse=True)
-    
-    return dict(sorted_jobs)
-
-# Initialize data in session state (moved from @st.cache_data to allow modifications)
-if 'students' not in st.session_state:
-    st.session_state.students = pd.DataFrame({
-        'StudentID': ['STU1001', 'STU1002', 'STU1003', 'STU1004', 'STU1005'],
-        'Name': ['Liam Smith', 'Olivia Johnson', 'Noah Williams', 'Emma Brown', 'Oliver Jones'],
-        'Degree': ['Computer Science', 'Data Science', 'Computer Science', 'Mechanical Engg.', 'Data Science'],
-        'Resume Score': [88, 92, 85, 78, 95],
-        'Test Score': [90, 95, 82, 75, 98],
-        'Skills': [
-            ['Python', 'Java', 'SQL', 'Git'],
-            ['Python', 'R', 'TensorFlow', 'SQL', 'Tableau'],
-            ['Python', 'JavaScript', 'React', 'Node.js'],
-            ['AutoCAD', 'SolidWorks', 'MATLAB'],
-            ['Python', 'PyTorch', 'Scikit-learn', 'AWS']
-        ]
-    })
-
-if 'jobs' not in st.session_state:
-    st.session_state.jobs = pd.DataFrame({
-        'JobID': ['JOB501', 'JOB502', 'JOB503', 'JOB504'],
-        'Company': ['Innovatech', 'DataSolutions', 'FutureSoft', 'Innovatech'],
-        'Role': ['Software Engineer', 'Data Scientist', 'Frontend Developer', 'AI/ML Engineer'],
-        'Min Resume Score': [80, 85, 80, 90],
-        'Min Test Score': [85, 90, 75, 90],
-        'Required Skills': [
-            ['Python', 'Java', 'SQL', 'Algorithms'],
-            ['Python', 'TensorFlow', 'SQL', 'Statistics'],
-            ['JavaScript', 'React', 'HTML', 'CSS'],
-            ['Python', 'PyTorch', 'AWS', 'NLP']
-        ]
-    })
+@tq.task('analyze_resume', max_concurrency=2, max_attempts=1)
+def _analyze_resume_task(data: str, file_type: str, max_bytes: Optional[int] = None) -> Optional[Dict]:
+    # The full analysis, text included, is in the resume cache; the task row keeps only the rest
+    analysis = analyze_resume(base64.b64decode(data), file_type, max_bytes)
+    return None if analysis is None else {k: v for k, v in analysis.items() if k != 'text'}
 
-if 'user_credentials' not in st.session_state:
-    st.session_state.user_credentials = {row['StudentID']: "stu@1234" for index, row in st.session_state.students.iterrows()}
+@tq.task('reclassify_students', max_attempts=1, cache_seconds=0)
+def _reclassify_task() -> Dict:
+    # Students are scored a batch at a time against every job category in one matrix product
+    roles, students = Counter(), 0
+    for batch in storage.get_repository().batches('students'):
+        predictions = JOB_PREDICTOR.predict_many(batch['Skills'])
+        roles.update(predictions['Predicted Role'].fillna('Unclassified'))
+        students += len(predictions)
+    return {'students': students, 'roles': dict(roles.most_common())}
 
-def calculate_match(student_skills, required_skills, student_resume, min_resume, student_test, min_test):
-    if student_resume < min_resume or student_test < min_test:
-        return 0
-    common_skills = set(student_skills) & set(required_skills)
-    skill_match_score = len(common_skills) / len(required_skills) if len(required_skills) > 0 else 0
-    resume_score_ratio = (student_resume - min_resume) / (100 - min_resume) if (100 - min_resume) > 0 else 0
-    test_score_ratio = (student_test - min_test) / (100 - min_test) if (100 - min_test) > 0 else 0
-    final_score = (0.6 * skill_match_score) + (0.2 * resume_score_ratio) + (0.2 * test_score_ratio)
-    return round(final_score * 100, 2)
+def store_resume_skills(student_id: str, skills: List[str]):
+    """Write skills extracted from a resume back to the student record, the skill index and the match table"""
+    repo = storage.get_repository()
+    student = repo.get('students', student_id)
+    if student is None:
+        return
+    current = student['Skills'] if isinstance(student['Skills'], list) else []
+    # Skills the student already lists keep their spelling, e.g. 'SQL' rather than the extracted 'sql'
+    skills = unique_skills(skills, current)
+    if set(map(skill_key, current)) == set(map(skill_key, skills)) and student['Resume_Uploaded']:
+        return  # Reruns of the Resume Analysis tab re-extract the same skills
+    repo.update('students', student_id, {'Skills': list(skills), 'Skills_Count': len(skills), 'Resume_Uploaded': True})
+    sidx.get_skill_index().add_student(student_id, skills, student['Resume Score'], student['Test Score'])
+    tq.get_task_queue().submit('refresh_student_matches', {'student_id': student_id})
 
 def display_student_dashboard():
     """Main student dashboard function"""
@@ -268,7 +154,7 @@ def display_student_dashboard():
                 student_id = st.text_input("Enter Student ID (e.g., STU1001)")
                 student_password = st.text_input("Password", type="password")
                 if st.form_submit_button("Login"):
-                    if student_id in st.session_state.user_credentials and student_password == st.session_state.user_credentials[student_id]:
+                    if storage.get_repository().verify_credential('student', student_id, student_password):
                         st.session_state.logged_in = True
                         st.session_state.user_id = student_id
                         st.session_state.details_submitted = True  # Assume details already submitted for existing users
@@ -285,22 +171,33 @@ def display_student_dashboard():
                 new_password = st.text_input("Password", type="password")
                 if st.form_submit_button("Signup"):
                     if new_name and new_degree and new_email and new_password:
-                        new_id = f"STU{len(st.session_state.students) + 1001}"
+                        repo = storage.get_repository()
                         new_student = {
-                            'StudentID': new_id,
                             'Name': new_name,
+                            'Email': new_email,
                             'Degree': new_degree,
                             'Resume Score': 0,
                             'Test Score': 0,
-                            'Skills': []
+                            'Skills': [],
+                            'Skills_Count': 0,
+                            'Test_Completed': False,
+                            'Resume_Uploaded': False,
+                            'Status': 'Active',
+                            'Registration_Date': datetime.now(),
+                            'Applications_Count': 0
                         }
-                        st.session_state.students = pd.concat([st.session_state.students, pd.DataFrame([new_student])], ignore_index=True)
-                        st.session_state.user_credentials[new_id] = new_password
+                        new_id = repo.insert_with_id('students', new_student)
+                        repo.set_credential('student', new_id, new_password)
+                        sidx.get_skill_index().add_student(new_id, new_student['Skills'], new_student['Resume Score'], new_student['Test Score'])
+                        tq.get_task_queue().submit('refresh_student_matches', {'student_id': new_id})
                         st.success(f"✅ Signup successful! Your Student ID is {new_id}. Please login.")
                     else:
                         st.error("⚠️ Please complete all fields.")
     else:
-        student_data = st.session_state.students[st.session_state.students['StudentID'] == st.session_state.user_id].iloc[0]
+        student_data = storage.get_repository().get('students', st.session_state.user_id)
+        if student_data is None:
+            st.error("❌ Student record not found. Please log in again.")
+            return
         
         # Create tabs for student features
         tab1, tab2, tab3, tab4 = st.tabs(["📋 Job Matches", "📄 Resume Analysis", "🎯 Skill Testing", "📊 Test Results"])
@@ -309,19 +206,9 @@ def display_student_dashboard():
             st.success(f"🎉 Welcome {student_data['Name']}! Here are your recommended jobs.")
             st.subheader(f"Recommended Jobs for {student_data['Name']}")
             
-            matches = []
-            for index, job in st.session_state.jobs.iterrows():
-                match_score = calculate_match(
-                    student_data['Skills'], job['Required Skills'],
-                    student_data['Resume Score'], job['Min Resume Score'],
-                    student_data['Test Score'], job['Min Test Score']
-                )
-                if match_score > 0:  # Only show jobs with positive match score (hiding non-matching "admin things")
-                    job_info = job.to_dict()
-                    job_info['Match Score'] = match_score
-                    matches.append(job_info)
-            
-            sorted_matches = sorted(matches, key=lambda x: x['Match Score'], reverse=True)
+            # Rank only the current page of jobs instead of sorting every match
+            page = mr.top_k_jobs(st.session_state.user_id, cursor=mr.current_cursor("student_jobs"))
+            sorted_matches = page['matches']
 
             if not sorted_matches:
                 st.warning("No suitable job matches found at the moment. Please check back later!")
@@ -335,7 +222,18 @@ def display_student_dashboard():
                         with col2:
                             st.metric("Your Match", f"{match['Match Score']}%")
                             if st.button("Apply Now", key=match['JobID']):
-                                st.toast(f"✅ Successfully applied for {match['Role']}!")
+                                application = {
+                                    'JobID': match['JobID'],
+                                    'StudentID': st.session_state.user_id,
+                                    'ApplicationDate': datetime.now(),
+                                    'Status': 'Applied'
+                                }
+                                if storage.get_repository().insert('applications', [application], ignore_existing=True):
+                                    st.toast(f"✅ Successfully applied for {match['Role']}!")
+                                else:
+                                    st.toast(f"ℹ️ You have already applied for {match['Role']}.")
+                
+                mr.pagination_controls("student_jobs", page)
         
         with tab2:
             st.subheader("📄 Resume Analysis")
@@ -347,28 +245,51 @@ def display_student_dashboard():
             )
             
             if uploaded_file is not None:
-                # Extract text based on file type
-                if uploaded_file.type == "application/pdf":
-                    resume_text = extract_text_from_pdf(uploaded_file)
-                elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                    resume_text = extract_text_from_docx(uploaded_file)
-                else:  # txt file
-                    resume_text = str(uploaded_file.read(), "utf-8")
+                # Size limit comes from the admin Portal Settings
+                max_resume_size_mb = storage.get_setting('max_resume_size_mb')
+                max_bytes = int(max_resume_size_mb * rp.MB)
+                if uploaded_file.size > max_bytes:
+                    st.error(f"⚠️ Resume exceeds the {max_resume_size_mb} MB upload limit.")
+                    analysis = None
+                else:
+                    # Reruns and re-uploads of the same file are served from the resume cache; new files
+                    # are parsed by a background task while this page polls for the result
+                    analysis = cached_resume_analysis(uploaded_file.getvalue())
+                    if analysis is None:
+                        task_name = f"resume_{hashlib.sha256(uploaded_file.getvalue()).hexdigest()[:16]}"
+                        task_id = ts.tracked_task(task_name)
+                        if task_id is None:
+                            task_id = tq.get_task_queue().submit('analyze_resume', {
+                                'data': base64.b64encode(uploaded_file.getvalue()).decode('ascii'),
+                                'file_type': uploaded_file.type,
+                                'max_bytes': max_bytes,
+                            })
+                            ts.track_task(task_name, task_id)
+                        finished = ts.finished_task(task_id, "Analyzing your resume")
+                        analysis = finished['Result'] if finished else None
+                        if analysis is not None:
+                            analysis = cached_resume_analysis(uploaded_file.getvalue()) or analysis
+                        if finished and analysis is None:
+                            st.error("⚠️ No text could be extracted from this resume.")
                 
-                if resume_text:
+                if analysis:
+                    resume_text = analysis.get('text')  # Missing if evicted from the resume cache since the task ran
                     st.success("✅ Resume uploaded successfully!")
                     
-                    word_count = len(resume_text.split())
-                    char_count = len(resume_text)
-                    st.metric("Document Stats", f"{word_count} words, {char_count} characters")
-                    
-                    with st.expander("📋 View Extracted Text"):
-                        st.text_area("Resume Content", resume_text[:1500] + "..." if len(resume_text) > 1500 else resume_text, height=200)
+                    if resume_text:
+                        word_count = len(resume_text.split())
+                        char_count = len(resume_text)
+                        st.metric("Document Stats", f"{word_count} words, {char_count} characters")
+                        
+                        with st.expander("📋 View Extracted Text"):
+                            st.text_area("Resume Content", resume_text[:1500] + "..." if len(resume_text) > 1500 else resume_text, height=200)
                     
                     # Extract skills
-                    skills = extract_skills_from_text(resume_text)
+                    skills = analysis['skills']
                     st.session_state.extracted_skills = skills
                     st.session_state.resume_analyzed = True
+                    store_resume_skills(st.session_state.user_id, skills)
+                    stm.prefetch_skill_questions(skills)  # Questions load while the student reads the analysis
                     
                     if skills:
                         st.subheader("🔧 Detected Skills")
@@ -384,7 +305,7 @@ def display_student_dashboard():
                         
                         # Get job predictions
                         st.subheader("🎯 AI Job Title Predictions")
-                        job_predictions = predict_job_from_skills(skills)
+                        job_predictions = analysis['predictions']
                         
                         for i, (job_title, job_data) in enumerate(list(job_predictions.items())[:6]):
                             if job_data['score'] > 0:
@@ -0,0 +1,248 @@
+"""
+Background Task Queue for the Smart Job Portal
+Heavy work (resume parsing, match-table refreshes, calibration, report generation) is
+submitted here instead of running inside a Streamlit rerun. Tasks are rows of the
+repository's tasks table, so queued work survives a restart, and are run by a pool of
+worker threads shared by every session (processes sharing the database claim each task
+once, and requeue tasks whose claim lapsed), with a concurrency limit per task kind and
+retries with exponential backoff. Submitting a task whose kind and arguments match a
+queued, running or (within the kind's cache time) finished task returns that task
+instead, so repeated submissions share one run and one cached result. Finished tasks are
+deleted once past their cache time, keeping the table small. Pages poll status() rather
+than waiting. This module has no Streamlit dependency.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+import storage
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+WORKERS = 4
+IDLE_WAIT_SECONDS = 5.0  # Longest a worker sleeps before re-checking for retries that became due
+RETRY_BACKOFF_SECONDS = 2.0
+CLAIM_SCAN = 50  # Queued tasks considered per claim
+KEEP_FINISHED_SECONDS = 24 * 3600  # Finished tasks are kept at least this long, for pages polling their status
+PRUNE_EVERY_SECONDS = 600
+HEARTBEAT_SECONDS = 15  # How often a queue renews its claim on the tasks it is running
+LEASE_SECONDS = 90  # A running task whose claim has not been renewed this long is queued again
+PRUNE_BATCH = 500  # Tasks deleted per statement
+
+# Kind -> {'function', 'max_concurrency', 'max_attempts', 'cache_seconds'}
+_registry: Dict[str, Dict] = {}
+
+
+def task(kind: str, max_concurrency: int = 1, max_attempts: int = 3, cache_seconds: Optional[float] = None):
+    """Register a function as the runner of a task kind.
+
+    The function is called with the submitted JSON arguments as keyword arguments and must
+    return a JSON-serializable result. A finished result is reused by identical
+    submissions for cache_seconds (for as long as the task is kept if None, see
+    KEEP_FINISHED_SECONDS); with 0, only a task that has not started yet is shared, for
+    work that must see the latest data.
+    """
+    def register(function: Callable) -> Callable:
+        _registry[kind] = {'function': function, 'max_concurrency': max_concurrency,
+                           'max_attempts': max_attempts, 'cache_seconds': cache_seconds}
+        return function
+    return register
+
+
+def cache_key(kind: str, args: Dict) -> str:
+    return hashlib.sha256(f"{kind}|{json.dumps(args, sort_keys=True)}".encode('utf-8')).hexdigest()
+
+
+class TaskQueue:
+    """Persistent task queue over a repository, run by worker threads in this process"""
+
+    def __init__(self, repo: storage.Repository, workers: int = WORKERS):
+        self.repo = repo
+        self._cond = threading.Condition()
+        self._running: Counter = Counter()  # Kind -> tasks being run
+        self._claimed = set()  # IDs of the tasks this queue is running
+        self.owner = uuid.uuid4().hex  # Marks this queue's claims; other processes may run queues too
+        self._next_prune = 0.0
+        self._next_requeue = 0.0
+        self._workers = [threading.Thread(target=self._work, name=f"task-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        self._workers.append(threading.Thread(target=self._heartbeat, name="task-heartbeat", daemon=True))
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, kind: str, args: Optional[Dict] = None, force: bool = False) -> str:
+        """Queue a task, or return the ID of an identical one still pending or with a cached result"""
+        if kind not in _registry:
+            raise ValueError(f"Unknown task kind: {kind}")
+        args = args or {}
+        key = cache_key(kind, args)
+        if not force:
+            latest = self.repo.page('tasks', {'CacheKey': key}, order_by='SubmittedAt', descending=True, limit=1)
+            if not latest.empty and self._reusable(latest.iloc[0]):
+                return latest.iloc[0]['TaskID']
+        task_id = uuid.uuid4().hex[:16]
+        self.repo.insert('tasks', [{
+            'TaskID': task_id, 'Kind': kind, 'Args': json.dumps(args), 'CacheKey': key, 'Status': QUEUED,
+            'Attempts': 0, 'SubmittedAt': datetime.now(), 'NotBefore': 0.0,
+        }])
+        with self._cond:
+            self._cond.notify()
+        return task_id
+
+    @staticmethod
+    def _reusable(row) -> bool:
+        if row['Status'] == QUEUED:
+            return True
+        cache_seconds = _registry[row['Kind']]['cache_seconds']
+        if cache_seconds == 0:
+            return False  # A run already under way may have read data from before this submission
+        if row['Status'] == RUNNING:
+            return True
+        if row['Status'] != DONE:
+            return False
+        return cache_seconds is None or (pd.Timestamp(datetime.now()) - row['FinishedAt']).total_seconds() <= cache_seconds
+
+    def status(self, task_id: str) -> Optional[Dict]:
+        """The task's row with Result decoded, or None for an unknown ID"""
+        row = self.repo.get('tasks', task_id)
+        if row is None:
+            return None
+        row['Result'] = json.loads(row['Result']) if row['Result'] else None
+        return row
+
+    def prune(self) -> int:
+        """Delete finished tasks past their kind's cache time and KEEP_FINISHED_SECONDS; returns how many"""
+        finished = self.repo.page('tasks', {'Status': [DONE, FAILED]})
+        if finished.empty:
+            return 0
+        age = (pd.Timestamp(datetime.now()) - finished['FinishedAt']).dt.total_seconds()
+        keep = finished['Kind'].map(
+            lambda kind: max(_registry.get(kind, {}).get('cache_seconds') or 0, KEEP_FINISHED_SECONDS))
+        expired = finished.loc[age > keep, 'TaskID'].tolist()
+        for start in range(0, len(expired), PRUNE_BATCH):
+            self.repo.replace_rows('tasks', [], where={'TaskID': expired[start:start + PRUNE_BATCH]})
+        return len(expired)
+
+    def requeue_abandoned(self) -> int:
+        """Queue again the running tasks whose queue stopped renewing its claim (e.g. a process that
+        exited mid-task); returns how many"""
+        stale_before = time.time() - LEASE_SECONDS
+        requeued = 0
+        for row in self.repo.page('tasks', {'Status': RUNNING}).to_dict('records'):
+            heartbeat = row['Heartbeat']
+            if heartbeat is not None and not pd.isna(heartbeat) and heartbeat > stale_before:
+                continue
+            # Only if nobody renewed or reclaimed it since it was read
+            requeued += self.repo.update('tasks', row['TaskID'], {'Status': QUEUED, 'Owner': None},
+                                         expected={'Status': RUNNING, 'Owner': row['Owner'],
+                                                   'Heartbeat': None if pd.isna(heartbeat) else heartbeat})
+        return requeued
+
+    def _maintain(self):
+        """Requeue abandoned tasks and prune finished ones when due"""
+        now = time.time()
+        with self._cond:
+            requeue, prune = now >= self._next_requeue, now >= self._next_prune
+            if requeue:
+                self._next_requeue = now + LEASE_SECONDS / 2
+            if prune:
+                self._next_prune = now + PRUNE_EVERY_SECONDS
+        try:
+            if requeue and self.requeue_abandoned():
+                with self._cond:
+                    self._cond.notify_all()
+            if prune:
+                self.prune()
+        except Exception:  # Left for the next round rather than killing the worker
+            pass
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            with self._cond:
+                claimed = list(self._claimed)
+            for task_id in claimed:
+                try:
+                    self.repo.update('tasks', task_id, {'Heartbeat': time.time()},
+                                     expected={'Status': RUNNING, 'Owner': self.owner})
+                except Exception:  # Retried on the next beat, well within the lease
+                    pass
+
+    def _claim(self) -> Optional[Dict]:
+        """Mark the oldest due task whose kind is registered and under its limit as running"""
+        kinds = [kind for kind, spec in _registry.items() if self._running[kind] < spec['max_concurrency']]
+        if not kinds:
+            return None
+        now = time.time()
+        queued = self.repo.page('tasks', {'Status': QUEUED, 'Kind': kinds}, order_by='SubmittedAt', limit=CLAIM_SCAN)
+        for row in queued.to_dict('records'):
+            if (row['NotBefore'] or 0) > now:
+                continue  # Waiting out its retry backoff
+            # Conditional, so of several queues sharing the database only one claims the task
+            if not self.repo.update('tasks', row['TaskID'], {'Status': RUNNING, 'Owner': self.owner,
+                                                             'Heartbeat': time.time()},
+                                    expected={'Status': QUEUED}):
+                continue
+            self._running[row['Kind']] += 1
+            self._claimed.add(row['TaskID'])
+            return row
+        return None
+
+    def _work(self):
+        while True:
+            self._maintain()
+            with self._cond:
+                row = self._claim()
+                while row is None:
+                    self._cond.wait(IDLE_WAIT_SECONDS)
+                    row = self._claim()
+            try:
+                self._run(row)
+            finally:
+                with self._cond:
+                    self._running[row['Kind']] -= 1
+                    self._claimed.discard(row['TaskID'])
+                    self._cond.notify_all()
+
+    def _run(self, row: Dict):
+        spec = _registry[row['Kind']]
+        attempts = int(row['Attempts'] or 0) + 1
+        try:
+            result = spec['function'](**json.loads(row['Args'] or '{}'))
+        except Exception as e:  # Any failure is recorded on the task rather than killing the worker
+            error = f"{type(e).__name__}: {e}"
+            if attempts < spec['max_attempts']:
+                self.repo.update('tasks', row['TaskID'], {
+                    'Status': QUEUED, 'Attempts': attempts, 'Error': error,
+                    'NotBefore': time.time() + RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1),
+                })
+            else:
+                self.repo.update('tasks', row['TaskID'], {
+                    'Status': FAILED, 'Attempts': attempts, 'Error': error, 'FinishedAt': datetime.now(), 'Args': None,
+                })
+            return
+        # Arguments (e.g. uploaded files) are dropped once the result is stored; CacheKey still identifies them
+        self.repo.update('tasks', row['TaskID'], {
+            'Status': DONE, 'Attempts': attempts, 'Result': json.dumps(result), 'Error': None,
+            'FinishedAt': datetime.now(), 'Args': None,
+        })
+
+
+_queue: Optional[TaskQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_task_queue() -> TaskQueue:
+    """Process-wide task queue over the process-wide repository, started on first use"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = TaskQueue(storage.get_repository())
+        return _queue
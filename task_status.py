@@ -0,0 +1,58 @@
+"""
+Task Status Widgets for the Smart Job Portal
+Streamlit side of the background task queue: shows a submitted task's progress and, while
+it is pending, polls it from a fragment on a timer so only that fragment reruns until the
+task finishes and the page is rerun once to show the result.
+"""
+
+from typing import Dict, Optional
+
+import streamlit as st
+
+import task_queue as tq
+
+POLL_SECONDS = 1.5
+
+
+def _watch(task_id: str):
+    status = tq.get_task_queue().status(task_id)
+    if status is None or status['Status'] in (tq.DONE, tq.FAILED):
+        st.rerun()
+
+
+# Older Streamlit versions without fragments fall back to a manual refresh button
+_fragment = getattr(st, 'fragment', None)
+_watch_fragment = _fragment(run_every=POLL_SECONDS)(_watch) if _fragment is not None else None
+
+
+def finished_task(task_id: str, label: str) -> Optional[Dict]:
+    """The task's status row once it has succeeded; otherwise show its progress (or error) and return None"""
+    status = tq.get_task_queue().status(task_id)
+    if status is None:
+        return None
+    if status['Status'] == tq.DONE:
+        return status
+    if status['Status'] == tq.FAILED:
+        st.error(f"❌ {label} failed: {status['Error']}")
+        return None
+    retry = f" (retrying after: {status['Error']})" if status['Attempts'] else ""
+    st.info(f"⏳ {label} in the background{retry}...")
+    if _watch_fragment is not None:
+        _watch_fragment(task_id)
+    else:
+        st.button("🔄 Check Status", key=f"task_refresh_{task_id}")
+    return None
+
+
+def tracked_task(name: str) -> Optional[str]:
+    """ID of the task this session last submitted under name"""
+    return st.session_state.setdefault('tasks', {}).get(name)
+
+
+def track_task(name: str, task_id: str):
+    st.session_state.setdefault('tasks', {})[name] = task_id
+
+
+def forget_task(name: str):
+    """Stop tracking the task submitted under name, e.g. once its result is no longer usable"""
+    st.session_state.setdefault('tasks', {}).pop(name, None)
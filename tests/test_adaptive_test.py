@@ -0,0 +1,85 @@
+"""
+Adaptive Test Tests for the Smart Job Portal
+The ability estimate, item selection and stopping rule are pure functions, and stage
+deadlines are checked against an explicit now, so the test flow runs without Streamlit.
+"""
+
+import adaptive_test as at
+
+
+def _questions(prefix, count):
+    return [{'question': f"{prefix} {i}", 'options': ['a', 'b', 'c', 'd'], 'answer': 0} for i in range(count)]
+
+
+def _pool(per_level=4):
+    return at.build_item_pool('python', {level: _questions(level, per_level) for level in at.DIFFICULTY_B})
+
+
+def test_estimate_ability_starts_at_the_prior():
+    theta, se = at.estimate_ability([], [])
+    assert abs(theta) < 1e-9
+    assert abs(se - 1.0) < 0.01
+
+
+def test_estimate_ability_follows_responses():
+    items = _pool()[:4]
+    prior_se = at.estimate_ability([], [])[1]
+    high, high_se = at.estimate_ability(items, [True] * 4)
+    low, low_se = at.estimate_ability(items, [False] * 4)
+    assert low < 0 < high
+    assert high_se < prior_se and low_se < prior_se
+
+
+def test_next_items_prefers_items_near_ability_and_skips_used():
+    pool = _pool()
+    hard = [item for item in pool if item['level'] == 'hard']
+    chosen = at.next_items(pool, [], theta=1.0, count=3)
+    assert [item['id'] for item in chosen] == [item['id'] for item in hard[:3]]
+    rest = at.next_items(pool, [item['id'] for item in hard], theta=1.0, count=3)
+    assert len(rest) == 3 and all(item['level'] == 'medium' for item in rest)
+    assert at.next_items(pool, [item['id'] for item in pool], theta=0.0, count=3) == []
+    assert at.next_items(pool, [], theta=0.0, count=0) == []
+
+
+def test_should_stop():
+    assert at.should_stop(1, 2.0, remaining=0)
+    assert at.should_stop(at.MAX_ITEMS, 2.0, remaining=5)
+    assert not at.should_stop(at.MIN_ITEMS - 1, 0.1, remaining=5)
+    assert at.should_stop(at.MIN_ITEMS, at.SE_TARGET, remaining=5)
+    assert not at.should_stop(at.MIN_ITEMS, at.SE_TARGET + 0.1, remaining=5)
+
+
+def test_on_time_stage_starts_the_next_one():
+    test = at.AdaptiveTest('python', _pool())
+    first = [item['id'] for item in test.stage]
+    assert len(first) == at.STAGE_SIZE
+    now = test.stage_deadline - 1
+    assert test.answer_stage([0] * at.STAGE_SIZE, now=now)
+    assert not test.finished and not test.timed_out
+    assert test.responses == [0] * at.STAGE_SIZE
+    assert not set(first) & {item['id'] for item in test.stage}
+    assert test.seconds_left(now) == at.SECONDS_PER_ITEM * len(test.stage)
+
+
+def test_late_stage_counts_as_unanswered_and_ends_the_test():
+    test = at.AdaptiveTest('python', _pool())
+    late = test.stage_deadline + at.GRACE_SECONDS + 1
+    assert not test.answer_stage([0] * at.STAGE_SIZE, now=late)
+    assert test.finished and test.timed_out
+    assert test.responses == [at.UNANSWERED] * at.STAGE_SIZE
+    assert not any(test.correctness())
+    assert not test.answer_stage([0] * at.STAGE_SIZE, now=late)  # Nothing left to answer
+
+
+def test_submission_within_grace_is_on_time():
+    test = at.AdaptiveTest('python', _pool())
+    assert test.answer_stage([0] * at.STAGE_SIZE, now=test.stage_deadline + at.GRACE_SECONDS)
+    assert not test.timed_out
+
+
+def test_too_small_pool_is_not_measured():
+    generic = [{'question': "Generic", 'options': ['a', 'b'], 'answer': 0}]
+    test = at.AdaptiveTest('cobol', at.build_item_pool('cobol', {'easy': generic, 'medium': generic}))
+    assert len(test.pool) == 1
+    assert test.answer_stage([0], now=test.stage_deadline)
+    assert test.finished and not test.measured
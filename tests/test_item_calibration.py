@@ -0,0 +1,66 @@
+"""
+Item Calibration Tests for the Smart Job Portal
+Calibration folds answer logs into running statistics, so calibrating batch by batch must
+end where one full recalculation does, and the 2PL fit must recover simulated parameters.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import item_calibration as ic
+import storage
+
+ITEMS = {'item-easy': (1.2, -1.0), 'item-mid': (1.7, 0.0), 'item-hard': (2.2, 1.2)}  # ItemID -> (a, b)
+
+
+def _simulated_logs(responses_per_item: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for item, (a, b) in ITEMS.items():
+        ability = rng.normal(0.0, 1.0, responses_per_item)
+        correct = rng.random(responses_per_item) < 1.0 / (1.0 + np.exp(-a * (ability - b)))
+        wrong_option = rng.integers(1, 4, responses_per_item)
+        frames.append(pd.DataFrame({
+            'StudentID': [f"STU{i}" for i in range(responses_per_item)], 'Skill': 'python', 'ItemID': item,
+            'Selected': np.where(correct, 0, wrong_option), 'Correct': correct, 'Ability': ability,
+            'AnsweredAt': '2024-01-01T00:00:00',
+        }))
+    return pd.concat(frames).sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def _item_stats(repo) -> pd.DataFrame:
+    return repo.frame('item_stats').sort_values('ItemID').reset_index(drop=True)
+
+
+def test_batched_runs_match_a_full_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(ic, 'BATCH_ROWS', 100)  # Several passes per run
+    repo = storage.SQLiteRepository(tmp_path / "portal.db")
+    logs = _simulated_logs(200).to_dict('records')
+    repo.insert('answer_logs', logs[:250])
+    assert ic.run_calibration(repo) == 250
+    repo.insert('answer_logs', logs[250:])
+    assert ic.run_calibration(repo) == len(logs) - 250
+    assert ic.run_calibration(repo) == 0  # Past the watermark
+    batched = _item_stats(repo)
+
+    assert ic.run_calibration(repo, full=True) == len(logs)
+    full = _item_stats(repo)
+    assert batched['ItemID'].tolist() == full['ItemID'].tolist() == sorted(ITEMS)
+    assert batched['Responses'].tolist() == full['Responses'].tolist() == [200] * len(ITEMS)
+    assert batched['Correct_Count'].tolist() == full['Correct_Count'].tolist()
+    for column in ('Ability_Sum', 'Ability_SqSum', 'Correct_Ability_Sum', 'PValue', 'Point_Biserial',
+                   'Discrimination', 'Difficulty'):
+        assert batched[column].to_numpy() == pytest.approx(full[column].to_numpy()), column
+    for column in ('Bin_Counts', 'Bin_Correct', 'Option_Counts', 'Option_Ability_Sums'):
+        assert np.allclose(np.vstack(batched[column]), np.vstack(full[column])), column
+
+
+def test_fit_2pl_recovers_simulated_parameters():
+    stats = ic.ItemStatistics([], [])
+    stats.add_logs(_simulated_logs(20_000))
+    slope, difficulty = stats.fit_2pl()
+    for row, item in enumerate(stats.index):
+        a, b = ITEMS[item]
+        assert slope[row] == pytest.approx(a, abs=0.15), item
+        assert difficulty[row] == pytest.approx(b, abs=0.1), item
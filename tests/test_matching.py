@@ -0,0 +1,75 @@
+"""
+Matching Tests for the Smart Job Portal
+MatchEngine must give exactly the score calculate_match gives for every student x job pair,
+including the edge cases the vectorized code handles separately. Run `python -m pytest`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from matching import MatchEngine, MatchPolicy, calculate_match, disagreements
+
+NAN = float('nan')
+
+STUDENTS = pd.DataFrame([
+    {'StudentID': 'S1', 'Skills': ['python', 'sql'], 'Resume Score': 80, 'Test Score': 70},
+    {'StudentID': 'S2', 'Skills': ['python'], 'Resume Score': NAN, 'Test Score': 90},
+    {'StudentID': 'S3', 'Skills': ['sql', 'excel'], 'Resume Score': 100, 'Test Score': NAN},
+    {'StudentID': 'S4', 'Skills': [], 'Resume Score': 60, 'Test Score': 60},
+    {'StudentID': 'S5', 'Skills': None, 'Resume Score': None, 'Test Score': 'n/a'},
+])
+
+JOBS = pd.DataFrame([
+    {'JobID': 'J1', 'Required Skills': ['python', 'sql'], 'Min Resume Score': 50, 'Min Test Score': 50},
+    # Minimums of 100 make the score ratio's denominator zero
+    {'JobID': 'J2', 'Required Skills': ['sql'], 'Min Resume Score': 100, 'Min Test Score': 100},
+    # Duplicates count towards the number of required skills
+    {'JobID': 'J3', 'Required Skills': ['python', 'python', 'sql'], 'Min Resume Score': 0, 'Min Test Score': 0},
+    {'JobID': 'J4', 'Required Skills': [], 'Min Resume Score': 0, 'Min Test Score': 0},
+    {'JobID': 'J5', 'Required Skills': ['excel'], 'Min Resume Score': NAN, 'Min Test Score': None},
+])
+
+
+def _scalar_scores(students_df, jobs_df, policy):
+    return np.array([
+        [calculate_match(student['Skills'], job['Required Skills'], student['Resume Score'], job['Min Resume Score'],
+                         student['Test Score'], job['Min Test Score'], policy)
+         for job in jobs_df.to_dict('records')]
+        for student in students_df.to_dict('records')
+    ])
+
+
+@pytest.mark.parametrize('policy', [MatchPolicy(), MatchPolicy(skill_weight=1.0, resume_weight=0.0, test_weight=0.0)])
+def test_engine_agrees_with_calculate_match(policy):
+    matrix = MatchEngine(STUDENTS, JOBS, policy).score_matrix()
+    np.testing.assert_array_equal(matrix, _scalar_scores(STUDENTS, JOBS, policy))
+    assert disagreements(STUDENTS, JOBS, policy) == 0
+
+
+@pytest.mark.parametrize('student_id, job_id', [
+    ('S2', 'J1'),  # NaN resume score
+    ('S3', 'J5'),  # NaN test score and minimums
+    ('S3', 'J2'),  # Minimums of 100
+    ('S1', 'J3'),  # Duplicate required skills
+    ('S4', 'J1'),  # Student without skills
+    ('S1', 'J4'),  # Job without required skills
+    ('S5', 'J1'),  # Missing and non-numeric cells
+])
+def test_edge_cases_agree_pairwise(student_id, job_id):
+    students = STUDENTS[STUDENTS['StudentID'] == student_id]
+    jobs = JOBS[JOBS['JobID'] == job_id]
+    assert MatchEngine(students, jobs).score_matrix()[0, 0] == _scalar_scores(students, jobs, MatchPolicy())[0, 0]
+
+
+def test_duplicate_required_skills_count_in_the_denominator():
+    students = STUDENTS[STUDENTS['StudentID'] == 'S1']
+    jobs = pd.concat([JOBS[JOBS['JobID'] == 'J3']] * 2, ignore_index=True)
+    jobs.at[1, 'Required Skills'] = ['python', 'sql']
+    with_duplicates, without = MatchEngine(students, jobs).score_matrix()[0]
+    assert with_duplicates == pytest.approx(without - 0.6 * 100 / 3)
+
+
+def test_empty_frames():
+    assert MatchEngine(STUDENTS.iloc[:0], JOBS).score_matrix().shape == (0, len(JOBS))
+    assert MatchEngine(STUDENTS, JOBS.iloc[:0]).score_matrix().shape == (len(STUDENTS), 0)
@@ -0,0 +1,114 @@
+"""
+Question Generator Tests for the Smart Job Portal
+Runs the client against the local stub question service (and a few misbehaving servers) on
+free ports, with a temporary question cache.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import question_generator as qg
+from question_bank import get_question_bank
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return qg.QuestionCache(tmp_path / "questions")
+
+
+@pytest.fixture
+def stub():
+    server = qg.serve_stub(port=0)
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def _serve(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class MalformedHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({'questions': [{'question': "No options"}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SlowHandler(qg.StubQuestionHandler):
+    """Stub answers after a delay, recording how many requests were in flight at once"""
+    lock = threading.Lock()
+    active = peak = 0
+
+    def do_POST(self):
+        with SlowHandler.lock:
+            SlowHandler.active += 1
+            SlowHandler.peak = max(SlowHandler.peak, SlowHandler.active)
+        time.sleep(0.2)
+        with SlowHandler.lock:
+            SlowHandler.active -= 1
+        super().do_POST()
+
+
+def test_fetch_then_cache_hit(stub, cache):
+    generator = qg.QuestionGenerator(base_url=stub, cache=cache)
+    questions = asyncio.run(generator.fetch('Python', 'easy', seed=1))
+    assert questions and all(qg._valid_question(q) for q in questions)
+    assert cache.get(('python', 'easy', 1)) == questions
+    generator.base_url = "http://127.0.0.1:9/"  # Nothing listens here; a cache hit never asks
+    assert asyncio.run(generator.fetch('python', 'easy', seed=1)) == questions
+
+
+def test_evict_expired_removes_old_sets(tmp_path):
+    cache = qg.QuestionCache(tmp_path / "questions", ttl_seconds=0.05)
+    cache.put(('python', 'easy', 0), [{'question': "Q", 'options': ["a", "b"], 'answer': 0}])
+    assert cache.get(('python', 'easy', 0)) is not None
+    time.sleep(0.1)
+    assert cache.evict_expired() == 1
+    assert cache.get(('python', 'easy', 0)) is None
+
+
+def test_unknown_skill_returns_none(stub, cache):
+    generator = qg.QuestionGenerator(base_url=stub, cache=cache)
+    assert asyncio.run(generator.fetch('klingon', 'easy')) is None  # The stub answers 404
+    assert generator.get_questions('klingon', 'easy') is None
+
+
+def test_malformed_payload_falls_back_to_bank(cache):
+    server = _serve(MalformedHandler)
+    try:
+        generator = qg.QuestionGenerator(base_url=f"http://127.0.0.1:{server.server_address[1]}/", cache=cache)
+        assert asyncio.run(generator.fetch('python', 'easy')) is None
+        assert generator.get_questions('python', 'easy') == get_question_bank().get('python', 'easy')
+        assert cache.get(('python', 'easy', 0)) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_prefetch_runs_concurrently(cache):
+    server = _serve(SlowHandler)
+    try:
+        generator = qg.QuestionGenerator(base_url=f"http://127.0.0.1:{server.server_address[1]}/", cache=cache)
+        started = time.monotonic()
+        cached = asyncio.run(generator.prefetch_async(['python', 'sql']))
+        elapsed = time.monotonic() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert cached == 2 * len(qg.DIFFICULTIES)
+    assert SlowHandler.peak > 1
+    assert elapsed < 2 * len(qg.DIFFICULTIES) * 0.2
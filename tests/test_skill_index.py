@@ -0,0 +1,34 @@
+"""
+Skill Index Tests for the Smart Job Portal
+Skills extracted from resumes are lowercase keywords while seeded and admin-edited rows are
+capitalised; the index and the matcher must treat both spellings as one skill.
+"""
+
+import pandas as pd
+
+from matching import MatchEngine, calculate_match, unique_skills
+from skill_index import SkillIndex
+
+RESUME_SKILLS = ['java', 'python', 'sql']  # As extracted from a resume
+JOB = {'JobID': 'JOB501', 'Required Skills': ['Python', 'Java', 'SQL', 'Algorithms'],
+       'Min Resume Score': 80, 'Min Test Score': 85}
+
+
+def test_capitalised_job_finds_student_with_resume_skills():
+    index = SkillIndex()
+    index.add_job('JOB501', JOB['Required Skills'])
+    index.add_student('STU1001', RESUME_SKILLS, 88, 90)
+    assert index.candidates_for_job(JOB['Required Skills'], 80, 85) == {'STU1001'}
+    assert index.jobs_for_student(RESUME_SKILLS) == {'JOB501'}
+
+
+def test_resume_skills_score_like_capitalised_skills():
+    capitalised = calculate_match(['Python', 'Java', 'SQL'], JOB['Required Skills'], 88, 80, 90, 85)
+    extracted = calculate_match(RESUME_SKILLS, JOB['Required Skills'], 88, 80, 90, 85)
+    assert extracted == capitalised == 59.67  # 0.6 * 3/4 + 0.2 * 8/20 + 0.2 * 5/15
+    students = pd.DataFrame([{'StudentID': 'STU1001', 'Skills': RESUME_SKILLS, 'Resume Score': 88, 'Test Score': 90}])
+    assert MatchEngine(students, pd.DataFrame([JOB])).score_matrix()[0, 0] == extracted
+
+
+def test_unique_skills_keeps_existing_spelling():
+    assert unique_skills(['java', 'python', 'Python', 'docker'], ['Python', 'SQL']) == ['java', 'Python', 'docker']